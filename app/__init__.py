@@ -30,7 +30,8 @@ def create_app() -> Flask:
         supports_credentials=False,  # cookies use नहीं कर रहे तो False
         methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization"],
-        expose_headers=["Content-Type", "Authorization"],
+        expose_headers=["Content-Type", "Authorization", "X-Export-Watermark",
+                        "X-Data-Source", "X-Data-As-Of", "X-Data-Age-Seconds"],
         max_age=86400,
     )
 
@@ -45,11 +46,19 @@ def create_app() -> Flask:
         resp.headers.setdefault("Access-Control-Allow-Headers", "Authorization, Content-Type")
         return resp
 
+    # ---------- response compression (gzip/br/zstd) ----------
+    from app.middlewares.compression import init_compression
+    init_compression(app)
+
     # ---------- extensions ----------
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
 
+    # token "tv" claim vs cached users.token_version (role/status/password changes)
+    from app.utils.token_state import is_token_revoked
+    jwt.token_in_blocklist_loader(is_token_revoked)
+
     # ---------- health ----------
     @app.get("/")
     def index():
@@ -83,6 +92,11 @@ def create_app() -> Flask:
     from app.resources.dashboard import dashboard_bp
     from app.resources.qr_public import qr_public_bp
     from app.resources.admin_users import admin_users_bp
+    from app.resources.sync import sync_bp
+    from app.resources.cost_anomalies import anomaly_bp
+    from app.resources.exports import exports_bp
+    from app.resources.work_queue import work_queue_bp
+    from app.resources.job_runs import job_runs_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(maintenance_bp, url_prefix="/api")
@@ -92,13 +106,19 @@ def create_app() -> Flask:
     app.register_blueprint(dashboard_bp,    url_prefix="/api/assets")
     app.register_blueprint(qr_public_bp,    url_prefix="/api")
     app.register_blueprint(admin_users_bp,  url_prefix="/api")
+    app.register_blueprint(sync_bp,         url_prefix="/api")
+    app.register_blueprint(anomaly_bp,      url_prefix="/api")
+    app.register_blueprint(exports_bp,      url_prefix="/api")
+    app.register_blueprint(work_queue_bp,   url_prefix="/api")
+    app.register_blueprint(job_runs_bp,     url_prefix="/api")
 
     # (Optional) Preflight catch-all — rarely needed, but safe:
     @app.route("/api/<path:_any>", methods=["OPTIONS"])
     def _preflight(_any):
         return ("", 204)
 
-    if app.config.get("ENABLE_SCHEDULER"):
+    # preload: no threads in the master — app/prefork.after_fork starts the scheduler in one worker
+    if app.config.get("ENABLE_SCHEDULER") and not app.config.get("APP_PRELOAD"):
         from app.scheduler import start_scheduler
         start_scheduler(app)
 
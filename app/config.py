@@ -1,6 +1,7 @@
 # app/config.py
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env
@@ -40,11 +41,102 @@ class Config:
     UPLOAD_FOLDER = os.path.join(PROJECT_ROOT, "uploads")
     QR_FOLDER = os.path.join(PROJECT_ROOT, "static", "qr_codes")
 
-    MAX_CONTENT_LENGTH = 2 * 1024 * 1024  # 2 MB
+    MAX_CONTENT_LENGTH = 2 * 1024 * 1024  # 2 MB (per request → also per chunk)
+    # resumable uploads (/api/upload/sessions): whole-file cap, suggested chunk, GC age
+    CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_SIZE") or 200 * 1024 * 1024)
+    CHUNKED_UPLOAD_CHUNK_SIZE = 1024 * 1024
+    CHUNKED_UPLOAD_TTL_HOURS = int(os.getenv("CHUNKED_UPLOAD_TTL_HOURS") or 24)
+
+    # image/PDF derivatives (?variant=...): longest edge in px, process-pool size
+    THUMBNAIL_SIZES = {"thumb": 320, "preview": 1280}
+    THUMBNAIL_QUALITY = 80
+    THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS") or 2)
+    THUMBNAIL_RETRY_SECONDS = int(os.getenv("THUMBNAIL_RETRY_SECONDS") or 600)  # after a failed render
     ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "pdf"}
+    # "cas" → uploads/ab/cd/<sha256>.<ext> (deduped); "flat" → old timestamped names
+    UPLOAD_STORAGE = os.getenv("UPLOAD_STORAGE", "cas")
+    # "python" | "x-accel" (nginx internal location) | "x-sendfile" (Apache/lighttpd)
+    UPLOAD_DELIVERY = os.getenv("UPLOAD_DELIVERY", "python")
+    UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/_protected_uploads")
+
+    # --- Password hashing (see app/utils/password_utils.py) ---
+    # werkzeug method string, e.g. "scrypt", "scrypt:16384:8:1", "pbkdf2:sha256:600000".
+    # Changing it re-hashes users transparently on their next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or 2)   # max concurrent KDFs
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE") or 32)      # waiting callers before 503
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT") or 10)
+
+    # --- JWT freshness (see app/utils/token_state.py) ---
+    # how long a worker trusts its cached users.token_version / is_active
+    TOKEN_STATE_TTL = int(os.getenv("TOKEN_STATE_TTL") or 30)
+
+    # --- Assets ---
+    ASSET_BATCH_MAX = int(os.getenv("ASSET_BATCH_MAX") or 100)  # ids per /assets/batch
+
+    # --- Maintenance ---
+    MAINTENANCE_BATCH_MAX = int(os.getenv("MAINTENANCE_BATCH_MAX") or 500)  # logs per /maintenance/batch
+    MAINTENANCE_PAGE_MAX = int(os.getenv("MAINTENANCE_PAGE_MAX") or 200)    # max ?limit on log history
+
+    # --- Change feed (/api/sync) ---
+    SYNC_PAGE_MAX = int(os.getenv("SYNC_PAGE_MAX") or 1000)
+    # feeds/watermarks stop at rows older than this (DB clock), so ids that commit late
+    # aren't skipped; writes to change_log must commit within it
+    CHANGE_FEED_LAG_SECONDS = int(os.getenv("CHANGE_FEED_LAG_SECONDS") or 10)
+
+    # --- Warranty timeline (/api/reports/warranty-timeline) ---
+    WARRANTY_TIMELINE_TTL_SECONDS = int(os.getenv("WARRANTY_TIMELINE_TTL_SECONDS") or 900)  # per-day counts reused
+    WARRANTY_TIMELINE_CACHE_SIZE = int(os.getenv("WARRANTY_TIMELINE_CACHE_SIZE") or 256)    # filter combinations kept
+
+    # --- Cost forecast (/api/reports/cost-forecast, precomputed nightly) ---
+    COST_FORECAST_MONTHS = int(os.getenv("COST_FORECAST_MONTHS") or 12)
+    COST_FORECAST_MAX_AGE_HOURS = int(os.getenv("COST_FORECAST_MAX_AGE_HOURS") or 26)
+
+    # --- TCO / depreciation (/api/reports/tco) ---
+    TCO_USEFUL_LIFE_YEARS = int(os.getenv("TCO_USEFUL_LIFE_YEARS") or 5)    # when an asset has none
+    TCO_SALVAGE_RATE = float(os.getenv("TCO_SALVAGE_RATE") or 0.1)         # salvage = rate × purchase_cost
+    TCO_DB_FACTOR = float(os.getenv("TCO_DB_FACTOR") or 2.0)               # 2.0 = double-declining balance
+
+    # --- Cost anomaly detection (app/utils/cost_anomalies.py) ---
+    ANOMALY_MAD_THRESHOLD = float(os.getenv("ANOMALY_MAD_THRESHOLD") or 3.5)  # robust z vs category median/MAD
+    ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD") or 4.0)      # z vs the asset's recent logs
+    ANOMALY_WINDOW = int(os.getenv("ANOMALY_WINDOW") or 10)                   # previous logs per asset
+    ANOMALY_MIN_HISTORY = int(os.getenv("ANOMALY_MIN_HISTORY") or 5)
+    ANOMALY_SCAN_CHUNK = int(os.getenv("ANOMALY_SCAN_CHUNK") or 50000)        # rows per DB fetch
+
+    # --- Analytics snapshot (optional, needs duckdb + pyarrow) ---
+    ANALYTICS_ENABLED = _bool("ANALYTICS_ENABLED", False)
+    ANALYTICS_SNAPSHOT_PATH = os.getenv("ANALYTICS_SNAPSHOT_PATH") or os.path.join(UPLOAD_FOLDER, ".analytics", "snapshot.duckdb")
+    ANALYTICS_REFRESH_MINUTES = int(os.getenv("ANALYTICS_REFRESH_MINUTES") or 15)
+    ANALYTICS_MAX_STALENESS_MINUTES = int(os.getenv("ANALYTICS_MAX_STALENESS_MINUTES") or 60)  # older → live SQL
+
+    # --- Response compression (app/middlewares/compression.py) ---
+    COMPRESS_ENABLED = _bool("COMPRESS_ENABLED", True)
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE") or 1024)  # bytes; smaller bodies sent as-is
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL") or 6)
+    EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR") or os.path.join(UPLOAD_FOLDER, ".exports")
+    EXPORT_CACHE_GRACE_SECONDS = int(os.getenv("EXPORT_CACHE_GRACE_SECONDS") or 600)  # superseded versions kept
+
+    # --- Background export jobs (/api/exports) ---
+    EXPORT_JOBS_DIR = os.getenv("EXPORT_JOBS_DIR") or os.path.join(UPLOAD_FOLDER, ".exports", "jobs")
+    EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS") or 2)        # per process
+    EXPORT_JOB_BATCH = int(os.getenv("EXPORT_JOB_BATCH") or 10000)        # rows per chunk / progress update
+    EXPORT_JOB_TTL_HOURS = int(os.getenv("EXPORT_JOB_TTL_HOURS") or 24)   # finished files kept this long
+    EXPORT_JOB_STALE_HOURS = int(os.getenv("EXPORT_JOB_STALE_HOURS") or 6)   # queued and never picked up
+    EXPORT_JOB_HEARTBEAT_TIMEOUT_MINUTES = int(os.getenv("EXPORT_JOB_HEARTBEAT_TIMEOUT_MINUTES") or 15)  # running, no chunk since
 
     # --- Feature toggles ---
     ENABLE_SCHEDULER = _bool("ENABLE_SCHEDULER", False)
+    APP_TIMEZONE = os.getenv("APP_TIMEZONE", "Asia/Kolkata")  # scheduler + "today" for overdue (app/utils/clock.py)
+
+    # --- Scheduler leader lease (one process per cluster runs the jobs) ---
+    SCHEDULER_LEASE_TTL_SECONDS = int(os.getenv("SCHEDULER_LEASE_TTL_SECONDS") or 60)   # failover after this
+    SCHEDULER_HEARTBEAT_SECONDS = int(os.getenv("SCHEDULER_HEARTBEAT_SECONDS") or 15)
+    JOB_RUNS_KEEP_DAYS = int(os.getenv("JOB_RUNS_KEEP_DAYS") or 30)
+
+    # --- Pre-fork serving (gunicorn --preload, see gunicorn.conf.py / app/prefork.py) ---
+    APP_PRELOAD = _bool("APP_PRELOAD", False)   # master builds the app; workers start the threads
+    SCHEDULER_LOCK_FILE = os.getenv("SCHEDULER_LOCK_FILE") or os.path.join(tempfile.gettempdir(), "smart-asset-scheduler.lock")
 
     # Ensure folders exist
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -0,0 +1,149 @@
+# app/middlewares/compression.py
+"""
+Response compression (gzip / brotli / zstd) negotiated from Accept-Encoding.
+
+- Only compressible types (JSON, CSV, text, NDJSON) — PDFs/images are left alone.
+- Buffered responses below COMPRESS_MIN_SIZE are sent as-is.
+- Streamed responses (generators, send_file) are compressed chunk by chunk,
+  so exports keep streaming and never get buffered in memory.
+- Responses that already carry Content-Encoding (e.g. precompressed export
+  artifacts) and partial/304 responses pass through untouched.
+brotli / zstandard are optional; without them only gzip is offered.
+"""
+
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+COMPRESSIBLE = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+
+
+def available_encodings():
+    out = []
+    if zstandard is not None:
+        out.append("zstd")
+    if brotli is not None:
+        out.append("br")
+    out.append("gzip")
+    return out
+
+
+def negotiate(accept_encoding, offered=None):
+    """Best encoding the client accepts (q > 0) among `offered`, in server preference order."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+
+    for enc in offered or available_encodings():
+        q = accepted.get(enc, accepted.get("*", 0.0))
+        if q > 0:
+            return enc
+    return None
+
+
+class _Compressor:
+    """Uniform compress()/flush() over gzip, brotli and zstd."""
+
+    def __init__(self, encoding, level):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=min(level, 11))
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress_bytes(data: bytes, encoding: str, level: int) -> bytes:
+    c = _Compressor(encoding, level)
+    return c.compress(data) + c.flush()
+
+
+def _stream(iterable, compressor):
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+        yield compressor.flush()
+    finally:
+        close = getattr(iterable, "close", None)
+        if close:
+            close()
+
+
+def init_compression(app):
+    @app.after_request
+    def _compress(resp):
+        if not app.config.get("COMPRESS_ENABLED", True):
+            return resp
+        if resp.status_code < 200 or resp.status_code in (204, 206, 304):
+            return resp
+        if "Content-Encoding" in resp.headers or resp.mimetype not in COMPRESSIBLE:
+            return resp
+
+        encoding = negotiate(request.headers.get("Accept-Encoding"))
+        resp.vary.add("Accept-Encoding")
+        if encoding is None:
+            return resp
+
+        min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        if resp.content_length is not None and resp.content_length < min_size:
+            return resp
+
+        level = app.config.get("COMPRESS_LEVEL", 6)
+        if resp.is_streamed or resp.direct_passthrough:
+            resp.response = _stream(resp.response, _Compressor(encoding, level))
+            resp.direct_passthrough = False
+            resp.headers.pop("Content-Length", None)
+        else:
+            data = resp.get_data()
+            if len(data) < min_size:
+                return resp
+            resp.set_data(compress_bytes(data, encoding, level))
+
+        resp.headers["Content-Encoding"] = encoding
+        # bytes differ per encoding → a strong validator must not be shared
+        etag, weak = resp.get_etag()
+        if etag and not weak:
+            resp.set_etag(etag, weak=True)
+        return resp
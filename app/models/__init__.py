@@ -6,5 +6,11 @@ from .user import User
 from .asset import Asset
 from .maintenance_log import MaintenanceLog
 from .audit import AuditLog
+from .change_log import ChangeLog
+from .cost_anomaly import CostAnomaly, CostAnomalyRun
+from .export_job import ExportJob
+from .dashboard_counter import DashboardCounter
+from .job_run import JobRun, SchedulerLease
+from . import service_dates  # noqa: F401  (registers the schedule events)
 
-__all__ = ["User", "Asset", "MaintenanceLog", "AuditLog"]
\ No newline at end of file
+__all__ = ["User", "Asset", "MaintenanceLog", "AuditLog", "ChangeLog", "CostAnomaly", "CostAnomalyRun", "ExportJob", "DashboardCounter", "JobRun", "SchedulerLease"]
\ No newline at end of file
@@ -14,11 +14,19 @@ class Asset(db.Model):
     purchase_date = db.Column(db.Date)
     warranty_end = db.Column(db.Date)
 
+    # 💰 Acquisition (book value / TCO)
+    purchase_cost = db.Column(db.Numeric(12, 2))
+    useful_life_years = db.Column(db.Integer)  # falls back to TCO_USEFUL_LIFE_YEARS
+
     # 🔁 Service frequency in days
     frequency_days = db.Column(db.Integer, default=180)  # ✅ Used to calculate next_service_due
 
-    # 👤 Assigned to user
-    assigned_user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    # 🗓️ Derived schedule (kept current by app/models/service_dates.py)
+    last_service_date = db.Column(db.Date)
+    next_service_due = db.Column(db.Date)
+
+    # 👤 Assigned to user (active_history: counter / change-feed events need the previous owner)
+    assigned_user_id = db.column_property(db.Column(db.Integer, db.ForeignKey("users.id")), active_history=True)
 
     # 📸 QR Code image path
     qr_code_path = db.Column(db.String(255))
@@ -33,9 +41,13 @@ class Asset(db.Model):
 
     # 🔍 Useful indexes
     __table_args__ = (
-        db.Index("idx_assets_category", "category"),
-        db.Index("idx_assets_location", "location"),
+        # (filter, warranty_end, id): warranty timeline counts and keyset pages
+        db.Index("idx_assets_category_warranty", "category", "warranty_end", "id"),
+        db.Index("idx_assets_location_warranty", "location", "warranty_end", "id"),
         db.Index("idx_assets_warranty", "warranty_end"),
+        # technician work queue: covering (page and ETag), keyset on (next_service_due, id)
+        db.Index("idx_assets_work_queue", "assigned_user_id", "next_service_due", "id",
+                 "last_service_date", "name", "updated_at"),
     )
 
     # 🔍 Latest log shortcut
@@ -0,0 +1,88 @@
+# app/models/change_log.py
+from sqlalchemy import event, func, inspect, select
+
+from .. import db
+
+
+class ChangeLog(db.Model):
+    """
+    Append-only change feed for sync clients.
+    `id` is the monotonically increasing sequence handed out as the sync token;
+    op is "upsert" (insert/update) or "delete" (tombstone).
+    """
+    __tablename__ = "change_log"
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    entity = db.Column(db.String(30), nullable=False)   # "asset" | "maintenance_log"
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index("idx_change_log_entity", "entity", "entity_id"),
+        db.Index("idx_change_log_entity_seq", "entity", "id"),  # delta exports: one entity's id range
+    )
+
+
+def record_changes(connection, entity: str, ids, op: str) -> None:
+    """Write feed rows on the caller's connection (same transaction as the change)."""
+    rows = [{"entity": entity, "entity_id": i, "op": op} for i in ids]
+    if rows:
+        connection.execute(ChangeLog.__table__.insert(), rows)
+
+
+def latest_seq(*entities, entity_id=None) -> int:
+    """
+    Highest feed id recorded for `entities` (or for one row of them), 0 if
+    none. Unlike updated_at (whole seconds) it moves on every write, so
+    validators and cache keys include it. One index probe per entity.
+    """
+    probes = []
+    for entity in entities:
+        q = select(func.max(ChangeLog.id)).where(ChangeLog.entity == entity)
+        if entity_id is not None:
+            q = q.where(ChangeLog.entity_id == entity_id)
+        probes.append(q.scalar_subquery())
+    return max(seq or 0 for seq in db.session.execute(select(*probes)).one())
+
+
+def track(model, entity: str) -> None:
+    """Hook ORM insert/update/delete of `model` into the change feed."""
+
+    @event.listens_for(model, "after_insert")
+    def _insert(mapper, connection, target):
+        record_changes(connection, entity, [target.id], "upsert")
+
+    @event.listens_for(model, "after_update")
+    def _update(mapper, connection, target):
+        # fired for every dirty instance, even without net column changes
+        session = db.object_session(target)
+        if session is None or session.is_modified(target, include_collections=False):
+            record_changes(connection, entity, [target.id], "upsert")
+
+    @event.listens_for(model, "after_delete")
+    def _delete(mapper, connection, target):
+        record_changes(connection, entity, [target.id], "delete")
+
+
+def track_reassignment(asset_model, log_model) -> None:
+    """
+    A TECH's feed shows logs of their assigned assets only, so moving an asset
+    re-publishes its logs: the new assignee gets them as upserts, the old one
+    as tombstones (sync filters by the current assignment).
+    """
+
+    @event.listens_for(asset_model, "after_update")
+    def _reassigned(mapper, connection, target):
+        if not inspect(target).attrs["assigned_user_id"].history.has_changes():
+            return
+        ids = [i for (i,) in connection.execute(select(log_model.id).where(log_model.asset_id == target.id))]
+        record_changes(connection, "maintenance_log", ids, "upsert")
+
+
+from .asset import Asset  # noqa: E402
+from .maintenance_log import MaintenanceLog  # noqa: E402
+
+track(Asset, "asset")
+track(MaintenanceLog, "maintenance_log")
+track_reassignment(Asset, MaintenanceLog)
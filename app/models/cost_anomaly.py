@@ -0,0 +1,41 @@
+# app/models/cost_anomaly.py
+from .. import db
+
+
+class CostAnomaly(db.Model):
+    """
+    A maintenance log whose cost looks wrong, queued for review.
+    method: "category_mad" (robust z vs the category's median/MAD) or
+            "asset_zscore" (z vs the asset's previous ANOMALY_WINDOW logs).
+    status: open → confirmed | dismissed.
+    """
+    __tablename__ = "cost_anomalies"
+
+    id = db.Column(db.Integer, primary_key=True)
+    log_id = db.Column(db.Integer, db.ForeignKey("maintenance_logs.id", ondelete="CASCADE"), nullable=False, unique=True)
+    asset_id = db.Column(db.Integer, nullable=False)
+    cost = db.Column(db.Numeric(10, 2))
+    expected = db.Column(db.Numeric(10, 2))   # category median / asset rolling mean
+    score = db.Column(db.Float, nullable=False)
+    method = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(12), nullable=False, default="open")
+    detected_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    reviewed_by = db.Column(db.Integer, db.ForeignKey("users.id"))
+    reviewed_at = db.Column(db.TIMESTAMP)
+
+    __table_args__ = (
+        db.Index("idx_cost_anomalies_status", "status", "id"),
+    )
+
+
+class CostAnomalyRun(db.Model):
+    """One scan; the latest run's last_log_id is the watermark for incremental mode."""
+    __tablename__ = "cost_anomaly_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    mode = db.Column(db.String(12), nullable=False)          # "full" | "incremental"
+    started_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    last_log_id = db.Column(db.Integer, nullable=False, default=0)
+    scored = db.Column(db.Integer, nullable=False, default=0)
+    flagged = db.Column(db.Integer, nullable=False, default=0)
+    category_stats = db.Column(db.JSON)                      # {category: [median, mad]} from the last full scan
@@ -0,0 +1,243 @@
+# app/models/dashboard_counter.py
+from sqlalchemy import case, event, extract, func, inspect, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from .. import db
+from ..utils import clock
+
+
+class DashboardCounter(db.Model):
+    """
+    Pre-aggregated dashboard numbers, kept in step with assets / maintenance_logs
+    by the mapper events below (same transaction as the change).
+
+    scope_user_id: 0 = whole fleet, otherwise assets assigned to that user (TECH view)
+    period:        0 = totals row (assets, logs, overdue), YYYYMM = that month's logs / cost
+    "overdue" depends on the date (APP_TIMEZONE, app/utils/clock.py), so the
+    scheduler's leader recomputes it with reconcile() once per day
+    (overdue_as_of on the fleet totals row says which day it refers to).
+    """
+    __tablename__ = "dashboard_counters"
+
+    scope_user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    period = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    assets = db.Column(db.Integer, nullable=False, default=0)
+    logs = db.Column(db.Integer, nullable=False, default=0)
+    overdue = db.Column(db.Integer, nullable=False, default=0)
+    cost = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    overdue_as_of = db.Column(db.Date)
+
+
+FIELDS = ("assets", "logs", "overdue", "cost")
+
+
+def _period(d):
+    return d.year * 100 + d.month if d else None
+
+
+def _scopes(owner):
+    return (0,) if not owner else (0, owner)
+
+
+def _bump(connection, deltas) -> None:
+    """deltas: {(scope, period): {field: delta}} → add in place (upsert)."""
+    table = DashboardCounter.__table__
+    dialect = connection.dialect.name
+    for (scope, period), d in deltas.items():
+        values = {f: d.get(f, 0) for f in FIELDS}
+        if not any(values.values()):
+            continue
+        row = dict(scope_user_id=scope, period=period, **values)
+        if dialect == "mysql":
+            stmt = mysql.insert(table).values(**row)
+            stmt = stmt.on_duplicate_key_update({f: table.c[f] + stmt.inserted[f] for f in FIELDS})
+        else:
+            ins = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = ins(table).values(**row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["scope_user_id", "period"],
+                set_={f: table.c[f] + stmt.excluded[f] for f in FIELDS},
+            )
+        connection.execute(stmt)
+
+
+def _add(deltas, scope, period, **values):
+    cell = deltas.setdefault((scope, period), {})
+    for k, v in values.items():
+        cell[k] = cell.get(k, 0) + v
+
+
+def _log_deltas(deltas, owner, service_date, cost, next_due, sign):
+    overdue = 1 if next_due and next_due < clock.today() else 0
+    for scope in _scopes(owner):
+        _add(deltas, scope, 0, logs=sign, overdue=sign * overdue)
+        if service_date:
+            _add(deltas, scope, _period(service_date), logs=sign, cost=sign * float(cost or 0))
+
+
+def _owner(connection, asset_id):
+    from .asset import Asset
+    if asset_id is None:
+        return None
+    return connection.execute(
+        db.select(Asset.assigned_user_id).where(Asset.id == asset_id)
+    ).scalar()
+
+
+def _asset_log_deltas(connection, asset_id, scopes, sign):
+    """Contribution of an asset's logs currently in the DB, for the given scopes."""
+    from .maintenance_log import MaintenanceLog as L
+    period = (extract("year", L.service_date) * 100 + extract("month", L.service_date)).label("period")
+    overdue = func.sum(case((L.next_service_due < clock.today(), 1), else_=0))
+    rows = connection.execute(
+        db.select(period, func.count(L.id), func.coalesce(func.sum(L.cost), 0), overdue)
+        .where(L.asset_id == asset_id)
+        .group_by(period)
+    ).all()
+    deltas = {}
+    for p, n, cost, n_overdue in rows:
+        for scope in scopes:
+            _add(deltas, scope, 0, logs=sign * n, overdue=sign * int(n_overdue or 0))
+            if p is not None:
+                _add(deltas, scope, int(p), logs=sign * n, cost=sign * float(cost))
+    return deltas
+
+
+def discount_asset_logs(connection, asset_id) -> None:
+    """Remove an asset's logs from the counters — call before bulk-deleting them (no ORM events)."""
+    _bump(connection, _asset_log_deltas(connection, asset_id, _scopes(_owner(connection, asset_id)), -1))
+
+
+def _lock_counters(session) -> None:
+    """
+    Block the event upserts until reconcile() commits. A writer that already
+    changed a base row waits at its counter upsert, so its change is neither
+    in the aggregates below (uncommitted) nor lost (it lands on the rebuilt
+    counters afterwards); one that already upserted a counter is waited for.
+    """
+    table = DashboardCounter.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        session.execute(text(f"LOCK TABLE {table.name} IN EXCLUSIVE MODE"))  # plain reads still go through
+    elif dialect == "mysql":
+        # next-key locks on every row + the gaps: updates and new rows both wait
+        session.execute(db.select(table.c.scope_user_id).with_for_update()).all()
+    else:
+        session.execute(table.delete())  # SQLite: taking the write lock first is the lock
+
+
+def overdue_as_of():
+    """Day the counters' overdue figures refer to (None before the first reconcile)."""
+    return db.session.query(DashboardCounter.overdue_as_of).filter_by(scope_user_id=0, period=0).scalar()
+
+
+def reconcile() -> int:
+    """
+    Rebuild every counter from the base tables; returns rows written.
+    Run by the scheduler's leader only (nightly, and whenever overdue_as_of is behind).
+    """
+    from .asset import Asset
+    from .maintenance_log import MaintenanceLog as L
+
+    db.session.rollback()  # fresh transaction: the aggregates' snapshot must start after the lock
+    _lock_counters(db.session)
+    today = clock.today()
+    deltas = {}
+    for owner, n in db.session.query(Asset.assigned_user_id, func.count(Asset.id)).group_by(Asset.assigned_user_id):
+        for scope in _scopes(owner):
+            _add(deltas, scope, 0, assets=n)
+
+    period = (extract("year", L.service_date) * 100 + extract("month", L.service_date)).label("period")
+    overdue = func.sum(case((L.next_service_due < today, 1), else_=0))
+    rows = (
+        db.session.query(Asset.assigned_user_id, period, func.count(L.id), func.coalesce(func.sum(L.cost), 0), overdue)
+        .join(Asset, Asset.id == L.asset_id)
+        .group_by(Asset.assigned_user_id, period)
+    )
+    for owner, p, n, cost, n_overdue in rows:
+        for scope in _scopes(owner):
+            _add(deltas, scope, 0, logs=n, overdue=int(n_overdue or 0))
+            if p is not None:
+                _add(deltas, scope, int(p), logs=n, cost=float(cost))
+    _add(deltas, 0, 0)  # the fleet totals row always exists (carries overdue_as_of)
+
+    table = DashboardCounter.__table__
+    db.session.execute(table.delete())
+    db.session.execute(table.insert(), [
+        dict(scope_user_id=s, period=p, overdue_as_of=today if p == 0 else None,
+             **{f: d.get(f, 0) for f in FIELDS})
+        for (s, p), d in deltas.items()
+    ])
+    db.session.commit()
+    return len(deltas)
+
+
+def _old(target, attr):
+    """Value before this flush — the attributes used here are mapped with active_history=True."""
+    hist = inspect(target).attrs[attr].history
+    return hist.deleted[0] if hist.deleted else getattr(target, attr)
+
+
+def _changed(target, *attrs):
+    state = inspect(target)
+    return any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+def track_counters(asset_model, log_model) -> None:
+    @event.listens_for(log_model, "after_insert")
+    def _log_insert(mapper, connection, target):
+        deltas = {}
+        _log_deltas(deltas, _owner(connection, target.asset_id),
+                    target.service_date, target.cost, target.next_service_due, +1)
+        _bump(connection, deltas)
+
+    @event.listens_for(log_model, "after_update")
+    def _log_update(mapper, connection, target):
+        if not _changed(target, "asset_id", "service_date", "cost", "next_service_due"):
+            return
+        deltas = {}
+        _log_deltas(deltas, _owner(connection, _old(target, "asset_id")),
+                    _old(target, "service_date"), _old(target, "cost"), _old(target, "next_service_due"), -1)
+        _log_deltas(deltas, _owner(connection, target.asset_id),
+                    target.service_date, target.cost, target.next_service_due, +1)
+        _bump(connection, deltas)
+
+    @event.listens_for(log_model, "after_delete")
+    def _log_delete(mapper, connection, target):
+        deltas = {}
+        _log_deltas(deltas, _owner(connection, target.asset_id),
+                    target.service_date, target.cost, target.next_service_due, -1)
+        _bump(connection, deltas)
+
+    @event.listens_for(asset_model, "after_insert")
+    def _asset_insert(mapper, connection, target):
+        _bump(connection, {(s, 0): {"assets": 1} for s in _scopes(target.assigned_user_id)})
+
+    @event.listens_for(asset_model, "after_update")
+    def _asset_update(mapper, connection, target):
+        if not _changed(target, "assigned_user_id"):
+            return
+        old, new = _old(target, "assigned_user_id"), target.assigned_user_id
+        # the fleet row (scope 0) is unaffected; move the asset + its logs between owners
+        deltas = {}
+        for scope, sign in ((old, -1), (new, +1)):
+            if scope:
+                _add(deltas, scope, 0, assets=sign)
+                for key, d in _asset_log_deltas(connection, target.id, (scope,), sign).items():
+                    _add(deltas, *key, **d)
+        _bump(connection, deltas)
+
+    @event.listens_for(asset_model, "before_delete")
+    def _asset_delete(mapper, connection, target):
+        # logs removed through the ORM already discounted themselves; this catches
+        # the ones the DB's ON DELETE CASCADE will take with the asset
+        deltas = _asset_log_deltas(connection, target.id, _scopes(target.assigned_user_id), -1)
+        for s in _scopes(target.assigned_user_id):
+            _add(deltas, s, 0, assets=-1)
+        _bump(connection, deltas)
+
+
+from .asset import Asset  # noqa: E402
+from .maintenance_log import MaintenanceLog  # noqa: E402
+
+track_counters(Asset, MaintenanceLog)
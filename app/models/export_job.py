@@ -0,0 +1,34 @@
+# app/models/export_job.py
+from .. import db
+
+
+class ExportJob(db.Model):
+    """
+    Background export (app/utils/export_jobs.py).
+    status: queued → running → done | failed; done → expired once the file is purged.
+    All timestamps come from the DB clock.
+    """
+    __tablename__ = "export_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)      # "assets" | "logs" | "users"
+    format = db.Column(db.String(10), nullable=False)    # "csv" | "jsonl" | "parquet"
+    filters = db.Column(db.JSON)
+    status = db.Column(db.String(10), nullable=False, default="queued")
+    rows_total = db.Column(db.Integer)
+    rows_written = db.Column(db.Integer, nullable=False, default=0)
+    file_name = db.Column(db.String(255))
+    size_bytes = db.Column(db.BigInteger)
+    error = db.Column(db.String(255))
+    watermark = db.Column(db.BigInteger)                 # change_log high-water mark → next `since`
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    started_at = db.Column(db.TIMESTAMP)
+    heartbeat_at = db.Column(db.TIMESTAMP)               # bumped per chunk while running
+    finished_at = db.Column(db.TIMESTAMP)
+    expires_at = db.Column(db.TIMESTAMP)
+
+    __table_args__ = (
+        db.Index("idx_export_jobs_user", "user_id", "id"),
+        db.Index("idx_export_jobs_status_expires", "status", "expires_at"),
+    )
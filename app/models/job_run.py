@@ -0,0 +1,42 @@
+# app/models/job_run.py
+from .. import db
+
+
+class SchedulerLease(db.Model):
+    """
+    One row per lease name ("scheduler"). The process whose `holder` is set and
+    whose `expires_at` (DB clock) is in the future runs the scheduled jobs;
+    it renews the lease on every heartbeat (app/utils/leader.py).
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = db.Column(db.String(40), primary_key=True)
+    holder = db.Column(db.String(120))          # "<host>:<pid>:<random>"
+    acquired_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime)
+
+
+class JobRun(db.Model):
+    """
+    History of scheduled job executions.
+    status: running → ok | failed. (job, slot) is unique, so the same firing
+    can't run twice even if two processes briefly both think they lead.
+    """
+    __tablename__ = "job_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job = db.Column(db.String(60), nullable=False)
+    slot = db.Column(db.DateTime, nullable=False)   # scheduled minute (scheduler timezone)
+    holder = db.Column(db.String(120), nullable=False)
+    status = db.Column(db.String(10), nullable=False, default="running")
+    rows = db.Column(db.Integer)                    # rows processed, as reported by the job
+    error = db.Column(db.String(255))
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+
+    __table_args__ = (
+        db.UniqueConstraint("job", "slot", name="uq_job_runs_job_slot"),
+        db.Index("idx_job_runs_started", "started_at"),
+    )
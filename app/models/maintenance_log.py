@@ -6,24 +6,60 @@ class MaintenanceLog(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
 
-    asset_id = db.Column(
+    # active_history: the counter / schedule events need the value being replaced
+    # even when it wasn't loaded before the change
+    asset_id = db.column_property(db.Column(
         db.Integer,
         db.ForeignKey("assets.id", ondelete="CASCADE"),
         nullable=False
-    )
+    ), active_history=True)
 
-    service_date = db.Column(db.Date, nullable=False)
+    service_date = db.column_property(db.Column(db.Date, nullable=False), active_history=True)
     description = db.Column(db.Text)
     parts_used = db.Column(db.String(255))
-    cost = db.Column(db.Numeric(10, 2), default=0)
+    cost = db.column_property(db.Column(db.Numeric(10, 2), default=0), active_history=True)
     attachment_path = db.Column(db.String(255))
-    next_service_due = db.Column(db.Date)
+    next_service_due = db.column_property(db.Column(db.Date), active_history=True)
     technician_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp()
+    )
+
+    # client-generated key (offline sync retries) → one row per technician+key
+    idempotency_key = db.Column(db.String(64))
+
+    __table_args__ = (
+        db.UniqueConstraint("technician_id", "idempotency_key", name="uq_mlogs_tech_idem_key"),
+        # per-asset history: windows, keyset pages and summaries
+        db.Index("idx_mlogs_asset_service_date", "asset_id", "service_date", "id"),
+    )
 
     asset = db.relationship(
         "Asset",
         backref=db.backref("maintenance_logs", cascade="all, delete-orphan"),
         passive_deletes=True
     )
-    technician = db.relationship("User", backref="maintenance_jobs")
\ No newline at end of file
+    technician = db.relationship("User", backref="maintenance_jobs")
+
+    @classmethod
+    def latest_for(cls, asset_ids):
+        """
+        {asset_id: latest log} for many assets in one query
+        (ROW_NUMBER over (asset_id, service_date desc, id desc) — uses idx_mlogs_asset_service_date).
+        """
+        if not asset_ids:
+            return {}
+        rn = db.func.row_number().over(
+            partition_by=cls.asset_id,
+            order_by=(cls.service_date.desc(), cls.id.desc()),
+        ).label("rn")
+        ranked = (
+            db.session.query(cls.id.label("id"), rn)
+            .filter(cls.asset_id.in_(asset_ids))
+            .subquery()
+        )
+        rows = cls.query.join(ranked, cls.id == ranked.c.id).filter(ranked.c.rn == 1).all()
+        return {log.asset_id: log for log in rows}
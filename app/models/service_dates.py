@@ -0,0 +1,100 @@
+# app/models/service_dates.py
+"""
+assets.last_service_date / assets.next_service_due, kept in step with the
+maintenance logs by the mapper events below (same transaction as the change).
+
+next_service_due = the latest log's next_service_due when it has one, else
+anchor + frequency_days, where anchor is the last service, the purchase date
+or the day the asset was added — so every asset has a due date and the work
+queue can keyset on (next_service_due, id) without NULLs.
+"""
+from datetime import timedelta
+
+from sqlalchemy import event, inspect
+
+from .. import db
+from ..utils import clock
+
+DEFAULT_FREQUENCY = 180
+
+
+def compute(last_service, last_next_due, purchase_date, added_on, frequency_days):
+    """(last_service_date, next_service_due) for one asset."""
+    if last_next_due:
+        return last_service, last_next_due
+    anchor = last_service or purchase_date or added_on or clock.today()
+    return last_service, anchor + timedelta(days=frequency_days or DEFAULT_FREQUENCY)
+
+
+def _latest_log(connection, asset_id):
+    """(service_date, next_service_due) of the newest log — walks idx_mlogs_asset_service_date."""
+    from .maintenance_log import MaintenanceLog as L
+    row = connection.execute(
+        db.select(L.service_date, L.next_service_due)
+        .where(L.asset_id == asset_id)
+        .order_by(L.service_date.desc(), L.id.desc())
+        .limit(1)
+    ).first()
+    return row if row is not None else (None, None)
+
+
+def _added_on(created_at):
+    return created_at.date() if created_at else None
+
+
+def refresh(connection, asset_id) -> None:
+    """Recompute one asset's schedule columns from its logs."""
+    from .asset import Asset
+    if asset_id is None:
+        return
+    asset = connection.execute(
+        db.select(Asset.purchase_date, Asset.created_at, Asset.frequency_days).where(Asset.id == asset_id)
+    ).first()
+    if asset is None:
+        return
+    last, due = compute(*_latest_log(connection, asset_id), asset.purchase_date,
+                        _added_on(asset.created_at), asset.frequency_days)
+    connection.execute(
+        Asset.__table__.update()
+        .where(Asset.__table__.c.id == asset_id)
+        .values(last_service_date=last, next_service_due=due)
+    )
+
+
+def _changed(target, *attrs):
+    state = inspect(target)
+    return any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+def track_service_dates(asset_model, log_model) -> None:
+    @event.listens_for(log_model, "after_insert")
+    @event.listens_for(log_model, "after_delete")
+    def _log_insert_delete(mapper, connection, target):
+        refresh(connection, target.asset_id)
+
+    @event.listens_for(log_model, "after_update")
+    def _log_update(mapper, connection, target):
+        if not _changed(target, "asset_id", "service_date", "next_service_due"):
+            return
+        hist = inspect(target).attrs.asset_id.history
+        for asset_id in {target.asset_id, *(hist.deleted or ())}:
+            refresh(connection, asset_id)
+
+    @event.listens_for(asset_model, "before_insert")
+    def _asset_insert(mapper, connection, target):
+        target.last_service_date, target.next_service_due = compute(
+            None, None, target.purchase_date, clock.today(), target.frequency_days)
+
+    @event.listens_for(asset_model, "before_update")
+    def _asset_update(mapper, connection, target):
+        if not _changed(target, "purchase_date", "frequency_days"):
+            return
+        target.last_service_date, target.next_service_due = compute(
+            *_latest_log(connection, target.id), target.purchase_date,
+            _added_on(target.created_at), target.frequency_days)
+
+
+from .asset import Asset  # noqa: E402
+from .maintenance_log import MaintenanceLog  # noqa: E402
+
+track_service_dates(Asset, MaintenanceLog)
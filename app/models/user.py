@@ -1,6 +1,6 @@
 # app/models/user.py
 from .. import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.password_utils import hash_password, verify_password
 
 class User(db.Model):
     __tablename__ = "users"
@@ -25,6 +25,9 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)              # can login?
     must_change_password = db.Column(db.Boolean, default=False)  # force reset on first login
 
+    # bumped on role / status / password change → older JWTs ("tv" claim) stop matching
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     # ✅ admin UI ke liye: last issued temporary password (optional)
     last_temp_password = db.Column(db.String(128), nullable=True)
 
@@ -34,8 +37,20 @@ class User(db.Model):
     assets = db.relationship("Asset", backref="assigned_user", lazy=True)
 
     # helpers
+    def bump_token_version(self) -> None:
+        """Invalidate every token issued so far (see app/utils/token_state.py)."""
+        self.token_version = (self.token_version or 0) + 1
+
     def set_password(self, raw_password: str) -> None:
-        self.password_hash = generate_password_hash(raw_password)
+        self.password_hash = hash_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
-        return check_password_hash(self.password_hash, raw_password)
\ No newline at end of file
+        """
+        Verify on the bounded hash pool. If the stored hash was made with
+        other cost params than PASSWORD_HASH_METHOD, it is upgraded in place
+        (caller commits).
+        """
+        ok, new_hash = verify_password(self.password_hash, raw_password)
+        if new_hash:
+            self.password_hash = new_hash
+        return ok
\ No newline at end of file
@@ -0,0 +1,141 @@
+# app/prefork.py
+"""
+Support for pre-fork servers (gunicorn --preload, see gunicorn.conf.py).
+
+With APP_PRELOAD=1 the master builds the app once (wsgi.py) and calls warm():
+every app module is imported (app.scheduler only with ENABLE_SCHEDULER, so
+APScheduler isn't loaded when it isn't used), the SQLAlchemy mappers are
+configured and the URL map is compiled, then gc.freeze() moves all of it into
+the permanent generation so the workers share those pages copy-on-write
+instead of each repeating the work. The master never opens a DB connection and starts no
+threads; create_app() leaves the scheduler to after_fork().
+
+after_fork() runs first thing in every worker:
+- engine pools are disposed with close=False, so a child never reuses (or
+  closes) a MySQL socket inherited from its parent;
+- the lazily created thread pools (password hashing, derivatives, export
+  jobs) are forgotten, since their threads don't exist after fork();
+- one worker per host (whoever holds SCHEDULER_LOCK_FILE) starts the
+  scheduler. The others retry the lock every SCHEDULER_HEARTBEAT_SECONDS on
+  a daemon thread, so when the holder exits (crash, or an old worker still
+  draining during a graceful reload) one of them takes over. Across hosts
+  the leader lease (app/utils/leader.py) still decides who runs the jobs.
+
+memory_usage() reads /proc/self/smaps_rollup: `private_kb` is what a worker
+really costs, rss_kb also counts the pages it shares with the master.
+"""
+
+import gc
+import importlib
+import os
+import pkgutil
+import threading
+import time
+
+from sqlalchemy.orm import configure_mappers
+
+import app as app_package
+from app import db
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; preload needs fork() anyway
+    fcntl = None
+
+_lock_fd = None
+
+
+def warm(app) -> dict:
+    """Build shared read-only state in the master; returns timings (ms) + memory."""
+    timings = {}
+
+    t = time.perf_counter()
+    for mod in pkgutil.walk_packages(app_package.__path__, prefix="app."):
+        if mod.name == "app.scheduler" and not app.config.get("ENABLE_SCHEDULER"):
+            continue
+        importlib.import_module(mod.name)
+    timings["imports_ms"] = round((time.perf_counter() - t) * 1000, 1)
+
+    t = time.perf_counter()
+    configure_mappers()
+    app.url_map.update()
+    with app.app_context():
+        db.engines  # engines + dialects are created here, connections are not
+    timings["app_state_ms"] = round((time.perf_counter() - t) * 1000, 1)
+
+    gc.collect()
+    gc.freeze()
+    timings.update(memory_usage())
+    app.logger.info(f"🔥 Preloaded for fork: {timings}")
+    return timings
+
+
+def _claim_background(app) -> bool:
+    """Non-blocking flock on SCHEDULER_LOCK_FILE; held for the life of the process."""
+    global _lock_fd
+    if fcntl is None:
+        return True
+    if _lock_fd is not None:
+        return True
+    fd = os.open(app.config["SCHEDULER_LOCK_FILE"], os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _lock_fd = fd
+    return True
+
+
+def after_fork(app) -> None:
+    """Make inherited state safe in a freshly forked worker, then start its threads."""
+    from app.utils import derivatives, export_jobs, password_utils
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    password_utils.reset_pool()
+    derivatives.reset_pool()
+    export_jobs.reset_pool()
+
+    if app.config.get("ENABLE_SCHEDULER"):
+        _start_background(app)
+
+
+def _start_background(app) -> None:
+    """Start the scheduler now if this worker gets the lock, else as soon as it does."""
+    from app.scheduler import start_scheduler
+
+    if _claim_background(app):
+        start_scheduler(app)
+        return
+
+    def wait_for_lock():
+        interval = app.config.get("SCHEDULER_HEARTBEAT_SECONDS", 15)
+        while True:
+            time.sleep(interval)
+            if _claim_background(app):
+                app.logger.info(f"⏱️ Worker {os.getpid()} took over {app.config['SCHEDULER_LOCK_FILE']}.")
+                start_scheduler(app)
+                return
+
+    threading.Thread(target=wait_for_lock, name="scheduler-lock", daemon=True).start()
+
+
+def memory_usage() -> dict:
+    """{rss_kb, pss_kb, private_kb} of this process (Linux), else {rss_kb} from getrusage."""
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            fields = {}
+            for line in fh:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+        return {
+            "rss_kb": fields.get("Rss", 0),
+            "pss_kb": fields.get("Pss", 0),
+            "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        }
+    except OSError:
+        import resource
+        return {"rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
@@ -12,7 +12,8 @@ Admin-only user management endpoints:
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
-from werkzeug.security import generate_password_hash
+from app.utils.password_utils import hash_password
+from app.utils import token_state
 from app import db
 from app.models import User
 
@@ -104,7 +105,7 @@ def admin_create_user():
         role=role,
         is_active=True,
         must_change_password=True,
-        password_hash=generate_password_hash(temp_password),
+        password_hash=hash_password(temp_password),
         # ✅ persist so admin-table hamesha dikha sake
         last_temp_password=temp_password,
     )
@@ -191,7 +192,7 @@ def admin_bulk_create():
                 role=role,
                 is_active=True,
                 must_change_password=True,
-                password_hash=generate_password_hash(temp_password),
+                password_hash=hash_password(temp_password),
                 last_temp_password=temp_password,   # ✅ persist
             )
             db.session.add(u)
@@ -244,7 +245,9 @@ def admin_update_role(user_id):
         return jsonify({"error": "invalid role"}), 400
     u = User.query.get_or_404(user_id)
     u.role = role
+    u.bump_token_version()  # role is baked into JWT claims
     db.session.commit()
+    token_state.remember(u)
     return jsonify({"message": "role updated"}), 200
 
 @admin_users_bp.put("/admin/users/<int:user_id>/status")
@@ -255,7 +258,9 @@ def admin_toggle_active(user_id):
     active = bool((request.get_json() or {}).get("is_active", True))
     u = User.query.get_or_404(user_id)
     u.is_active = active
+    u.bump_token_version()
     db.session.commit()
+    token_state.remember(u)
     return jsonify({"message": "status updated", "is_active": u.is_active}), 200
 
 @admin_users_bp.post("/admin/users/<int:user_id>/reset-password")
@@ -269,10 +274,12 @@ def admin_reset_password(user_id):
         alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
         new_temp = "".join(secrets.choice(alphabet) for _ in range(12))
     u = User.query.get_or_404(user_id)
-    u.password_hash = generate_password_hash(new_temp)
+    u.password_hash = hash_password(new_temp)
     u.must_change_password = True
     u.last_temp_password = new_temp       # ✅ persist latest temp
+    u.bump_token_version()
     db.session.commit()
+    token_state.remember(u)
     try:
         send_temp_password_email(u.email, u.name, new_temp)
     except Exception:
@@ -8,11 +8,12 @@ Auth routes:
 """
 
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from flask_cors import cross_origin
 from app import db
 from app.models import User  # imports User from app/models/user.py
+from app.utils.password_utils import PasswordHashBusy
+from app.utils import token_state
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -23,6 +24,19 @@ def _json():
     """Safely parse JSON body (never returns None)."""
     return request.get_json(silent=True) or {}
 
+def _hash_busy():
+    """Hash pool saturated (login storm) → tell the client to back off."""
+    resp = jsonify({"error": "server busy, please retry"})
+    resp.headers["Retry-After"] = "2"
+    return resp, 503
+
+def _issue_token(user):
+    """JWT with role + token_version ("tv"); a version bump revokes it."""
+    return create_access_token(
+        identity=str(user.id),  # store user id as string in JWT
+        additional_claims={"role": user.role, "tv": user.token_version or 0},
+    )
+
 # ---------------------------------------------------------------------
 # Register (dev only). In production, keep this ADMIN-only or remove.
 # ---------------------------------------------------------------------
@@ -51,8 +65,11 @@ def register():
         role=role,
         is_active=True,
         must_change_password=False,  # dev default; can set True if you want forced reset
-        password_hash=generate_password_hash(password),
     )
+    try:
+        user.set_password(password)
+    except PasswordHashBusy:
+        return _hash_busy()
     db.session.add(user)
     db.session.commit()
     return jsonify({"message": "registered"}), 201
@@ -75,16 +92,21 @@ def login():
         return jsonify({"error": "email/password required"}), 400
 
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
+    try:
+        ok = bool(user) and user.check_password(password)
+    except PasswordHashBusy:
+        return _hash_busy()
+    if not ok:
         return jsonify({"error": "invalid credentials"}), 401
 
+    # check_password may have upgraded the hash to the configured cost
+    if user in db.session.dirty:
+        db.session.commit()
+
     if not getattr(user, "is_active", True):
         return jsonify({"error": "account disabled"}), 403
 
-    token = create_access_token(
-        identity=str(user.id),  # store user id as string in JWT
-        additional_claims={"role": user.role},
-    )
+    token = _issue_token(user)
 
     return jsonify({
         "access_token": token,
@@ -110,13 +132,19 @@ def change_password():
         return jsonify({"error": "min 8 characters required"}), 400
 
     user = User.query.get_or_404(uid)
-    user.password_hash = generate_password_hash(new_pass)
+    try:
+        user.set_password(new_pass)
+    except PasswordHashBusy:
+        return _hash_busy()
     # stop forcing password reset after a successful change
     if hasattr(user, "must_change_password"):
         user.must_change_password = False
+    # revoke tokens issued with the old password; caller gets a fresh one
+    user.bump_token_version()
 
     db.session.commit()
-    return jsonify({"message": "password updated"}), 200
+    token_state.remember(user)
+    return jsonify({"message": "password updated", "access_token": _issue_token(user)}), 200
 
 # ---------------------------------------------------------------------
 # Current user profile (handy for the app header)
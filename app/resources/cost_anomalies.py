@@ -0,0 +1,97 @@
+# app/resources/cost_anomalies.py
+"""
+Review queue for suspicious maintenance costs (ADMIN / MANAGER):
+- GET   /api/reports/cost-anomalies?status=open&limit=50&before=<id>  → newest first, keyset by id
+- POST  /api/reports/cost-anomalies/scan   {"mode": "incremental" | "full"}
+- PATCH /api/reports/cost-anomalies/<id>   {"status": "confirmed" | "dismissed" | "open"}
+
+Scoring lives in app/utils/cost_anomalies.py; the scheduler runs the
+incremental scan nightly and a full rescan weekly.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.middlewares.rbac import roles_required
+from app import db
+from app.models import CostAnomaly, MaintenanceLog
+from app.utils import cost_anomalies
+
+anomaly_bp = Blueprint("cost_anomalies", __name__)
+
+STATUSES = ("open", "confirmed", "dismissed")
+
+
+def _dump(a: CostAnomaly, log: MaintenanceLog = None):
+    return {
+        "id": a.id,
+        "log_id": a.log_id,
+        "asset_id": a.asset_id,
+        "service_date": log.service_date.strftime("%Y-%m-%d") if log and log.service_date else None,
+        "description": log.description if log else None,
+        "cost": float(a.cost or 0),
+        "expected": float(a.expected or 0),
+        "score": a.score,
+        "method": a.method,
+        "status": a.status,
+        "detected_at": a.detected_at.isoformat() if a.detected_at else None,
+        "reviewed_by": a.reviewed_by,
+        "reviewed_at": a.reviewed_at.isoformat() if a.reviewed_at else None,
+    }
+
+
+@anomaly_bp.get("/reports/cost-anomalies")
+@jwt_required()
+@roles_required("ADMIN", "MANAGER")
+def list_anomalies():
+    status = request.args.get("status", "open")
+    if status not in STATUSES + ("all",):
+        return jsonify({"error": "status must be open, confirmed, dismissed or all"}), 400
+    limit = max(1, min(request.args.get("limit", 50, type=int), 200))
+
+    q = db.session.query(CostAnomaly, MaintenanceLog).join(MaintenanceLog, MaintenanceLog.id == CostAnomaly.log_id)
+    if status != "all":
+        q = q.filter(CostAnomaly.status == status)
+    if before := request.args.get("before", type=int):
+        q = q.filter(CostAnomaly.id < before)
+    rows = q.order_by(CostAnomaly.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        "items": [_dump(a, log) for a, log in rows],
+        "next_before": rows[-1][0].id if has_more else None,
+    }), 200
+
+
+@anomaly_bp.post("/reports/cost-anomalies/scan")
+@jwt_required()
+@roles_required("ADMIN", "MANAGER")
+def run_scan():
+    mode = (request.get_json(silent=True) or {}).get("mode", "incremental")
+    if mode not in ("incremental", "full"):
+        return jsonify({"error": "mode must be incremental or full"}), 400
+    run = cost_anomalies.scan(mode)
+    return jsonify({
+        "run_id": run.id,
+        "mode": run.mode,
+        "scored": run.scored,
+        "flagged": run.flagged,
+        "last_log_id": run.last_log_id,
+    }), 200
+
+
+@anomaly_bp.patch("/reports/cost-anomalies/<int:anomaly_id>")
+@jwt_required()
+@roles_required("ADMIN", "MANAGER")
+def review_anomaly(anomaly_id):
+    status = (request.get_json(silent=True) or {}).get("status")
+    if status not in STATUSES:
+        return jsonify({"error": "status must be open, confirmed or dismissed"}), 400
+    a = CostAnomaly.query.get_or_404(anomaly_id)
+    a.status = status
+    a.reviewed_by = int(get_jwt_identity()) if status != "open" else None
+    a.reviewed_at = datetime.utcnow() if status != "open" else None
+    db.session.commit()
+    return jsonify(_dump(a, db.session.get(MaintenanceLog, a.log_id))), 200
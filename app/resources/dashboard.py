@@ -1,43 +1,73 @@
 from flask import Blueprint, jsonify
-from app.models import Asset, MaintenanceLog
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from datetime import date
-from sqlalchemy import extract, func
+from sqlalchemy import and_, or_
 from app import db
+from app.models import DashboardCounter
+from app.utils import clock
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def _first_period(today: date) -> int:
+    """YYYYMM of the month 11 months back (→ 12 months incl. the current one)."""
+    months = today.year * 12 + today.month - 1 - 11
+    return (months // 12) * 100 + months % 12 + 1
+
+
+def _counter_rows(scope: int, today: date):
+    """
+    One PK-range read of dashboard_counters: the scope's totals row, its last
+    12 monthly rows, and the fleet totals row (for overdue_as_of).
+    """
+    C = DashboardCounter
+    return (
+        C.query
+        .filter(or_(
+            and_(C.scope_user_id == scope, or_(C.period == 0, C.period >= _first_period(today))),
+            and_(C.scope_user_id == 0, C.period == 0),
+        ))
+        .order_by(C.scope_user_id, C.period)
+        .all()
+    )
+
+
 @dashboard_bp.route("/dashboard-summary", methods=["GET"])
+@jwt_required()
 def dashboard_summary():
+    """
+    ADMIN / MANAGER: whole fleet. TECH: assets assigned to them and their logs.
+    Read-only: served from dashboard_counters (maintained by model events);
+    the scheduler's leader rolls the overdue figure forward each day, and
+    overdue_as_of says which day it refers to.
+    """
     try:
-        total_assets = Asset.query.count()
-        total_logs = MaintenanceLog.query.count()
-        overdue_logs = MaintenanceLog.query.filter(MaintenanceLog.next_service_due < date.today()).count()
-
-        # Monthly maintenance cost aggregation
-        monthly_costs = (
-            db.session.query(
-                extract('month', MaintenanceLog.service_date).label('month'),
-                func.sum(MaintenanceLog.cost).label('cost')
-            )
-            .group_by('month')
-            .order_by('month')
-            .all()
-        )
-
-        # Convert month number to name
-        month_map = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        claims = get_jwt() or {}
+        scope = int(get_jwt_identity()) if claims.get("role") == "TECH" else 0
+        today = clock.today()
+
+        rows = _counter_rows(scope, today)
+        fleet = next((r for r in rows if r.scope_user_id == 0 and r.period == 0), None)
+
+        totals = next((r for r in rows if r.scope_user_id == scope and r.period == 0), None)
         monthly_cost = [
-            {"month": month_map[int(month) - 1], "cost": float(cost)} for month, cost in monthly_costs
+            {"year": r.period // 100, "month": MONTH_NAMES[r.period % 100 - 1], "cost": float(r.cost or 0)}
+            for r in rows if r.scope_user_id == scope and r.period and r.logs
         ]
 
         return jsonify({
-            "total_assets": total_assets,
-            "total_logs": total_logs,
-            "overdue_logs": overdue_logs,
+            "scope": "mine" if scope else "all",
+            "total_assets": totals.assets if totals else 0,
+            "total_logs": totals.logs if totals else 0,
+            "overdue_logs": totals.overdue if totals else 0,
+            "overdue_as_of": fleet.overdue_as_of.isoformat() if fleet and fleet.overdue_as_of else None,
             "monthly_cost": monthly_cost
         })
 
     except Exception as e:
+        db.session.rollback()
         print("❌ Dashboard summary error:", e)
-        return jsonify({"error": "Internal Server Error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal Server Error"}), 500
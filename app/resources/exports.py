@@ -0,0 +1,91 @@
+# app/resources/exports.py
+"""
+Background export jobs (app/utils/export_jobs.py):
+- POST /api/exports                {"kind": "assets"|"logs"|"users", "format": "csv"|"jsonl"|"parquet",
+                                    "filters": {"from", "to", "asset_id", "since"}}  → 202 + job
+- GET  /api/exports/<id>           → status + progress (rows_written / rows_total)
+- GET  /api/exports/<id>/download  → the file, via the uploads delivery path (Range, X-Accel-Redirect)
+
+Jobs are visible to their owner and to ADMIN; "users" exports are ADMIN-only.
+"""
+
+from flask import Blueprint, request, jsonify, abort, url_for
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from app import db
+from app.models import ExportJob
+from app.utils import export_jobs
+from app.resources.uploads import send_upload
+
+exports_bp = Blueprint("exports", __name__)
+
+
+def _dump(job: ExportJob):
+    out = {
+        "id": job.id,
+        "kind": job.kind,
+        "format": job.format,
+        "filters": job.filters or {},
+        "status": job.status,
+        "rows_total": job.rows_total,
+        "rows_written": job.rows_written,
+        "progress": round(job.rows_written / job.rows_total, 3) if job.rows_total else (1.0 if job.status == "done" else 0.0),
+        "size_bytes": job.size_bytes,
+        "watermark": job.watermark,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "expires_at": job.expires_at.isoformat() if job.expires_at else None,
+    }
+    if job.status == "done":
+        out["download_url"] = url_for("exports.download_export", job_id=job.id)
+    return out
+
+
+def _visible_job(job_id: int) -> ExportJob:
+    job = db.session.get(ExportJob, job_id)
+    claims = get_jwt() or {}
+    if job is None or (claims.get("role") != "ADMIN" and job.user_id != int(get_jwt_identity())):
+        abort(404)
+    return job
+
+
+@exports_bp.post("/exports")
+@jwt_required()
+def create_export():
+    data = request.get_json(silent=True) or {}
+    kind = data.get("kind")
+    fmt = data.get("format", "csv")
+    filters = data.get("filters") or {}
+    if not isinstance(filters, dict):
+        return jsonify({"error": "filters must be an object"}), 400
+    try:
+        export_jobs.validate(kind, fmt, filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if kind == "users" and (get_jwt() or {}).get("role") != "ADMIN":
+        return jsonify({"error": "forbidden"}), 403
+
+    job = ExportJob(user_id=int(get_jwt_identity()), kind=kind, format=fmt, filters=filters, status="queued")
+    db.session.add(job)
+    db.session.commit()
+    export_jobs.submit(job)
+
+    resp = jsonify(_dump(job))
+    resp.status_code = 202
+    resp.headers["Location"] = url_for("exports.get_export", job_id=job.id)
+    return resp
+
+
+@exports_bp.get("/exports/<int:job_id>")
+@jwt_required()
+def get_export(job_id):
+    return jsonify(_dump(_visible_job(job_id))), 200
+
+
+@exports_bp.get("/exports/<int:job_id>/download")
+@jwt_required()
+def download_export(job_id):
+    job = _visible_job(job_id)
+    if job.status != "done":
+        return jsonify({"error": f"export is {job.status}"}), 410 if job.status == "expired" else 409
+    return send_upload(export_jobs.jobs_dir(), job.file_name, download_name=f"{job.kind}.{job.format}")
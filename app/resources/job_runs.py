@@ -0,0 +1,61 @@
+# app/resources/job_runs.py
+"""
+Scheduler status (ADMIN):
+- GET /api/admin/job-runs?job=<name>&limit=50&before=<id>  → current lease + run history, newest first
+"""
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.middlewares.rbac import roles_required
+from app import db
+from app.models import JobRun, SchedulerLease
+from app.utils.leader import LEASE
+
+job_runs_bp = Blueprint("job_runs", __name__)
+
+
+def _ts(value):
+    return value.isoformat() if value else None
+
+
+def _dump(run: JobRun):
+    return {
+        "id": run.id,
+        "job": run.job,
+        "slot": _ts(run.slot),
+        "holder": run.holder,
+        "status": run.status,
+        "rows": run.rows,
+        "error": run.error,
+        "started_at": _ts(run.started_at),
+        "finished_at": _ts(run.finished_at),
+        "duration_ms": run.duration_ms,
+    }
+
+
+@job_runs_bp.get("/admin/job-runs")
+@jwt_required()
+@roles_required("ADMIN")
+def list_job_runs():
+    limit = max(1, min(request.args.get("limit", 50, type=int), 200))
+
+    q = JobRun.query
+    if job := request.args.get("job"):
+        q = q.filter(JobRun.job == job)
+    if before := request.args.get("before", type=int):
+        q = q.filter(JobRun.id < before)
+    rows = q.order_by(JobRun.id.desc()).limit(limit + 1).all()
+
+    lease = db.session.get(SchedulerLease, LEASE)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        "leader": {
+            "holder": lease.holder,
+            "acquired_at": _ts(lease.acquired_at),
+            "heartbeat_at": _ts(lease.heartbeat_at),
+            "expires_at": _ts(lease.expires_at),
+        } if lease and lease.holder else None,
+        "items": [_dump(r) for r in rows],
+        "next_before": rows[-1].id if has_more else None,
+    }), 200
@@ -1,8 +1,13 @@
 # app/resources/maintenance.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import func, or_, and_
+from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models import MaintenanceLog, Asset
+from app.models.change_log import latest_seq
+from app.utils import keyset
+from app.utils.conditional import conditional
 from datetime import datetime, timedelta
 
 maintenance_bp = Blueprint("maintenance", __name__)
@@ -33,6 +38,69 @@ def _current_user_id() -> int:
     """
     return int(get_jwt_identity())
 
+def _parse_date(value, field):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field} format, expected YYYY-MM-DD")
+
+def _build_log(data: dict, asset, user_id: int) -> MaintenanceLog:
+    """
+    Validate + normalize one log payload for `asset` (shared by single/batch create).
+    Raises ValueError with a client-facing message.
+    """
+    description = (data.get("description") or "").strip()
+    parts_used  = (data.get("parts_used")  or "").strip()
+    try:
+        cost = float(data.get("cost") or 0)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cost")
+
+    # service_date: accept from UI (YYYY-MM-DD) or default to today UTC
+    if data.get("service_date"):
+        service_date = _parse_date(data["service_date"], "service_date")
+    else:
+        service_date = datetime.utcnow().date()
+
+    # next_service_due: provided or auto-calc by asset.frequency_days (default 180)
+    if data.get("next_service_due"):
+        next_service_due = _parse_date(data["next_service_due"], "next_service_due")
+    else:
+        freq = asset.frequency_days or 180
+        next_service_due = service_date + timedelta(days=freq)
+
+    idempotency_key = data.get("idempotency_key")
+    if idempotency_key is not None and not isinstance(idempotency_key, (str, int)):
+        raise ValueError("Invalid idempotency_key")
+    idempotency_key = str(idempotency_key or "").strip() or None
+    if idempotency_key and len(idempotency_key) > MaintenanceLog.idempotency_key.type.length:
+        raise ValueError(f"idempotency_key too long (max {MaintenanceLog.idempotency_key.type.length})")
+
+    return MaintenanceLog(
+        asset_id=asset.id,
+        service_date=service_date,
+        description=description,
+        parts_used=parts_used,
+        cost=cost,
+        technician_id=user_id,
+        attachment_path=data.get("attachment_path"),
+        next_service_due=next_service_due,
+        idempotency_key=idempotency_key,
+    )
+
+def dump_log(log: MaintenanceLog) -> dict:
+    return {
+        "id": log.id,
+        "asset_id": log.asset_id,
+        "service_date": log.service_date.strftime("%Y-%m-%d") if log.service_date else None,
+        "description": log.description,
+        "parts_used": log.parts_used,
+        "cost": float(log.cost or 0),
+        "technician_id": log.technician_id,
+        "attachment_path": log.attachment_path,
+        "next_service_due": log.next_service_due.strftime("%Y-%m-%d") if log.next_service_due else None
+    }
+
 # ─────────────────────────────────────────────────────────
 # POST: Create maintenance log
 #   - ADMIN / MANAGER: any asset
@@ -65,88 +133,199 @@ def add_maintenance_log(asset_id):
     if role == "TECH" and asset.assigned_user_id != user_id:
         return jsonify({"error": "Forbidden: Asset not assigned to you"}), 403
 
-    # normalize
-    description = (data.get("description") or "").strip()
-    parts_used  = (data.get("parts_used")  or "").strip()
-    cost = float(data.get("cost") or 0)
-
-    # service_date: accept from UI (YYYY-MM-DD) or default to today UTC
-    if data.get("service_date"):
-        try:
-            service_date = datetime.strptime(data["service_date"], "%Y-%m-%d").date()
-        except ValueError:
-            return jsonify({"error": "Invalid service_date format, expected YYYY-MM-DD"}), 400
-    else:
-        service_date = datetime.utcnow().date()
-
-    # next_service_due: provided or auto-calc by asset.frequency_days (default 180)
-    if data.get("next_service_due"):
-        try:
-            next_service_due = datetime.strptime(data["next_service_due"], "%Y-%m-%d").date()
-        except ValueError:
-            return jsonify({"error": "Invalid next_service_due format, expected YYYY-MM-DD"}), 400
-    else:
-        freq = asset.frequency_days or 180
-        next_service_due = service_date + timedelta(days=freq)
+    try:
+        new_log = _build_log(data, asset, user_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    new_log = MaintenanceLog(
-        asset_id=asset_id,
-        service_date=service_date,
-        description=description,
-        parts_used=parts_used,
-        cost=cost,
-        technician_id=user_id,
-        attachment_path=data.get("attachment_path"),
-        next_service_due=next_service_due
-    )
+    # retried request with the same idempotency_key → return the original
+    if new_log.idempotency_key:
+        existing = MaintenanceLog.query.filter_by(
+            technician_id=user_id, idempotency_key=new_log.idempotency_key
+        ).first()
+        if existing:
+            return jsonify({"message": "Maintenance log already recorded", "log": dump_log(existing)}), 200
 
     db.session.add(new_log)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # a concurrent retry with the same key committed first → return its row
+        db.session.rollback()
+        existing = new_log.idempotency_key and MaintenanceLog.query.filter_by(
+            technician_id=user_id, idempotency_key=new_log.idempotency_key
+        ).first()
+        if not existing:
+            raise
+        return jsonify({"message": "Maintenance log already recorded", "log": dump_log(existing)}), 200
 
     return jsonify({
         "message": "Maintenance log added",
-        "log": {
-            "id": new_log.id,
-            "asset_id": asset_id,
-            "service_date": new_log.service_date.strftime("%Y-%m-%d") if new_log.service_date else None,
-            "description": new_log.description,
-            "parts_used": new_log.parts_used,
-            "cost": float(new_log.cost or 0),
-            "technician_id": new_log.technician_id,
-            "attachment_path": new_log.attachment_path,
-            "next_service_due": new_log.next_service_due.strftime("%Y-%m-%d") if new_log.next_service_due else None
-        }
+        "log": dump_log(new_log)
     }), 201
 
+# ─────────────────────────────────────────────────────────
+# POST: Batch create (offline sync / whole-floor servicing)
+#   - one IN query for all referenced assets, TECH check in memory
+#   - idempotency_key per item: already-synced items come back as duplicates
+#   - all new rows inserted in a single transaction
+# Body: {"logs": [{"asset_id": 1, "idempotency_key": "<uuid>", ...same fields as above}]}
+# ─────────────────────────────────────────────────────────
+@maintenance_bp.route("/maintenance/batch", methods=["POST"])
+@jwt_required()
+@roles_required("ADMIN", "MANAGER", "TECH")
+def add_maintenance_logs_batch():
+    items = (request.get_json(silent=True) or {}).get("logs")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Provide non-empty 'logs' array"}), 400
+    max_items = current_app.config.get("MAINTENANCE_BATCH_MAX", 500)
+    if len(items) > max_items:
+        return jsonify({"error": f"Too many logs (max {max_items})"}), 413
+
+    role = (get_jwt() or {}).get("role")
+    user_id = _current_user_id()
+
+    # 1) prefetch assets + already-synced keys (two queries total)
+    def _asset_id(item):
+        try:
+            return int(item.get("asset_id"))
+        except (TypeError, ValueError):
+            return None
+
+    asset_ids = {_asset_id(i) for i in items if isinstance(i, dict)} - {None}
+    assets = {a.id: a for a in Asset.query.filter(Asset.id.in_(asset_ids)).all()} if asset_ids else {}
+
+    keys = {str(i.get("idempotency_key")).strip() for i in items if isinstance(i, dict) and i.get("idempotency_key")}
+    seen = {}
+    if keys:
+        seen = {
+            log.idempotency_key: log
+            for log in MaintenanceLog.query.filter(
+                MaintenanceLog.technician_id == user_id,
+                MaintenanceLog.idempotency_key.in_(keys),
+            )
+        }
+
+    # 2) validate in memory
+    pending, duplicates, errors = [], [], []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": i, "error": "Invalid item"})
+            continue
+        asset = assets.get(_asset_id(item))
+        if asset is None:
+            errors.append({"index": i, "error": "Asset not found"})
+            continue
+        if role == "TECH" and asset.assigned_user_id != user_id:
+            errors.append({"index": i, "error": "Forbidden: Asset not assigned to you"})
+            continue
+        try:
+            log = _build_log(item, asset, user_id)
+        except ValueError as e:
+            errors.append({"index": i, "error": str(e)})
+            continue
+
+        key = log.idempotency_key
+        if key and key in seen:
+            duplicates.append((i, key, seen[key]))
+            continue
+        if key:
+            seen[key] = log  # same key twice inside one batch → keep the first
+        pending.append((i, log))
+
+    # 3) one transaction for everything new
+    if pending:
+        db.session.add_all([log for _, log in pending])
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # a concurrent retry of the same sync won the race; next retry dedupes cleanly
+            db.session.rollback()
+            return jsonify({"error": "Conflicting concurrent sync, please retry"}), 409
+
+    created = [{"index": i, "idempotency_key": log.idempotency_key, "log": dump_log(log)} for i, log in pending]
+    duplicates = [{"index": i, "idempotency_key": key, "id": log.id} for i, key, log in duplicates]
+    return jsonify({"created": created, "duplicates": duplicates, "errors": errors}), 200
+
 # ─────────────────────────────────────────────────────────
 # GET: List logs for asset (all authenticated roles)
+#   ?from=YYYY-MM-DD&to=YYYY-MM-DD   service_date window (inclusive)
+#   ?limit=50[&cursor=<next_cursor>] keyset pages → {"items", "next_cursor"}
+#   ?summary=true                    count / cost totals from SQL, no rows
+# Without limit/summary the plain array is returned (old contract).
+# All variants walk idx_mlogs_asset_service_date (asset_id, service_date, id).
 # ─────────────────────────────────────────────────────────
+def _logs_fingerprint(asset_id):
+    """count / max(updated_at) / max(id) of the asset's logs + the log feed sequence."""
+    total, last_updated, max_id = (
+        db.session.query(
+            func.count(MaintenanceLog.id),
+            func.max(MaintenanceLog.updated_at),
+            func.max(MaintenanceLog.id),
+        )
+        .filter(MaintenanceLog.asset_id == asset_id)
+        .one()
+    )
+    if not total:
+        return None  # nothing to cache (and the view still 404s unknown assets)
+    return (asset_id, total, str(last_updated), max_id, latest_seq("maintenance_log")), last_updated
+
 @maintenance_bp.route("/assets/<int:asset_id>/maintenance", methods=["GET"])
 @jwt_required()
+@conditional(_logs_fingerprint)
 def get_logs(asset_id):
     # ensure asset exists
     Asset.query.get_or_404(asset_id)
 
-    logs = (
-        MaintenanceLog.query
-        .filter_by(asset_id=asset_id)
-        .order_by(MaintenanceLog.service_date.desc())
-        .all()
-    )
+    q = MaintenanceLog.query.filter(MaintenanceLog.asset_id == asset_id)
+    try:
+        if request.args.get("from"):
+            q = q.filter(MaintenanceLog.service_date >= _parse_date(request.args["from"], "from"))
+        if request.args.get("to"):
+            q = q.filter(MaintenanceLog.service_date <= _parse_date(request.args["to"], "to"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify([
-        {
-            "id": log.id,
-            "description": log.description,
-            "service_date": log.service_date.strftime("%Y-%m-%d") if log.service_date else None,
-            "parts_used": log.parts_used,
-            "cost": float(log.cost or 0),
-            "technician_id": log.technician_id,
-            "attachment_path": log.attachment_path,
-            "next_service_due": log.next_service_due.strftime("%Y-%m-%d") if log.next_service_due else None
-        }
-        for log in logs
-    ]), 200
+    if request.args.get("summary", "").lower() in ("1", "true", "yes"):
+        count, total, avg, first, last = q.with_entities(
+            func.count(MaintenanceLog.id),
+            func.coalesce(func.sum(MaintenanceLog.cost), 0),
+            func.avg(MaintenanceLog.cost),
+            func.min(MaintenanceLog.service_date),
+            func.max(MaintenanceLog.service_date),
+        ).one()
+        return jsonify({
+            "asset_id": asset_id,
+            "count": count,
+            "total_cost": float(total or 0),
+            "avg_cost": round(float(avg), 2) if avg is not None else None,
+            "first_service_date": first.strftime("%Y-%m-%d") if first else None,
+            "last_service_date": last.strftime("%Y-%m-%d") if last else None,
+        }), 200
+
+    order = (MaintenanceLog.service_date.desc(), MaintenanceLog.id.desc())
+    limit = request.args.get("limit", type=int)
+    if limit is None:
+        return jsonify([dump_log(log) for log in q.order_by(*order).all()]), 200
+
+    limit = max(1, min(limit, current_app.config.get("MAINTENANCE_PAGE_MAX", 200)))
+    if cursor := request.args.get("cursor"):
+        try:
+            c_date, c_id = keyset.decode(cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # rows strictly after the cursor in (service_date desc, id desc) order
+        q = q.filter(or_(
+            MaintenanceLog.service_date < c_date,
+            and_(MaintenanceLog.service_date == c_date, MaintenanceLog.id < c_id),
+        ))
+
+    rows = q.order_by(*order).limit(limit + 1).all()
+    items = rows[:limit]
+    return jsonify({
+        "items": [dump_log(log) for log in items],
+        "next_cursor": keyset.encode(items[-1].service_date, items[-1].id) if len(rows) > limit else None,
+    }), 200
 
 # ─────────────────────────────────────────────────────────
 # PUT: Update a log
@@ -1,14 +1,23 @@
 # /app/resources/report_routes.py
 
-from flask import Blueprint, jsonify, request, current_app, send_file
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, Response, jsonify, request, current_app, send_file, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt
 from app import db
+from app.utils import analytics_snapshot, export_cache, export_formats, calendar_projection, cost_forecast, depreciation, keyset
 from app.models.maintenance_log import MaintenanceLog
 from app.models.asset import Asset
-from sqlalchemy import extract, func
+from app.models.change_log import latest_seq
+from sqlalchemy import and_, extract, func, or_
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import csv
 import io
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
 
 report_bp = Blueprint("reports", __name__)
 
@@ -25,22 +34,32 @@ def monthly_cost():
     today = datetime.today()
     one_year_ago = today.replace(year=today.year - 1)
 
-    results = db.session.query(
-        extract("year", MaintenanceLog.service_date).label("year"),
-        extract("month", MaintenanceLog.service_date).label("month"),
-        func.sum(MaintenanceLog.cost).label("total_cost")
-    ).filter(
-        MaintenanceLog.service_date >= one_year_ago
-    ).group_by("year", "month").order_by("year", "month").all()
+    # analytics snapshot first (if enabled and fresh), live SQL otherwise
+    snap = analytics_snapshot.read(
+        "SELECT year(service_date), month(service_date), sum(cost) FROM maintenance_logs "
+        "WHERE service_date >= ? GROUP BY 1, 2 ORDER BY 1, 2",
+        [one_year_ago.date()],
+    )
+    if snap is not None:
+        results, as_of = snap
+    else:
+        as_of = None
+        results = db.session.query(
+            extract("year", MaintenanceLog.service_date).label("year"),
+            extract("month", MaintenanceLog.service_date).label("month"),
+            func.sum(MaintenanceLog.cost).label("total_cost")
+        ).filter(
+            MaintenanceLog.service_date >= one_year_ago
+        ).group_by("year", "month").order_by("year", "month").all()
 
     data = [
         {
-            "year": int(r.year),
-            "month": int(r.month),
-            "total_cost": float(r.total_cost)
-        } for r in results
+            "year": int(year),
+            "month": int(month),
+            "total_cost": float(total_cost or 0)
+        } for year, month, total_cost in results
     ]
-    return jsonify(data)
+    return analytics_snapshot.tag(jsonify(data), as_of)
 
 # ───────────────────────────────────────────────────────────────
 # ✅ 2. Warranty Expiring Soon Report
@@ -60,73 +79,440 @@ def warranty_expiring():
     today = datetime.today().date()
     deadline = today + timedelta(days=days)
 
-    assets = Asset.query.filter(
-        Asset.warranty_end != None,
-        Asset.warranty_end >= today,
-        Asset.warranty_end <= deadline
-    ).all()
+    snap = analytics_snapshot.read(
+        "SELECT id, name, category, warranty_end FROM assets "
+        "WHERE warranty_end BETWEEN ? AND ? ORDER BY id",
+        [today, deadline],
+    )
+    if snap is not None:
+        assets, as_of = snap
+    else:
+        as_of = None
+        assets = db.session.query(Asset.id, Asset.name, Asset.category, Asset.warranty_end).filter(
+            Asset.warranty_end != None,
+            Asset.warranty_end >= today,
+            Asset.warranty_end <= deadline
+        ).order_by(Asset.id).all()
 
-    return jsonify([
+    return analytics_snapshot.tag(jsonify([
         {
-            "id": a.id,
-            "name": a.name,
-            "category": a.category,
-            "warranty_end": a.warranty_end.strftime("%Y-%m-%d")
-        } for a in assets
-    ])
+            "id": a_id,
+            "name": name,
+            "category": category,
+            "warranty_end": warranty_end.strftime("%Y-%m-%d")
+        } for a_id, name, category, warranty_end in assets
+    ]), as_of)
 
 # ───────────────────────────────────────────────────────────────
-# ✅ 3a. Export Assets to CSV
+# ✅ 2a. Warranty Timeline (bucketed counts + keyset drill-down)
+#   /reports/warranty-timeline?days=90&bucket=week|month
+#       → per-day counts from one GROUP BY warranty_end over
+#         idx_assets_warranty (or the category / location composites),
+#         kept in a small in-process LRU per (day, filters); any days /
+#         bucket is folded from them
+#   /reports/warranty-timeline/assets?from=&to=&limit=50[&cursor=]
+#       → assets in one bucket, keyset on (warranty_end, id)
+#   Both take optional category / location filters.
 # ───────────────────────────────────────────────────────────────
-@report_bp.route("/reports/assets/export", methods=["GET"])
+WARRANTY_BUCKETS = ("week", "month")
+WARRANTY_MAX_DAYS = 730
+
+_timeline_lock = threading.Lock()
+_timeline_counts = OrderedDict()  # (today, category, location) -> ({warranty_end: count}, expires_at)
+
+def _parse_day(value, field):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field} format, expected YYYY-MM-DD")
+
+def _warranty_filters(q):
+    if category := request.args.get("category"):
+        q = q.filter(Asset.category == category)
+    if location := request.args.get("location"):
+        q = q.filter(Asset.location == location)
+    return q
+
+def _bucket_start(day, bucket):
+    return day - timedelta(days=day.weekday()) if bucket == "week" else day.replace(day=1)
+
+def _next_bucket(start, bucket):
+    if bucket == "week":
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def _warranty_day_counts(today, category, location):
+    """
+    {warranty_end: count} over [today, today + WARRANTY_MAX_DAYS] for one
+    filter combination. Reused for WARRANTY_TIMELINE_TTL_SECONDS; at most
+    WARRANTY_TIMELINE_CACHE_SIZE combinations are kept (least recently used
+    dropped first).
+    """
+    cfg = current_app.config
+    key = (today, category or None, location or None)
+    now = time.monotonic()
+    with _timeline_lock:
+        hit = _timeline_counts.get(key)
+        if hit and hit[1] > now:
+            _timeline_counts.move_to_end(key)
+            return hit[0]
+
+    counts = dict(_warranty_filters(
+        db.session.query(Asset.warranty_end, func.count(Asset.id))
+        .filter(Asset.warranty_end >= today, Asset.warranty_end <= today + timedelta(days=WARRANTY_MAX_DAYS))
+    ).group_by(Asset.warranty_end).all())
+
+    with _timeline_lock:
+        _timeline_counts[key] = (counts, now + cfg.get("WARRANTY_TIMELINE_TTL_SECONDS", 900))
+        _timeline_counts.move_to_end(key)
+        while len(_timeline_counts) > cfg.get("WARRANTY_TIMELINE_CACHE_SIZE", 256):
+            _timeline_counts.popitem(last=False)
+    return counts
+
+def _warranty_buckets(per_day, today, deadline, bucket):
+    counts = {}
+    for day, n in per_day.items():
+        if day <= deadline:
+            key = _bucket_start(day, bucket)
+            counts[key] = counts.get(key, 0) + n
+
+    # every bucket in the window (zeros included), clipped to [today, deadline]
+    buckets, running, start = [], 0, _bucket_start(today, bucket)
+    while start <= deadline:
+        nxt = _next_bucket(start, bucket)
+        running += counts.get(start, 0)
+        buckets.append({
+            "from": max(start, today).strftime("%Y-%m-%d"),
+            "to": min(nxt - timedelta(days=1), deadline).strftime("%Y-%m-%d"),
+            "count": counts.get(start, 0),
+            "cumulative": running,
+        })
+        start = nxt
+    return buckets
+
+@report_bp.route("/reports/warranty-timeline", methods=["GET"])
 @jwt_required()
-def export_assets_csv():
+def warranty_timeline():
     """
-    Returns all assets as a downloadable CSV file.
+    Warranties ending in the next N days (default 90, max 730), counted per
+    week or month. `cumulative` is the running total up to each bucket's end,
+    so the different horizons come out of one call.
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
+    days = request.args.get("days", 90, type=int)
+    if days is None or not 1 <= days <= WARRANTY_MAX_DAYS:
+        return jsonify({"error": f"Invalid 'days' parameter (1-{WARRANTY_MAX_DAYS})"}), 400
+    bucket = request.args.get("bucket", "week")
+    if bucket not in WARRANTY_BUCKETS:
+        return jsonify({"error": "bucket must be week or month"}), 400
 
-    writer.writerow(["ID", "Name", "Category", "Location", "Purchase Date", "Warranty End", "Frequency Days"])
+    today = datetime.today().date()
+    deadline = today + timedelta(days=days)
+    category, location = request.args.get("category"), request.args.get("location")
 
-    for asset in Asset.query.all():
-        writer.writerow([
-            asset.id,
-            asset.name,
-            asset.category,
-            asset.location,
-            asset.purchase_date.strftime("%Y-%m-%d") if asset.purchase_date else "",
-            asset.warranty_end.strftime("%Y-%m-%d") if asset.warranty_end else "",
-            asset.frequency_days or 0
-        ])
-
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode()),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name="assets.csv"
+    per_day = _warranty_day_counts(today, category, location)
+    buckets = _warranty_buckets(per_day, today, deadline, bucket)
+    return jsonify({
+        "from": today.strftime("%Y-%m-%d"),
+        "to": deadline.strftime("%Y-%m-%d"),
+        "bucket": bucket,
+        "category": category,
+        "location": location,
+        "total": buckets[-1]["cumulative"] if buckets else 0,
+        "buckets": buckets,
+    })
+
+@report_bp.route("/reports/warranty-timeline/assets", methods=["GET"])
+@jwt_required()
+def warranty_timeline_assets():
+    """
+    Drill-down into one bucket: assets with warranty_end in [from, to],
+    ordered by (warranty_end, id) → {"items", "next_cursor"}.
+    """
+    today = datetime.today().date()
+    try:
+        start = _parse_day(request.args["from"], "from") if request.args.get("from") else today
+        end = _parse_day(request.args["to"], "to") if request.args.get("to") else start + timedelta(days=30)
+        cursor = keyset.decode(request.args["cursor"]) if request.args.get("cursor") else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = max(1, min(request.args.get("limit", 50, type=int), 200))
+
+    q = _warranty_filters(
+        db.session.query(Asset.id, Asset.name, Asset.category, Asset.location, Asset.warranty_end)
+        .filter(Asset.warranty_end >= start, Asset.warranty_end <= end)
     )
+    if cursor:
+        c_date, c_id = cursor
+        # rows strictly after the cursor in (warranty_end, id) order
+        q = q.filter(or_(
+            Asset.warranty_end > c_date,
+            and_(Asset.warranty_end == c_date, Asset.id > c_id),
+        ))
+
+    rows = q.order_by(Asset.warranty_end, Asset.id).limit(limit + 1).all()
+    items = rows[:limit]
+    return jsonify({
+        "items": [{
+            "id": a_id,
+            "name": name,
+            "category": category,
+            "location": location,
+            "warranty_end": warranty_end.strftime("%Y-%m-%d"),
+        } for a_id, name, category, location, warranty_end in items],
+        "next_cursor": keyset.encode(items[-1][4], items[-1][0]) if len(rows) > limit else None,
+    })
 
 # ───────────────────────────────────────────────────────────────
-# ✅ 3b. Export Maintenance Logs to CSV
+# ✅ 2b. Maintenance Calendar (projected due dates)
 # ───────────────────────────────────────────────────────────────
-@report_bp.route("/reports/logs/export", methods=["GET"])
+@report_bp.route("/reports/maintenance-calendar", methods=["GET"])
 @jwt_required()
-def export_logs_csv():
+def maintenance_calendar():
+    """
+    Projected services in the next N days (default 90, max 730), bucketed by
+    day | week | technician. One query pulls (last service date, frequency,
+    technician) per asset; the series are expanded with NumPy
+    (app/utils/calendar_projection.py).
+    Optional filters: category, location.
+    """
+    days = request.args.get("days", 90, type=int)
+    if days is None or not 1 <= days <= 730:
+        return jsonify({"error": "Invalid 'days' parameter (1-730)"}), 400
+    bucket = request.args.get("bucket", "day")
+    if bucket not in ("day", "week", "technician"):
+        return jsonify({"error": "bucket must be day, week or technician"}), 400
+
+    last_service = func.max(MaintenanceLog.service_date)
+    q = (
+        db.session.query(
+            Asset.id,
+            Asset.frequency_days,
+            Asset.assigned_user_id,
+            func.coalesce(last_service, Asset.purchase_date),
+        )
+        .outerjoin(MaintenanceLog, MaintenanceLog.asset_id == Asset.id)
+        .group_by(Asset.id, Asset.frequency_days, Asset.assigned_user_id, Asset.purchase_date)
+    )
+    claims = get_jwt() or {}
+    if claims.get("role") == "TECH":
+        q = q.filter(Asset.assigned_user_id == claims.get("sub"))
+    if category := request.args.get("category"):
+        q = q.filter(Asset.category == category)
+    if location := request.args.get("location"):
+        q = q.filter(Asset.location == location)
+
+    rows = [r for r in q.all() if r[3] is not None]  # never serviced and no purchase date → no anchor
+    today = datetime.today().date()
+    horizon = today + timedelta(days=days)
+
+    anchors = np.array([r[3] for r in rows], dtype="datetime64[D]")
+    freqs = np.fromiter(((r[1] or calendar_projection.DEFAULT_FREQUENCY) for r in rows), dtype=np.int64, count=len(rows))
+    techs = np.fromiter(((r[2] or 0) for r in rows), dtype=np.int64, count=len(rows))
+
+    idx, due, overdue = calendar_projection.project(anchors, freqs, today, horizon)
+
+    if bucket == "technician":
+        keys, counts = calendar_projection.bucket_counts(techs[idx])
+        buckets = [{"technician_id": int(k) or None, "count": int(c)} for k, c in zip(keys, counts)]
+    else:
+        dates = calendar_projection.week_start(due) if bucket == "week" else due
+        keys, counts = calendar_projection.bucket_counts(dates)
+        buckets = [{"date": str(k), "count": int(c)} for k, c in zip(keys, counts)]
+
+    return jsonify({
+        "from": today.strftime("%Y-%m-%d"),
+        "to": horizon.strftime("%Y-%m-%d"),
+        "bucket": bucket,
+        "assets": len(rows),
+        "overdue_assets": int(overdue.sum()),
+        "total": int(len(due)),
+        "buckets": buckets,
+    })
+
+# ───────────────────────────────────────────────────────────────
+# ✅ Cost forecast — forward budget per category / location
+# ───────────────────────────────────────────────────────────────
+@report_bp.route("/reports/cost-forecast", methods=["GET"])
+@jwt_required()
+def cost_forecast_report():
     """
-    Returns all maintenance logs as a downloadable CSV file.
+    Projected maintenance spend for the next N months (default 12, max 36),
+    per category and location with a monthly breakdown. Served from the
+    nightly precomputed result when it is fresh; otherwise computed once
+    (app/utils/cost_forecast.py) and cached. ?refresh=true forces a rebuild
+    (ADMIN / MANAGER only — it is a full pass over the logs).
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
+    default_months = current_app.config.get("COST_FORECAST_MONTHS", 12)
+    months = request.args.get("months", default_months, type=int)
+    if months is None or not 1 <= months <= 36:
+        return jsonify({"error": "Invalid 'months' parameter (1-36)"}), 400
+
+    name = cost_forecast.cache_name(months)
+    max_age = current_app.config.get("COST_FORECAST_MAX_AGE_HOURS", 26) * 3600
+    refresh = request.args.get("refresh", "false").lower() == "true"
+    if refresh and (get_jwt() or {}).get("role") not in ("ADMIN", "MANAGER"):
+        return jsonify({"error": "Forbidden: refresh requires ADMIN or MANAGER"}), 403
 
-    writer.writerow([
-        "ID", "Asset ID", "Service Date", "Description",
-        "Parts Used", "Cost", "Technician ID", "Next Service Due", "Created At"
-    ])
+    result = None if refresh else export_cache.load_json(name, max_age=max_age)
+    if result is None:
+        result = cost_forecast.refresh_cached(months)
+    return jsonify(result)
+
+# ───────────────────────────────────────────────────────────────
+# ✅ TCO — book value (straight-line / declining-balance) + maintenance spend
+# ───────────────────────────────────────────────────────────────
+TCO_GROUPS = ("asset", "category", "location")
+TCO_STREAM_BATCH = 500
+
+def _tco_rows(as_of):
+    """One aggregate query: per-asset purchase data + summed maintenance up to `as_of`."""
+    spend = func.coalesce(func.sum(MaintenanceLog.cost), 0)
+    q = (
+        db.session.query(
+            Asset.id, Asset.name, Asset.category, Asset.location,
+            Asset.purchase_date, Asset.purchase_cost, Asset.useful_life_years,
+            spend, func.count(MaintenanceLog.id),
+        )
+        .outerjoin(MaintenanceLog, (MaintenanceLog.asset_id == Asset.id) & (MaintenanceLog.service_date <= as_of))
+        .group_by(Asset.id, Asset.name, Asset.category, Asset.location,
+                  Asset.purchase_date, Asset.purchase_cost, Asset.useful_life_years)
+        .order_by(Asset.id)
+    )
+    claims = get_jwt() or {}
+    if claims.get("role") == "TECH":
+        q = q.filter(Asset.assigned_user_id == claims.get("sub"))
+    if category := request.args.get("category"):
+        q = q.filter(Asset.category == category)
+    if location := request.args.get("location"):
+        q = q.filter(Asset.location == location)
+    return q.all()
 
-    for log in MaintenanceLog.query.all():
-        writer.writerow([
+def _tco_columns(rows, as_of):
+    """Column arrays for the whole fleet; depreciation is computed without a per-asset loop."""
+    cfg = current_app.config
+    n = len(rows)
+    cost = np.fromiter((float(r[5] or 0) for r in rows), dtype=float, count=n)
+    life = np.fromiter((r[6] or cfg.get("TCO_USEFUL_LIFE_YEARS", 5) for r in rows), dtype=float, count=n)
+    spend = np.fromiter((float(r[7]) for r in rows), dtype=float, count=n)
+    age = depreciation.age_years([r[4] for r in rows], as_of)
+    salvage = cost * cfg.get("TCO_SALVAGE_RATE", 0.1)
+
+    sl = depreciation.straight_line(cost, salvage, life, age)
+    ddb = depreciation.declining_balance(cost, salvage, life, age, cfg.get("TCO_DB_FACTOR", 2.0))
+    return {
+        "purchase_cost": cost,
+        "maintenance_cost": spend,
+        "book_value_sl": sl,
+        "book_value_db": ddb,
+        "tco": cost + spend,
+        "net_cost_sl": cost + spend - sl,  # TCO minus what the asset is still worth
+        "net_cost_db": cost + spend - ddb,
+        "age_years": age,
+    }
+
+def _tco_stream(head, rows, cols):
+    """Stream {"...head", "items": [...]} in TCO_STREAM_BATCH-row chunks."""
+    yield json.dumps(head)[:-1] + ', "items": ['
+    for start in range(0, len(rows), TCO_STREAM_BATCH):
+        part = []
+        for i in range(start, min(start + TCO_STREAM_BATCH, len(rows))):
+            r = rows[i]
+            item = {
+                "asset_id": r[0], "name": r[1], "category": r[2], "location": r[3],
+                "purchase_date": r[4].strftime("%Y-%m-%d") if r[4] else None,
+                "maintenance_logs": int(r[8]),
+            }
+            item.update({k: round(float(v[i]), 2) for k, v in cols.items()})
+            part.append(json.dumps(item))
+        yield ("," if start else "") + ",".join(part)
+    yield "]}"
+
+@report_bp.route("/reports/tco", methods=["GET"])
+@jwt_required()
+def tco_report():
+    """
+    Book value and total cost of ownership as of a date (default today).
+    ?group=asset (default, streamed) | category | location; optional
+    category / location filters. Assets without purchase_cost count as 0.
+    """
+    group = request.args.get("group", "asset")
+    if group not in TCO_GROUPS:
+        return jsonify({"error": "group must be asset, category or location"}), 400
+    try:
+        as_of = datetime.strptime(request.args["as_of"], "%Y-%m-%d").date() if "as_of" in request.args else datetime.today().date()
+    except ValueError:
+        return jsonify({"error": "as_of must be YYYY-MM-DD"}), 400
+
+    rows = _tco_rows(as_of)
+    cols = _tco_columns(rows, as_of)
+    head = {"as_of": as_of.strftime("%Y-%m-%d"), "group": group, "assets": len(rows)}
+
+    if group == "asset":
+        return Response(_tco_stream(head, rows, cols), mimetype="application/json")
+
+    labels = sorted({(r[2] if group == "category" else r[3]) or "" for r in rows})
+    lookup = {v: i for i, v in enumerate(labels)}
+    codes = np.fromiter((lookup[(r[2] if group == "category" else r[3]) or ""] for r in rows),
+                        dtype=np.int64, count=len(rows))
+    counts = np.bincount(codes, minlength=len(labels))
+    sums = {k: np.bincount(codes, weights=v, minlength=len(labels)) for k, v in cols.items() if k != "age_years"}
+    head["items"] = [
+        dict({group: label or None, "assets": int(counts[i])},
+             **{k: round(float(v[i]), 2) for k, v in sums.items()})
+        for i, label in enumerate(labels)
+    ]
+    return jsonify(head)
+
+# ───────────────────────────────────────────────────────────────
+# CSV helpers — rows are streamed in batches, never built as one big string
+# ───────────────────────────────────────────────────────────────
+CSV_BATCH = 1000
+
+def _csv_chunks(header, rows):
+    """Yield CSV text in ~CSV_BATCH-row chunks."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    for n, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if n % CSV_BATCH == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+def _table_fingerprint(model):
+    """
+    count / max(updated_at) / max(id) + the model's change-feed sequence
+    (updated_at alone misses a second write within the same second).
+    """
+    total, last_updated, max_id = db.session.query(
+        func.count(model.id), func.max(model.updated_at), func.max(model.id)
+    ).one()
+    return total, str(last_updated), max_id, latest_seq(export_formats.DELTA_ENTITIES[model])
+
+ASSET_CSV_HEADER = ["ID", "Name", "Category", "Location", "Purchase Date", "Warranty End", "Frequency Days"]
+
+def _asset_csv_rows(criteria=()):
+    for asset in Asset.query.filter(*criteria).order_by(Asset.id).yield_per(CSV_BATCH):
+        yield [
+            asset.id,
+            asset.name,
+            asset.category,
+            asset.location,
+            asset.purchase_date.strftime("%Y-%m-%d") if asset.purchase_date else "",
+            asset.warranty_end.strftime("%Y-%m-%d") if asset.warranty_end else "",
+            asset.frequency_days or 0
+        ]
+
+LOG_CSV_HEADER = [
+    "ID", "Asset ID", "Service Date", "Description",
+    "Parts Used", "Cost", "Technician ID", "Next Service Due", "Created At"
+]
+
+def _log_csv_rows(criteria=()):
+    for log in MaintenanceLog.query.filter(*criteria).order_by(MaintenanceLog.id).yield_per(CSV_BATCH):
+        yield [
             log.id,
             log.asset_id,
             log.service_date.strftime("%Y-%m-%d") if log.service_date else "",
@@ -136,12 +522,102 @@ def export_logs_csv():
             log.technician_id or "",
             log.next_service_due.strftime("%Y-%m-%d") if log.next_service_due else "",
             log.created_at.strftime("%Y-%m-%d %H:%M:%S") if log.created_at else ""
-        ])
-
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode()),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name="maintenance_logs.csv"
-    )
\ No newline at end of file
+        ]
+
+# ───────────────────────────────────────────────────────────────
+# Typed exports (JSON Lines / Parquet) — see app/utils/export_formats.py
+# ───────────────────────────────────────────────────────────────
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+def _parquet_once(columns, criteria, model, name):
+    """Delta Parquet: written to a temp file that is unlinked once opened (nothing to cache)."""
+    fd, tmp = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+    try:
+        export_formats.write_parquet(
+            tmp, columns,
+            export_formats.partitions(columns, criteria, model.id, batch=export_formats.PARQUET_ROW_GROUP),
+        )
+        fh = open(tmp, "rb")
+    finally:
+        os.remove(tmp)
+    return send_file(fh, mimetype="application/vnd.apache.parquet",
+                     as_attachment=True, download_name=f"{name}.parquet")
+
+def _export(model, name, columns, csv_header, csv_rows, date_col):
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be csv, jsonl or parquet"}), 400
+    if fmt == "parquet" and not export_formats.parquet_available():
+        return jsonify({"error": "Parquet export requires pyarrow"}), 501
+    asset_col = Asset.id if model is Asset else MaintenanceLog.asset_id
+    try:
+        criteria, applied = export_formats.build_filters(request.args, asset_col, date_col)
+        # high-water mark is read before any row, so it is safe to pass back as `since`
+        delta, watermark = export_formats.delta_filter(request.args, model)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if fmt == "jsonl" or delta or applied:
+        # live streams: JSON Lines always, CSV / Parquet for since= deltas and filtered
+        # exports (one-off; caching every filter combination would grow without bound)
+        criteria = criteria + delta
+        if fmt == "parquet":
+            resp = _parquet_once(columns, criteria, model, name)
+        else:
+            if fmt == "jsonl":
+                chunks = export_formats.jsonl_chunks(columns, export_formats.partitions(columns, criteria, model.id))
+            else:
+                chunks = _csv_chunks(csv_header, csv_rows(criteria))
+            resp = Response(stream_with_context(chunks),
+                            mimetype="application/x-ndjson" if fmt == "jsonl" else "text/csv")
+            resp.headers["Content-Disposition"] = f'attachment; filename="{name}.{fmt}"'
+    else:
+        # the unfiltered export: one cached artifact per data version
+        fingerprint = _table_fingerprint(model)
+
+        if fmt == "parquet":
+            path = export_cache.file_artifact(
+                name, fingerprint,
+                lambda tmp: export_formats.write_parquet(
+                    tmp, columns,
+                    export_formats.partitions(columns, criteria, model.id, batch=export_formats.PARQUET_ROW_GROUP),
+                ),
+                "parquet",
+            )
+            resp = send_file(path, mimetype="application/vnd.apache.parquet",
+                             as_attachment=True, download_name=f"{name}.parquet")
+        else:
+            path = export_cache.artifact(name, fingerprint, lambda: _csv_chunks(csv_header, csv_rows(criteria)))
+            resp = export_cache.send_artifact(path, "text/csv", f"{name}.csv")
+
+    resp.headers["X-Export-Watermark"] = str(watermark)
+    return resp
+
+# ───────────────────────────────────────────────────────────────
+# ✅ 3a. Export Assets (CSV / JSON Lines / Parquet)
+# ───────────────────────────────────────────────────────────────
+@report_bp.route("/reports/assets/export", methods=["GET"])
+@jwt_required()
+def export_assets_csv():
+    """
+    Returns all assets as a downloadable file: ?format=csv (default) | jsonl | parquet.
+    Optional filters: from / to (purchase_date), asset_id=1,2,3, since=<watermark>.
+    Unfiltered CSV and Parquet are built once per data version (see app/utils/export_cache.py).
+    """
+    return _export(Asset, "assets", export_formats.ASSET_COLUMNS,
+                   ASSET_CSV_HEADER, _asset_csv_rows, Asset.purchase_date)
+
+# ───────────────────────────────────────────────────────────────
+# ✅ 3b. Export Maintenance Logs (CSV / JSON Lines / Parquet)
+# ───────────────────────────────────────────────────────────────
+@report_bp.route("/reports/logs/export", methods=["GET"])
+@jwt_required()
+def export_logs_csv():
+    """
+    Returns maintenance logs as a downloadable file: ?format=csv (default) | jsonl | parquet.
+    Optional filters: from / to (service_date), asset_id=1,2,3, since=<watermark>.
+    Unfiltered CSV and Parquet are built once per data version (see app/utils/export_cache.py).
+    """
+    return _export(MaintenanceLog, "maintenance_logs", export_formats.LOG_COLUMNS,
+                   LOG_CSV_HEADER, _log_csv_rows, MaintenanceLog.service_date)
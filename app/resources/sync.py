@@ -0,0 +1,84 @@
+# app/resources/sync.py
+"""
+Incremental change feed for the Angular client:
+- GET /api/sync?since=<token>&limit=500
+    → {"changes": [{"entity", "id", "op", "data"}], "next": <token>, "has_more": bool}
+
+`token` is the last change_log.id the client has applied (0 = from scratch).
+Pages stop at the commit-safe watermark (app/utils/watermark.py), so a
+change shows up CHANGE_FEED_LAG_SECONDS after it is written and a slow
+transaction's lower id can't be skipped by a token that already moved past it.
+Each page is one PK range scan on change_log plus one IN query per entity
+for the current rows; repeated changes to the same row inside a page are
+collapsed. Deleted rows (and, for TECH, rows outside their assignment) come
+back as {"op": "delete"} tombstones without data.
+"""
+
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from app.models import Asset, MaintenanceLog, ChangeLog
+from app.schemas.asset_schema import asset_schema
+from app.resources.maintenance import dump_log
+from app.utils.watermark import stable_upto
+
+sync_bp = Blueprint("sync", __name__)
+
+
+@sync_bp.get("/sync")
+@jwt_required()
+def change_feed():
+    try:
+        since = int(request.args.get("since", 0))
+    except ValueError:
+        return jsonify({"error": "Invalid 'since' token"}), 400
+    max_limit = current_app.config.get("SYNC_PAGE_MAX", 1000)
+    limit = max(1, min(request.args.get("limit", 500, type=int), max_limit))
+
+    upto = stable_upto(ChangeLog.id, ChangeLog.at)
+    rows = (
+        ChangeLog.query
+        .filter(ChangeLog.id > since, ChangeLog.id <= upto)
+        .order_by(ChangeLog.id)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return jsonify({"changes": [], "next": since, "has_more": False}), 200
+
+    # collapse: last op per (entity, id) wins, ordered by its latest seq
+    latest = {}
+    for r in rows:
+        latest.pop((r.entity, r.entity_id), None)
+        latest[(r.entity, r.entity_id)] = r.op
+
+    wanted_assets = [i for (e, i), op in latest.items() if e == "asset" and op == "upsert"]
+    wanted_logs = [i for (e, i), op in latest.items() if e == "maintenance_log" and op == "upsert"]
+    assets = {a.id: a for a in Asset.query.filter(Asset.id.in_(wanted_assets))} if wanted_assets else {}
+    logs = {l.id: l for l in MaintenanceLog.query.filter(MaintenanceLog.id.in_(wanted_logs))} if wanted_logs else {}
+
+    # TECH: only assigned assets + their logs
+    claims = get_jwt() or {}
+    tech_id = int(get_jwt_identity()) if claims.get("role") == "TECH" else None
+    if tech_id is not None and logs:
+        log_asset_ids = {l.asset_id for l in logs.values()}
+        mine = {
+            a.id for a in Asset.query
+            .with_entities(Asset.id)
+            .filter(Asset.id.in_(log_asset_ids), Asset.assigned_user_id == tech_id)
+        }
+        logs = {k: l for k, l in logs.items() if l.asset_id in mine}
+    if tech_id is not None:
+        assets = {k: a for k, a in assets.items() if a.assigned_user_id == tech_id}
+
+    changes = []
+    for (entity, entity_id), op in latest.items():
+        row = (assets if entity == "asset" else logs).get(entity_id) if op == "upsert" else None
+        if row is None:
+            changes.append({"entity": entity, "id": entity_id, "op": "delete", "data": None})
+        else:
+            data = asset_schema.dump(row) if entity == "asset" else dump_log(row)
+            changes.append({"entity": entity, "id": entity_id, "op": "upsert", "data": data})
+
+    return jsonify({"changes": changes, "next": rows[-1].id, "has_more": has_more}), 200
@@ -1,10 +1,18 @@
 import os
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
-from flask_jwt_extended import jwt_required
-from app.utils.file_utils import save_file
+import mimetypes
+from flask import Blueprint, request, jsonify, send_from_directory, current_app, abort, make_response
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+from app.utils.file_utils import save_file, resolve_upload, allowed_file, CAS_NAME_RE
+from app.utils import chunked_upload, derivatives
 
 upload_bp = Blueprint("uploads", __name__)
 
+# CAS files never change under the same name → cache hard (but only in the user's browser)
+IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+DEFAULT_CACHE = "private, no-cache"
+
 # ✅ Upload a file
 @upload_bp.route("/upload", methods=["POST"])
 @jwt_required()
@@ -17,11 +25,185 @@ def upload_file():
     if error:
         return jsonify({"error": error}), 400
 
+    # thumbnails render in the background pool, not on this request
+    derivatives.schedule(*resolve_upload(filename))
     return jsonify({"message": "Upload successful", "filename": filename}), 201
 
+# ─────────────────────────────────────────────────────────
+# Resumable chunked upload (files bigger than MAX_CONTENT_LENGTH)
+#   POST /api/upload/sessions                {filename, size, sha256} → upload_id, chunk_size
+#   PUT  /api/upload/sessions/<id>?offset=N  raw chunk body (≤ MAX_CONTENT_LENGTH)
+#   GET  /api/upload/sessions/<id>           → offset to resume from
+#   POST /api/upload/sessions/<id>/finalize  → {"filename"} usable as attachment_path
+# ─────────────────────────────────────────────────────────
+def _session_or_404(upload_id):
+    meta = chunked_upload.load_session(upload_id)
+    if not meta or str(meta["owner_id"]) != str(get_jwt_identity()):
+        abort(404)
+    return meta
+
+def _chunk_error(e):
+    body = {"error": str(e)}
+    if e.offset is not None:
+        body["offset"] = e.offset
+    return jsonify(body), e.status
+
+@upload_bp.route("/upload/sessions", methods=["POST"])
+@jwt_required()
+def create_upload_session():
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get("filename") or "")
+    sha256 = (data.get("sha256") or "").strip().lower()
+    try:
+        size = int(data.get("size"))
+    except (TypeError, ValueError):
+        return jsonify({"error": "size (bytes) required"}), 400
+
+    if not filename or not allowed_file(filename):
+        return jsonify({"error": "Invalid file or extension not allowed"}), 400
+    if not CAS_NAME_RE.match(f"{sha256}.x"):
+        return jsonify({"error": "sha256 (hex) required"}), 400
+    if size <= 0 or size > current_app.config["CHUNKED_UPLOAD_MAX_SIZE"]:
+        return jsonify({"error": "size out of range"}), 413
+
+    meta = chunked_upload.create_session(
+        int(get_jwt_identity()), filename, filename.rsplit(".", 1)[1].lower(), size, sha256
+    )
+    return jsonify({
+        "upload_id": meta["upload_id"],
+        "offset": 0,
+        "chunk_size": current_app.config["CHUNKED_UPLOAD_CHUNK_SIZE"],
+    }), 201
+
+@upload_bp.route("/upload/sessions/<upload_id>", methods=["GET"])
+@jwt_required()
+def get_upload_session(upload_id):
+    meta = _session_or_404(upload_id)
+    return jsonify({"upload_id": upload_id, "offset": chunked_upload.received(meta), "size": meta["size"]}), 200
+
+@upload_bp.route("/upload/sessions/<upload_id>", methods=["PUT"])
+@jwt_required()
+def put_upload_chunk(upload_id):
+    meta = _session_or_404(upload_id)
+    offset = request.args.get("offset", type=int)
+    if offset is None:
+        return jsonify({"error": "offset required"}), 400
+    try:
+        new_offset = chunked_upload.append_chunk(meta, offset, request.stream)
+    except chunked_upload.ChunkError as e:
+        return _chunk_error(e)
+    return jsonify({"upload_id": upload_id, "offset": new_offset, "size": meta["size"]}), 200
+
+@upload_bp.route("/upload/sessions/<upload_id>", methods=["DELETE"])
+@jwt_required()
+def delete_upload_session(upload_id):
+    _session_or_404(upload_id)
+    chunked_upload.discard(upload_id)
+    return jsonify({"message": "Upload cancelled"}), 200
+
+@upload_bp.route("/upload/sessions/<upload_id>/finalize", methods=["POST"])
+@jwt_required()
+def finalize_upload_session(upload_id):
+    meta = _session_or_404(upload_id)
+    try:
+        filename = chunked_upload.finalize(meta)
+    except chunked_upload.ChunkError as e:
+        return _chunk_error(e)
+    derivatives.schedule(*resolve_upload(filename))
+    return jsonify({"message": "Upload successful", "filename": filename}), 201
+
+# ─────────────────────────────────────────────────────────
+# Delivery helpers
+#   UPLOAD_DELIVERY = "python"     → send_from_directory (ETag / 304 / Range by werkzeug)
+#                     "x-accel"    → nginx X-Accel-Redirect to UPLOAD_ACCEL_PREFIX/<relpath>
+#                     "x-sendfile" → X-Sendfile: <abs path> (Apache mod_xsendfile / lighttpd)
+# Python only authorizes + answers 304; the web server streams the bytes.
+# ─────────────────────────────────────────────────────────
+def _strong_etag(name: str, path: str) -> str:
+    """CAS name = sha256 of the bytes (strong); legacy: mtime+size fingerprint."""
+    m = CAS_NAME_RE.match(name)
+    if m:
+        return m.group(1)
+    st = os.stat(path)
+    return f"{int(st.st_mtime_ns):x}-{st.st_size:x}"
+
+def send_upload(folder: str, name: str, download_name: str | None = None):
+    """Serve one stored file with conditional-GET, Range and optional offload."""
+    path = safe_join(folder, name)
+    if not path or not os.path.isfile(path):
+        abort(404)
+
+    etag = _strong_etag(name, path)
+    cache = IMMUTABLE_CACHE if CAS_NAME_RE.match(name) else DEFAULT_CACHE
+
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = cache
+        return resp
+
+    mode = current_app.config.get("UPLOAD_DELIVERY", "python")
+    if mode in ("x-accel", "x-sendfile"):
+        resp = make_response("", 200)
+        resp.headers["Content-Type"] = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if mode == "x-accel":
+            rel = os.path.relpath(path, current_app.config["UPLOAD_FOLDER"]).replace(os.sep, "/")
+            prefix = current_app.config.get("UPLOAD_ACCEL_PREFIX", "/_protected_uploads").rstrip("/")
+            resp.headers["X-Accel-Redirect"] = f"{prefix}/{rel}"
+        else:
+            resp.headers["X-Sendfile"] = os.path.abspath(path)
+        if download_name:
+            resp.headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+    else:
+        resp = send_from_directory(
+            folder, name,
+            conditional=True,   # Range → 206, If-None-Match → 304
+            etag=etag,
+            as_attachment=bool(download_name),
+            download_name=download_name,
+        )
+
+    resp.set_etag(etag)
+    resp.headers["Accept-Ranges"] = "bytes"
+    resp.headers["Cache-Control"] = cache
+    return resp
+
+def _send_variant(folder: str, name: str, variant: str):
+    """
+    Serve <name>.<variant>.webp (or .jpg / .png when the client can't take WebP).
+    Not rendered yet → queue it; images fall back to the original meanwhile.
+    """
+    if "image/webp" in (request.headers.get("Accept") or ""):
+        formats = ("webp",)
+    else:
+        formats = derivatives.FALLBACK_FORMATS
+    for fmt in formats:
+        derived = derivatives.derivative_name(name, variant, fmt)
+        if os.path.isfile(os.path.join(folder, derived)):
+            resp = send_upload(folder, derived)
+            resp.vary.add("Accept")
+            return resp
+
+    if not os.path.isfile(os.path.join(folder, name)):
+        abort(404)
+    derivatives.schedule(folder, name)
+    if name.rsplit(".", 1)[-1].lower() in derivatives.IMAGE_EXTS:
+        return send_upload(folder, name)
+    resp = jsonify({"error": "preview not ready"})
+    resp.headers["Retry-After"] = "5"
+    return resp, 404
+
 # ✅ Securely serve uploaded files (auth required)
+#    ?variant=thumb|preview → resized WebP/JPEG derivative
 @upload_bp.route("/uploads/<filename>", methods=["GET"])
 @jwt_required()
 def get_uploaded_file(filename):
-    upload_dir = current_app.config['UPLOAD_FOLDER']
-    return send_from_directory(upload_dir, filename)
\ No newline at end of file
+    # CAS names live in ab/cd/ shards; legacy names stay flat
+    folder, name = resolve_upload(filename)
+
+    variant = request.args.get("variant")
+    if variant:
+        if variant not in current_app.config.get("THUMBNAIL_SIZES", {}):
+            return jsonify({"error": "unknown variant"}), 400
+        return _send_variant(folder, secure_filename(name), variant)
+    return send_upload(folder, name)
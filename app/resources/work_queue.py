@@ -0,0 +1,74 @@
+# app/resources/work_queue.py
+"""
+GET /api/me/work-queue?limit=50[&cursor=<next_cursor>]
+
+The caller's assigned assets, soonest due first, with overdue flags and the
+last service date. One range scan of idx_assets_work_queue
+(assigned_user_id, next_service_due, id, last_service_date, name, updated_at)
+— the index covers the query, so no table rows are read. Built for frequent
+polling: responses carry a weak ETag (count / max(updated_at) of the caller's
+assets from the same index, the change-feed sequence and today's date in
+APP_TIMEZONE, the same business day as the dashboard), so an unchanged queue
+is a 304.
+"""
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import and_, func, or_
+from app import db
+from app.models import Asset
+from app.models.change_log import latest_seq
+from app.utils import clock, keyset
+from app.utils.conditional import conditional
+
+work_queue_bp = Blueprint("work_queue", __name__)
+
+
+def _queue_fingerprint():
+    total, last_updated, max_id = (
+        db.session.query(func.count(Asset.id), func.max(Asset.updated_at), func.max(Asset.id))
+        .filter(Asset.assigned_user_id == int(get_jwt_identity()))
+        .one()
+    )
+    # "overdue" / days_until_due roll over at midnight (APP_TIMEZONE)
+    # log changes move next_service_due without an "asset" feed row
+    return (clock.today().isoformat(), total, str(last_updated), max_id,
+            latest_seq("asset", "maintenance_log")), None
+
+
+@work_queue_bp.get("/me/work-queue")
+@jwt_required()
+@conditional(_queue_fingerprint)
+def my_work_queue():
+    limit = max(1, min(request.args.get("limit", 50, type=int), 200))
+    today = clock.today()
+
+    q = db.session.query(
+        Asset.id, Asset.name, Asset.last_service_date, Asset.next_service_due
+    ).filter(Asset.assigned_user_id == int(get_jwt_identity()))
+
+    if cursor := request.args.get("cursor"):
+        try:
+            c_date, c_id = keyset.decode(cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # rows strictly after the cursor in (next_service_due, id) order
+        q = q.filter(or_(
+            Asset.next_service_due > c_date,
+            and_(Asset.next_service_due == c_date, Asset.id > c_id),
+        ))
+
+    rows = q.order_by(Asset.next_service_due, Asset.id).limit(limit + 1).all()
+    items = rows[:limit]
+    return jsonify({
+        "as_of": today.strftime("%Y-%m-%d"),
+        "items": [{
+            "asset_id": a_id,
+            "name": name,
+            "last_service_date": last.strftime("%Y-%m-%d") if last else None,
+            "next_service_due": due.strftime("%Y-%m-%d") if due else None,
+            "overdue": bool(due and due < today),
+            "days_until_due": (due - today).days if due else None,
+        } for a_id, name, last, due in items],
+        "next_cursor": keyset.encode(items[-1][3], items[-1][0]) if len(rows) > limit else None,
+    })
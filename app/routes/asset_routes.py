@@ -1,11 +1,15 @@
 # app/routes/asset_routes.py
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from flask_jwt_extended import jwt_required, get_jwt
 from marshmallow import ValidationError
 from app import db
 from app.models import Asset, MaintenanceLog
+from app.models.change_log import latest_seq, record_changes
+from app.models.dashboard_counter import discount_asset_logs
 from app.schemas.asset_schema import asset_schema, assets_schema
 from app.utils.qr_utils import generate_qr
+from app.utils.conditional import conditional
+from app.resources.maintenance import dump_log
 from datetime import datetime, date
 from sqlalchemy import func, text
 import os
@@ -38,15 +42,14 @@ def _upload_url(filename: str | None):
 # ─────────────────────────────────────────────────────────
 # LIST (filters + pagination)
 # ─────────────────────────────────────────────────────────
-@asset_bp.route("", methods=["GET"])
-@jwt_required()
-def list_assets():
+def _filtered_assets():
+    """Asset query for the current caller + list filters (None → forbidden role)."""
     claims = get_jwt() or {}
     role = claims.get("role")
     user_id = claims.get("sub")
 
     if role not in ["ADMIN", "MANAGER", "TECH"]:
-        return jsonify({"error": "Forbidden"}), 403
+        return None
 
     q = Asset.query
     if role == "TECH":
@@ -58,10 +61,45 @@ def list_assets():
         q = q.filter_by(category=category)
     if assigned_user := request.args.get("assigned_user"):
         q = q.filter_by(assigned_user_id=assigned_user)
+    return q
+
+def _set_fingerprint(q):
+    """(count, max(updated_at), max(id)) over the filtered set — one aggregate query."""
+    return q.with_entities(
+        func.count(Asset.id), func.max(Asset.updated_at), func.max(Asset.id)
+    ).order_by(None).one()
+
+def _list_fingerprint():
+    q = _filtered_assets()
+    if q is None:
+        return None
+    total, last_updated, max_id = _set_fingerprint(q)
+    g.assets_total = total  # reused by list_assets → no second COUNT
+    # updated_at has whole-second resolution; the feed sequence tells same-second writes apart
+    return (total, str(last_updated), max_id, latest_seq("asset")), last_updated
+
+def _asset_fingerprint(id):
+    row = db.session.query(Asset.updated_at).filter(Asset.id == id).first()
+    if row is None:
+        return None  # let the view 404
+    return (id, str(row.updated_at), latest_seq("asset", entity_id=id)), row.updated_at
+
+@asset_bp.route("", methods=["GET"])
+@jwt_required()
+@conditional(_list_fingerprint)
+def list_assets():
+    q = _filtered_assets()
+    if q is None:
+        return jsonify({"error": "Forbidden"}), 403
 
     page = request.args.get("page", 1, type=int)
     limit = request.args.get("limit", 10, type=int)
-    paginated = q.paginate(page=page, per_page=limit, error_out=False)
+    # total from the fingerprint aggregate → skip paginate's own COUNT(*)
+    total = g.pop("assets_total", None)
+    if total is None:
+        total = _set_fingerprint(q)[0]
+    paginated = q.paginate(page=page, per_page=limit, error_out=False, count=False)
+    paginated.total = total
 
     items = assets_schema.dump(paginated.items)
     for it in items:
@@ -69,11 +107,54 @@ def list_assets():
 
     return jsonify({
         "items": items,
-        "total": paginated.total,
+        "total": total,
         "page": page,
         "pages": paginated.pages
     }), 200
 
+# ─────────────────────────────────────────────────────────
+# BATCH GET: /api/assets/batch?ids=1,2,3&with=latest_log
+#   one IN query for the assets (TECH → only assigned ones),
+#   one window query for all latest logs; result keeps the ids order
+# ─────────────────────────────────────────────────────────
+@asset_bp.route("/batch", methods=["GET"])
+@jwt_required()
+def get_assets_batch():
+    q = _filtered_assets()
+    if q is None:
+        return jsonify({"error": "Forbidden"}), 403
+
+    try:
+        ids = list(dict.fromkeys(int(x) for x in (request.args.get("ids") or "").split(",") if x.strip()))
+    except ValueError:
+        return jsonify({"error": "ids must be comma-separated integers"}), 400
+    if not ids:
+        return jsonify({"error": "ids required"}), 400
+    max_ids = current_app.config.get("ASSET_BATCH_MAX", 100)
+    if len(ids) > max_ids:
+        return jsonify({"error": f"Too many ids (max {max_ids})"}), 400
+
+    assets = {a.id: a for a in q.filter(Asset.id.in_(ids)).all()}
+    extras = {x.strip() for x in (request.args.get("with") or "").split(",")}
+    latest = MaintenanceLog.latest_for(list(assets)) if "latest_log" in extras else None
+
+    items = []
+    for asset_id in ids:
+        asset = assets.get(asset_id)
+        if asset is None:
+            continue
+        out = asset_schema.dump(asset)
+        out["qr_url"] = _upload_url(asset.qr_code_path)
+        if latest is not None:
+            log = latest.get(asset_id)
+            out["latest_log"] = dump_log(log) if log else None
+        items.append(out)
+
+    return jsonify({
+        "items": items,
+        "missing": [i for i in ids if i not in assets],  # unknown or not visible to caller
+    }), 200
+
 # ─────────────────────────────────────────────────────────
 # CREATE (Marshmallow .load → string date -> date)
 # ─────────────────────────────────────────────────────────
@@ -140,7 +221,12 @@ def update_asset(id):
 def delete_asset(id):
     asset = Asset.query.get_or_404(id)
 
-    # Child logs bulk delete (fast + no FK issues even w/o DB CASCADE)
+    # Child logs bulk delete (fast + no FK issues even w/o DB CASCADE).
+    # Bulk deletes skip ORM events → write the change-feed tombstones and
+    # dashboard counter adjustments here.
+    log_ids = [i for (i,) in db.session.query(MaintenanceLog.id).filter_by(asset_id=id)]
+    record_changes(db.session.connection(), "maintenance_log", log_ids, "delete")
+    discount_asset_logs(db.session.connection(), id)
     MaintenanceLog.query.filter_by(asset_id=id).delete(synchronize_session=False)
 
     db.session.delete(asset)
@@ -152,6 +238,7 @@ def delete_asset(id):
 # ─────────────────────────────────────────────────────────
 @asset_bp.route("/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional(_asset_fingerprint)
 def get_asset(id):
     asset = Asset.query.get_or_404(id)
     out = asset_schema.dump(asset)
@@ -2,10 +2,14 @@
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from flask import current_app
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import wraps
 from app.models.maintenance_log import MaintenanceLog
 from app import db
+import atexit
 import pytz
 
 # 🔔 Shared function: sends daily maintenance due/overdue summary (simulates email)
@@ -24,7 +28,7 @@ def send_due_summary():
     # ✅ If no logs are due or overdue, log and exit
     if not due_logs:
         current_app.logger.info("✅ No due or overdue maintenance logs today.")
-        return
+        return 0
 
     # 🧾 Build the summary report
     summary = f"🔔 {len(due_logs)} maintenance logs due/overdue:\n"
@@ -38,26 +42,197 @@ def send_due_summary():
     # 🪵 Log the summary (can be replaced with email logic later)
     current_app.logger.info("\n📬 DAILY MAINTENANCE SUMMARY\n" + summary)
     current_app.logger.info("📨 Maintenance summary printed (stubbed email).")
+    return len(due_logs)
+
+# 🧹 Drop resumable-upload sessions nobody finished
+def purge_upload_sessions():
+    """Remove chunked-upload sessions idle longer than CHUNKED_UPLOAD_TTL_HOURS."""
+    from app.utils.chunked_upload import purge_stale_sessions
+
+    hours = current_app.config.get("CHUNKED_UPLOAD_TTL_HOURS", 24)
+    removed = purge_stale_sessions(hours * 3600)
+    if removed:
+        current_app.logger.info(f"🧹 Purged {removed} abandoned upload session(s).")
+    return removed
+
+# 🗑️ Drop expired background-export files + superseded cached exports
+def purge_export_jobs():
+    from app.utils.export_cache import purge_superseded
+    from app.utils.export_jobs import purge_expired
+
+    removed = purge_expired() + purge_superseded()
+    if removed:
+        current_app.logger.info(f"🗑️ Removed {removed} expired export file(s).")
+    return removed
+
+# 🧊 Copy new/changed rows into the analytics snapshot (full=True: rebuild from scratch)
+def refresh_analytics_snapshot(full=False):
+    from app.utils import analytics_snapshot
+
+    result = analytics_snapshot.refresh(full=full)
+    if result["mode"] == "skipped":
+        current_app.logger.info("🧊 Analytics snapshot busy (readers), refresh skipped.")
+        return 0
+    current_app.logger.info(
+        f"🧊 Analytics snapshot ({result['mode']}): watermark {result['watermark']}, rows {result['rows']}."
+    )
+    return result["touched"] if result["touched"] is not None else sum(result["rows"].values())
+
+# 🔢 Rebuild dashboard counters (fixes drift, rolls "overdue" over to the new day)
+#    — once per APP_TIMEZONE day, or whenever forced
+def reconcile_dashboard_counters(force=False):
+    from app.models.dashboard_counter import overdue_as_of, reconcile
+    from app.utils import clock
+
+    if not force and overdue_as_of() == clock.today():
+        return 0
+    rows = reconcile()
+    current_app.logger.info("🔢 Dashboard counters reconciled.")
+    return rows
 
-# 🕒 Register the daily job to run at 6 AM IST
+# 📈 Precompute the cost forecast so the report endpoint is a cache read
+def refresh_cost_forecast():
+    from app.utils.cost_forecast import refresh_cached
+
+    months = current_app.config.get("COST_FORECAST_MONTHS", 12)
+    result = refresh_cached(months)
+    current_app.logger.info(
+        f"📈 Cost forecast refreshed: {result['services']} services, total {result['total']} over {months} months."
+    )
+    return result["services"]
+
+# 🚩 Flag suspicious maintenance costs into the review queue
+def scan_cost_anomalies(mode="incremental"):
+    from app.utils.cost_anomalies import scan
+
+    run = scan(mode)
+    current_app.logger.info(
+        f"🚩 Cost anomaly scan ({run.mode}): scored {run.scored}, flagged {run.flagged}."
+    )
+    return run.scored
+
+# 📜 Keep job_runs to JOB_RUNS_KEEP_DAYS
+def prune_job_runs():
+    from app.utils.leader import prune_runs
+
+    return prune_runs(current_app.config.get("JOB_RUNS_KEEP_DAYS", 30))
+
+# 🕒 Register the jobs (daily digest at 6 AM IST + maintenance jobs)
 def start_scheduler(app):
     """
     Starts the background scheduler if ENABLE_SCHEDULER is True in config.
-    Uses a cron job to run daily at 6 AM IST.
+
+    Every process (gunicorn worker, host) starts one, but only the holder of
+    the leader lease runs the jobs (app/utils/leader.py); each run is
+    recorded in job_runs. A firing that found no leader is retried once the
+    lease could have failed over.
     """
     if not app.config.get("ENABLE_SCHEDULER", False):
         app.logger.info("⏳ Scheduler is disabled via config.")
         return
 
+    from app.utils import leader
+
+    tz = pytz.timezone(app.config.get("APP_TIMEZONE", "Asia/Kolkata"))
     # 🧠 APScheduler with timezone awareness
-    scheduler = BackgroundScheduler(timezone=pytz.timezone("Asia/Kolkata"))
+    scheduler = BackgroundScheduler(timezone=tz)
+    failover = timedelta(seconds=app.config.get("SCHEDULER_LEASE_TTL_SECONDS", 60)
+                         + 2 * app.config.get("SCHEDULER_HEARTBEAT_SECONDS", 15))
+
+    def leader_only(fn=None, every=None):
+        """
+        Run on the lease holder only; job name = function name minus "_job".
+        Interval jobs pass `every` (their interval) so the slot is a wall-clock
+        bucket rather than whatever minute this process happened to fire in.
+        """
+        if fn is None:
+            return lambda f: leader_only(f, every)
+        name = fn.__name__.removesuffix("_job")
+
+        @wraps(fn)
+        def run(slot=None):
+            retry = slot is not None
+            with app.app_context():
+                slot = slot or leader.current_slot(tz, every)
+                if leader.run_job(name, slot, fn) == "not-leader" and not retry:
+                    # whoever leads by then runs it, unless the leader already did (job_runs)
+                    scheduler.add_job(run, DateTrigger(run_date=datetime.now(tz) + failover), kwargs={"slot": slot})
+        return run
+
+    # 💓 Every process: take / renew the leader lease
+    @scheduler.scheduled_job(IntervalTrigger(seconds=app.config.get("SCHEDULER_HEARTBEAT_SECONDS", 15)),
+                             next_run_time=datetime.now(tz))
+    def lease_heartbeat_job():
+        with app.app_context():
+            leader.heartbeat()
 
     # 🔁 Cron job: runs daily at 6 AM IST
     @scheduler.scheduled_job(CronTrigger(hour=6, minute=0))
+    @leader_only
     def daily_summary_job():
-        with app.app_context():
-            send_due_summary()
+        return send_due_summary()
+
+    # 🧹 Hourly: garbage-collect abandoned chunked uploads
+    @scheduler.scheduled_job(IntervalTrigger(hours=1))
+    @leader_only(every=timedelta(hours=1))
+    def upload_gc_job():
+        return purge_upload_sessions()
+
+    # 🗑️ Hourly: expire finished export jobs
+    @scheduler.scheduled_job(IntervalTrigger(hours=1))
+    @leader_only(every=timedelta(hours=1))
+    def export_gc_job():
+        return purge_export_jobs()
+
+    # 🔢 Dashboard counters: rebuilt at 00:05; the hourly re-checks catch a missed
+    #    midnight (or a fresh install) and are no-ops once today's rebuild is done
+    @scheduler.scheduled_job(CronTrigger(minute=5))
+    @leader_only
+    def dashboard_counters_job():
+        return reconcile_dashboard_counters()
+
+    # 📜 Nightly: drop old job_runs
+    @scheduler.scheduled_job(CronTrigger(hour=0, minute=30))
+    @leader_only
+    def job_runs_gc_job():
+        return prune_job_runs()
 
-    # 🚀 Start the scheduler
+    # 📈 Nightly: precompute the cost forecast (2 AM IST)
+    @scheduler.scheduled_job(CronTrigger(hour=2, minute=0))
+    @leader_only
+    def cost_forecast_job():
+        return refresh_cost_forecast()
+
+    # 🚩 Nightly incremental anomaly scan; full rescan (fresh category stats) on Sundays
+    @scheduler.scheduled_job(CronTrigger(hour=3, minute=0))
+    @leader_only
+    def cost_anomaly_job():
+        return scan_cost_anomalies("full" if datetime.now(tz).weekday() == 6 else "incremental")
+
+    # 🧊 Analytics snapshot (optional): incremental copy every ANALYTICS_REFRESH_MINUTES
+    if app.config.get("ANALYTICS_ENABLED"):
+        every = timedelta(minutes=app.config.get("ANALYTICS_REFRESH_MINUTES", 15))
+
+        @scheduler.scheduled_job(IntervalTrigger(seconds=every.total_seconds()),
+                                 next_run_time=datetime.now(tz) + timedelta(seconds=5))
+        @leader_only(every=every)
+        def analytics_snapshot_job():
+            return refresh_analytics_snapshot()
+
+        # nightly rebuild: anything an incremental run missed doesn't outlive the day
+        @scheduler.scheduled_job(CronTrigger(hour=4, minute=0))
+        @leader_only
+        def analytics_rebuild_job():
+            return refresh_analytics_snapshot(full=True)
+
+    # 🚀 Start the scheduler; hand the lease over on shutdown
     scheduler.start()
-    app.logger.info("✅ Scheduler started (Daily 6 AM IST).")
\ No newline at end of file
+
+    def _shutdown():
+        scheduler.shutdown(wait=False)
+        with app.app_context():
+            leader.release()
+
+    atexit.register(_shutdown)
+    app.logger.info(f"✅ Scheduler started (Daily 6 AM IST), lease holder id {leader.holder()}.")
+    return scheduler
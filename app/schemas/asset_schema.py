@@ -7,6 +7,8 @@ class AssetSchema(Schema):
     category = fields.Str(required=True)
     location = fields.Str(required=True)
     purchase_date = fields.Date(required=True)  # UI se "YYYY-MM-DD" aayega → date ban jayegi
+    purchase_cost = fields.Float(allow_none=True, validate=validate.Range(min=0))
+    useful_life_years = fields.Int(allow_none=True, validate=validate.Range(min=1, max=100))
     condition = fields.Str(validate=validate.OneOf(["Good", "Fair", "Poor"]))
     assigned_user_id = fields.Int(allow_none=True)
     qr_code_path = fields.Str(dump_only=True)
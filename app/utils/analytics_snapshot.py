@@ -0,0 +1,230 @@
+# app/utils/analytics_snapshot.py
+"""
+Optional columnar snapshot (DuckDB) for the report endpoints.
+
+refresh() — run by the scheduler — copies `assets` and `maintenance_logs`
+into ANALYTICS_SNAPSHOT_PATH:
+- first run / full=True (nightly): full copy, EXPORT_JOB_BATCH-sized
+  partitions → Arrow → DuckDB, into a fresh file that then replaces the old
+  one atomically;
+- later runs: only ids touched in change_log since the stored watermark are
+  deleted and re-read (in IN_CHUNK batches), in place inside one DuckDB
+  transaction; deletes are applied as tombstones. The watermark is
+  commit-safe (app/utils/watermark.py).
+DuckDB allows one writer per file and no readers next to it: while an
+incremental refresh holds the file, readers fall back to live SQL, and if
+readers keep the writer out for WRITE_ATTEMPTS tries the tick is skipped.
+
+read(sql, params) / read_all([...]) return rows plus the snapshot time, or None
+when analytics mode is off, duckdb / pyarrow are missing, the file doesn't
+exist or it is older than ANALYTICS_MAX_STALENESS_MINUTES — callers then run
+the live SQL instead. tag() adds the X-Data-Source / X-Data-As-Of headers.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.models import Asset, MaintenanceLog, ChangeLog
+from app.utils import export_formats
+from app.utils.watermark import stable_upto
+
+try:
+    import duckdb
+except Exception:
+    duckdb = None
+
+TABLES = {
+    # snapshot table: (model, change_log entity, columns)
+    "assets": (Asset, "asset", export_formats.ASSET_COLUMNS),
+    "maintenance_logs": (MaintenanceLog, "maintenance_log", export_formats.LOG_COLUMNS),
+}
+IN_CHUNK = 1000
+WRITE_ATTEMPTS = 5
+
+_refresh_lock = threading.Lock()
+
+
+def available() -> bool:
+    return duckdb is not None and export_formats.parquet_available()
+
+
+def enabled() -> bool:
+    return bool(current_app.config.get("ANALYTICS_ENABLED")) and available()
+
+
+def snapshot_path() -> str:
+    path = current_app.config.get("ANALYTICS_SNAPSHOT_PATH") or os.path.join(
+        current_app.config["UPLOAD_FOLDER"], ".analytics", "snapshot.duckdb"
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+# ─── write side ────────────────────────────────────────────────
+
+def _insert(con, table, schema, rows):
+    if rows:
+        batch = export_formats.arrow_table(schema, rows)
+        con.register("_batch", batch)
+        con.execute(f"INSERT INTO {table} SELECT * FROM _batch")
+        con.unregister("_batch")
+
+
+def _full_copy(con, batch):
+    for table, (model, _, columns) in TABLES.items():
+        schema = export_formats.arrow_schema(columns)
+        con.execute(f"DROP TABLE IF EXISTS {table}")
+        con.register("_empty", schema.empty_table())
+        con.execute(f"CREATE TABLE {table} AS SELECT * FROM _empty")
+        con.unregister("_empty")
+        for part in export_formats.partitions(columns, (), model.id, batch=batch):
+            _insert(con, table, schema, part)
+
+
+def _apply_changes(con, since, upto):
+    """Re-copy rows touched in change_log (since, upto]; returns number of ids touched."""
+    touched = 0
+    for table, (model, entity, columns) in TABLES.items():
+        ids = [r[0] for r in db.session.query(ChangeLog.entity_id)
+               .filter(ChangeLog.entity == entity, ChangeLog.id > since, ChangeLog.id <= upto)
+               .distinct()]
+        touched += len(ids)
+        schema = export_formats.arrow_schema(columns)
+        id_col = columns[0][1]
+        for i in range(0, len(ids), IN_CHUNK):
+            chunk = ids[i:i + IN_CHUNK]
+            con.execute(f"DELETE FROM {table} WHERE id IN (SELECT unnest(?::BIGINT[]))", [chunk])
+            # rows deleted upstream simply aren't found here → stay deleted
+            rows = list(db.session.execute(
+                select(*[c for _, c, _ in columns]).where(id_col.in_(chunk))
+            ))
+            _insert(con, table, schema, rows)
+    return touched
+
+
+def _open_for_write(path):
+    """Read-write connection, or None if readers keep the file locked."""
+    for attempt in range(WRITE_ATTEMPTS):
+        try:
+            return duckdb.connect(path)
+        except (duckdb.IOException, duckdb.ConnectionException):
+            time.sleep(0.2 * (attempt + 1))
+    return None
+
+
+def _write_meta(con, upto, as_of):
+    con.execute("DELETE FROM _meta")
+    con.execute("INSERT INTO _meta VALUES (?, ?)", [upto, as_of])
+    return {t: con.execute(f"SELECT count(*) FROM {t}").fetchone()[0] for t in TABLES}
+
+
+def _rebuild(path, upto, as_of):
+    """Full copy into a fresh file, then swap it in; returns row counts."""
+    tmp = path + ".next"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = duckdb.connect(tmp)
+    try:
+        con.execute("CREATE TABLE _meta (watermark BIGINT, refreshed_at TIMESTAMP)")
+        _full_copy(con, current_app.config.get("EXPORT_JOB_BATCH", 10000))
+        counts = _write_meta(con, upto, as_of)
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return counts
+
+
+def refresh(full: bool = False) -> dict:
+    """Bring the snapshot up to date; returns a small summary ("mode": "skipped" if the file was busy)."""
+    if not available():
+        raise RuntimeError("analytics snapshot requires duckdb and pyarrow")
+
+    with _refresh_lock:
+        path = snapshot_path()
+        # read the high-water mark (and the time) before any data
+        as_of = datetime.utcnow()
+        upto = stable_upto(ChangeLog.id, ChangeLog.at)
+        try:
+            if full or not os.path.exists(path):
+                return {"mode": "full", "touched": None, "watermark": upto,
+                        "as_of": as_of.isoformat(), "rows": _rebuild(path, upto, as_of)}
+
+            con = _open_for_write(path)
+            if con is None:
+                return {"mode": "skipped", "touched": 0, "watermark": None, "as_of": None, "rows": {}}
+            try:
+                row = con.execute("SELECT watermark FROM _meta").fetchone()
+                if row is None:
+                    con.close()
+                    return {"mode": "full", "touched": None, "watermark": upto,
+                            "as_of": as_of.isoformat(), "rows": _rebuild(path, upto, as_of)}
+                upto = max(upto, row[0])
+                con.begin()
+                try:
+                    touched = _apply_changes(con, row[0], upto)
+                    counts = _write_meta(con, upto, as_of)
+                    con.commit()
+                except Exception:
+                    con.rollback()
+                    raise
+                con.execute("CHECKPOINT")
+            finally:
+                con.close()
+        finally:
+            db.session.rollback()  # end the read transaction
+
+    return {"mode": "incremental", "touched": touched, "watermark": upto, "as_of": as_of.isoformat(), "rows": counts}
+
+
+# ─── read side ─────────────────────────────────────────────────
+
+def read_all(queries):
+    """
+    ([rows, ...], as_of) for [(sql, params), ...] against one snapshot, or
+    None → caller uses live SQL.
+    """
+    if not enabled():
+        return None
+    path = snapshot_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        con = duckdb.connect(path, read_only=True)
+    except Exception as e:
+        current_app.logger.warning(f"⚠️ Analytics snapshot unreadable, using live SQL: {e}")
+        return None
+    try:
+        meta = con.execute("SELECT refreshed_at FROM _meta").fetchone()
+        if meta is None:
+            return None
+        as_of = meta[0]
+        max_age = current_app.config.get("ANALYTICS_MAX_STALENESS_MINUTES", 60) * 60
+        if (datetime.utcnow() - as_of).total_seconds() > max_age:
+            return None
+        return [con.execute(sql, list(params)).fetchall() for sql, params in queries], as_of
+    finally:
+        con.close()
+
+
+def read(sql: str, params=()):
+    """(rows, as_of) for a single query — see read_all()."""
+    snap = read_all([(sql, params)])
+    return None if snap is None else (snap[0][0], snap[1])
+
+
+def tag(resp, as_of=None):
+    """Staleness headers: X-Data-Source snapshot|live, X-Data-As-Of, X-Data-Age-Seconds."""
+    if as_of is None:
+        resp.headers["X-Data-Source"] = "live"
+        return resp
+    resp.headers["X-Data-Source"] = "snapshot"
+    resp.headers["X-Data-As-Of"] = as_of.strftime("%Y-%m-%dT%H:%M:%SZ")
+    resp.headers["X-Data-Age-Seconds"] = str(int((datetime.utcnow() - as_of).total_seconds()))
+    return resp
@@ -0,0 +1,55 @@
+# app/utils/calendar_projection.py
+"""
+Vectorized projection of future service dates.
+
+Every asset's due dates are an arithmetic series  anchor + k * frequency_days
+(k ≥ 1, anchor = last service date). Instead of looping per asset we compute,
+for all assets at once, the first and last k that land in [start, end], then
+expand the occurrences with np.repeat — no Python loop over assets or dates.
+"""
+
+import numpy as np
+
+DEFAULT_FREQUENCY = 180
+
+
+def project(anchors, frequencies, start, end):
+    """
+    anchors: datetime64[D] array, frequencies: int array (days, > 0)
+    Returns (asset_index, due_dates, overdue_mask):
+      asset_index / due_dates — one entry per occurrence inside [start, end]
+      overdue_mask            — per asset: first due date already before `start`
+    """
+    anchors = np.asarray(anchors, dtype="datetime64[D]")
+    freq = np.asarray(frequencies, dtype=np.int64)
+    start = np.datetime64(start, "D")
+    end = np.datetime64(end, "D")
+
+    since = (start - anchors).astype(np.int64)   # days from anchor to window start
+    until = (end - anchors).astype(np.int64)     # days from anchor to window end
+
+    k_first = np.maximum(1, -(-since // freq))   # ceil(since / freq), at least 1
+    k_last = until // freq
+    counts = np.maximum(0, k_last - k_first + 1)
+
+    total = int(counts.sum())
+    asset_index = np.repeat(np.arange(len(anchors)), counts)
+    # position of each occurrence inside its asset's run: 0, 1, 2, …
+    run_start = np.repeat(np.cumsum(counts) - counts, counts)
+    k = np.repeat(k_first, counts) + (np.arange(total) - run_start)
+
+    due = anchors[asset_index] + (k * freq[asset_index]).astype("timedelta64[D]")
+    overdue = anchors + freq.astype("timedelta64[D]") < start
+    return asset_index, due, overdue
+
+
+def week_start(dates):
+    """Monday of each date's ISO week (1970-01-01 was a Thursday)."""
+    days = dates.astype(np.int64)
+    return (days - (days + 3) % 7).astype("datetime64[D]")
+
+
+def bucket_counts(keys):
+    """Sorted unique keys with their occurrence counts."""
+    values, counts = np.unique(keys, return_counts=True)
+    return values, counts
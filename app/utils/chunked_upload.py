@@ -0,0 +1,187 @@
+# app/utils/chunked_upload.py
+"""
+Resumable chunked uploads (init → PUT chunks at offsets → finalize).
+
+State lives on disk so every gunicorn worker sees the same session:
+  UPLOAD_FOLDER/.sessions/<id>.json   metadata (owner, name, size, sha256)
+  UPLOAD_FOLDER/.sessions/<id>.part   bytes received so far
+  UPLOAD_FOLDER/.sessions/<id>.lock   flock()ed while a chunk is appended or
+                                      the upload is finalized
+
+Chunks are copied from the request stream in CHUNK_SIZE pieces, never held
+in memory whole. Finalize checks the sha256 and moves the .part file into the
+content-addressed store, so the result is a normal attachment_path.
+
+The lock is a kernel flock on an open descriptor, not the file's existence:
+it lasts exactly as long as the request that holds it, however slowly the
+chunk arrives, and goes away by itself if the worker dies.
+"""
+
+import json
+import os
+import re
+import secrets
+import time
+from contextlib import contextmanager
+
+from flask import current_app
+
+from app.utils.file_utils import CHUNK_SIZE, file_sha256, place_file
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: no cross-worker lock there
+    fcntl = None
+
+SESSION_DIR = ".sessions"
+ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ChunkError(Exception):
+    """Client-visible problem with a chunk/finalize call (message + HTTP status)."""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _dir() -> str:
+    path = os.path.join(current_app.config["UPLOAD_FOLDER"], SESSION_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _paths(upload_id: str):
+    base = os.path.join(_dir(), upload_id)
+    return base + ".json", base + ".part", base + ".lock"
+
+
+def create_session(owner_id: int, filename: str, ext: str, size: int, sha256: str) -> dict:
+    upload_id = secrets.token_hex(16)
+    meta_path, part_path, _ = _paths(upload_id)
+    meta = {
+        "upload_id": upload_id,
+        "owner_id": owner_id,
+        "filename": filename,
+        "ext": ext,
+        "size": size,
+        "sha256": sha256.lower(),
+        "created_at": time.time(),
+    }
+    open(part_path, "wb").close()
+    with open(meta_path, "w") as fh:
+        json.dump(meta, fh)
+    return meta
+
+
+def load_session(upload_id: str):
+    if not ID_RE.match(upload_id or ""):
+        return None
+    meta_path, _, _ = _paths(upload_id)
+    try:
+        with open(meta_path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def received(meta: dict) -> int:
+    _, part_path, _ = _paths(meta["upload_id"])
+    try:
+        return os.path.getsize(part_path)
+    except OSError:
+        return 0
+
+
+@contextmanager
+def _locked(meta: dict):
+    """
+    Hold the session's lock (non-blocking) for the body of the with-block;
+    409 if another request has it, 404 if the session ended meanwhile.
+    """
+    meta_path, _, lock_path = _paths(meta["upload_id"])
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise ChunkError("another chunk is in progress", 409, received(meta))
+        # finalized / discarded while we were opening the lock
+        if not os.path.exists(meta_path):
+            os.remove(lock_path)
+            raise ChunkError("upload session not found", 404)
+        yield
+    finally:
+        os.close(fd)
+
+
+def append_chunk(meta: dict, offset: int, stream) -> int:
+    """Append one chunk at `offset`; returns the new offset."""
+    _, part_path, _ = _paths(meta["upload_id"])
+    with _locked(meta):
+        current = received(meta)
+        if offset != current:
+            raise ChunkError("offset mismatch", 409, current)
+
+        remaining = meta["size"] - current
+        with open(part_path, "ab") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if len(chunk) > remaining:
+                    out.truncate(current)
+                    raise ChunkError("chunk exceeds declared size", 413, current)
+                out.write(chunk)
+                remaining -= len(chunk)
+        return meta["size"] - remaining
+
+
+def finalize(meta: dict) -> str:
+    """Verify size + sha256 and move into the CAS store; returns the stored name."""
+    meta_path, part_path, lock_path = _paths(meta["upload_id"])
+    with _locked(meta):
+        got = received(meta)
+        if got != meta["size"]:
+            raise ChunkError("upload incomplete", 409, got)
+
+        digest = file_sha256(part_path)
+        if digest != meta["sha256"]:
+            discard(meta["upload_id"])
+            raise ChunkError("checksum mismatch", 422)
+
+        name, _created = place_file(part_path, digest, meta["ext"], current_app.config["UPLOAD_FOLDER"])
+        # session file first: whoever opens the lock after this sees it gone
+        os.remove(meta_path)
+        os.remove(lock_path)
+    return name
+
+
+def discard(upload_id: str) -> None:
+    for path in _paths(upload_id):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def purge_stale_sessions(max_age_seconds: float) -> int:
+    """Drop sessions untouched for max_age_seconds (scheduler GC). Returns count."""
+    cutoff = time.time() - max_age_seconds
+    session_dir = _dir()
+    removed = 0
+    for name in os.listdir(session_dir):
+        upload_id, _, suffix = name.partition(".")
+        if suffix != "json" or not ID_RE.match(upload_id):
+            continue
+        meta_path, part_path, _ = _paths(upload_id)
+        try:
+            last = max(os.path.getmtime(p) for p in (meta_path, part_path) if os.path.exists(p))
+        except ValueError:
+            continue
+        if last < cutoff:
+            discard(upload_id)
+            removed += 1
+    return removed
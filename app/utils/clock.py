@@ -0,0 +1,22 @@
+# app/utils/clock.py
+"""
+The business day. Schedules, "overdue" and the nightly jobs all mean the
+date in APP_TIMEZONE (Asia/Kolkata by default, the scheduler's timezone),
+not whatever timezone the server happens to run in.
+"""
+
+from datetime import date, datetime
+
+import pytz
+from flask import current_app, has_app_context
+
+from app.config import Config
+
+
+def tz():
+    name = current_app.config.get("APP_TIMEZONE") if has_app_context() else None
+    return pytz.timezone(name or Config.APP_TIMEZONE)
+
+
+def today() -> date:
+    return datetime.now(tz()).date()
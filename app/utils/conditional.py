@@ -0,0 +1,78 @@
+# app/utils/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) for JSON read endpoints.
+
+    @conditional(lambda id: fingerprint_of_row(id))
+    def get_thing(id): ...
+
+The fingerprint callable runs *before* the view with the same arguments and
+returns (parts, last_modified) — something cheap like a row's updated_at, or
+COUNT/MAX(updated_at)/MAX(id) over the filtered set, plus the change-feed
+sequence (updated_at has whole-second resolution) — or None to skip.
+The weak ETag hashes those parts with the request path/query and the caller's
+identity, so a matching If-None-Match (or If-Modified-Since) is answered with
+304 before the main query and serialization ever run.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import request, make_response
+from flask_jwt_extended import get_jwt
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _as_utc(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.replace(microsecond=0)
+
+
+def _is_fresh(etag: str, last_modified) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _tag(resp, etag: str, last_modified):
+    resp.set_etag(etag, weak=True)
+    # a date in the current second could still change within that second →
+    # leave it out so the client revalidates with the ETag instead
+    if last_modified is not None and last_modified < datetime.now(timezone.utc) - timedelta(seconds=1):
+        resp.last_modified = last_modified
+    resp.headers["Cache-Control"] = CACHE_CONTROL
+    return resp
+
+
+def conditional(fingerprint):
+    def wrapper(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            fp = fingerprint(*args, **kwargs)
+            if fp is None:
+                return fn(*args, **kwargs)
+
+            parts, last_modified = fp
+            last_modified = _as_utc(last_modified)
+            claims = get_jwt() or {}
+            etag = make_etag(request.full_path, claims.get("sub"), claims.get("role"), parts)
+
+            if _is_fresh(etag, last_modified):
+                return _tag(make_response("", 304), etag, last_modified)
+
+            resp = make_response(fn(*args, **kwargs))
+            if resp.status_code == 200:
+                _tag(resp, etag, last_modified)
+            return resp
+        return decorated
+    return wrapper
@@ -0,0 +1,242 @@
+# app/utils/cost_anomalies.py
+"""
+Outlier detection for MaintenanceLog.cost (e.g. 50000 typed instead of 500).
+
+Two vectorized tests, scored one DB chunk at a time (yield_per partitions,
+ordered by the (asset_id, service_date, id) index):
+
+- category_mad  robust z = 0.6745 · (cost − median) / MAD per asset category
+                (grouped medians via one lexsort, no per-category loop)
+- asset_zscore  z vs the mean/std of the same asset's previous ANOMALY_WINDOW
+                logs (prefix sums over the sorted runs, no per-asset loop)
+
+Flagged logs go into cost_anomalies for review. A full scan first recomputes
+the category stats from the whole history (one category at a time) and
+stores them on the run row; an incremental scan scores only logs newer than
+the last run's watermark, using those stored stats and the history of just
+the affected assets. The watermark is commit-safe (app/utils/watermark.py).
+Zero-cost logs are ignored.
+"""
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import or_, select
+
+from app import db
+from app.models import Asset, MaintenanceLog, CostAnomaly, CostAnomalyRun
+from app.utils.watermark import stable_upto
+
+MAD_SCALE = 0.6745   # makes MAD comparable to a standard deviation for normal data
+SPREAD_FLOOR = 0.05  # spread never below 5% of the centre (constant histories)
+IN_CHUNK = 500
+
+
+# ─── NumPy core ────────────────────────────────────────────────
+
+def grouped_median(codes, values, n_groups):
+    """Median of `values` per group code (NaN for empty groups)."""
+    order = np.lexsort((values, codes))
+    v = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    out = np.full(n_groups, np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    out[has] = (v[lo] + v[hi]) / 2
+    return out
+
+
+def category_stats(codes, values, n_groups):
+    """(median, MAD) arrays per category."""
+    median = grouped_median(codes, values, n_groups)
+    mad = grouped_median(codes, np.abs(values - median[codes]), n_groups)
+    return median, mad
+
+
+def robust_z(values, median, mad):
+    spread = np.maximum(mad, SPREAD_FLOOR * np.abs(median))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = MAD_SCALE * (values - median) / spread
+    return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def rolling_z(asset_ids, values, window, min_history):
+    """
+    z of each value vs the previous `window` values of the same asset.
+    Inputs must be sorted by (asset, date, id). Returns (z, rolling_mean).
+    """
+    n = len(values)
+    i = np.arange(n)
+    new_run = np.r_[True, asset_ids[1:] != asset_ids[:-1]] if n else np.zeros(0, bool)
+    run_start = np.maximum.accumulate(np.where(new_run, i, 0)) if n else i
+
+    cs = np.r_[0.0, np.cumsum(values)]
+    cs2 = np.r_[0.0, np.cumsum(values * values)]
+    lo = np.maximum(run_start, i - window)
+    k = (i - lo).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (cs[i] - cs[lo]) / k
+        var = (cs2[i] - cs2[lo]) / k - mean * mean
+        std = np.maximum(np.sqrt(np.maximum(var, 0.0)), SPREAD_FLOOR * np.abs(mean))
+        z = np.where((k >= min_history) & (std > 0), (values - mean) / std, 0.0)
+    return np.nan_to_num(z), np.nan_to_num(mean)
+
+
+# ─── DB access ─────────────────────────────────────────────────
+
+def _stream(stmt):
+    """
+    yield_per partitions of `stmt`, read on a connection of its own: the
+    session inserts flagged rows between partitions, which a streaming
+    (server-side) cursor on the same connection would not allow.
+    """
+    chunk = current_app.config.get("ANOMALY_SCAN_CHUNK", 50000)
+    with db.engine.connect() as conn:
+        yield from conn.execution_options(yield_per=chunk).execute(stmt).partitions()
+
+
+def _category_stats():
+    """
+    First pass: {category: [median, MAD]} over all positive costs, one
+    category at a time — only that category's costs are in memory.
+    """
+    categories = {c or "" for (c,) in db.session.query(Asset.category).distinct()}
+    stats = {}
+    for c in sorted(categories):
+        in_cat = or_(Asset.category == c, Asset.category.is_(None)) if c == "" else Asset.category == c
+        stmt = (
+            select(MaintenanceLog.cost)
+            .join(Asset, Asset.id == MaintenanceLog.asset_id)
+            .where(MaintenanceLog.cost > 0, in_cat)
+        )
+        parts = [np.fromiter((float(r[0]) for r in part), dtype=float, count=len(part))
+                 for part in _stream(stmt)]
+        if not parts:
+            continue
+        costs = np.concatenate(parts)
+        median, mad = category_stats(np.zeros(len(costs), np.int64), costs, 1)
+        stats[c] = [float(median[0]), float(mad[0])]
+    return stats
+
+
+def _partitions(*criteria):
+    """
+    Yield (ids, asset_ids, categories, costs, carried) per yield_per partition of
+    logs matching `criteria`, sorted by (asset_id, service_date, id). The first
+    `carried` rows repeat the tail (≤ ANOMALY_WINDOW rows) of the previous
+    partition's last asset, so rolling_z sees its history across the boundary.
+    """
+    window = current_app.config.get("ANOMALY_WINDOW", 10)
+    stmt = (
+        select(MaintenanceLog.id, MaintenanceLog.asset_id, Asset.category, MaintenanceLog.cost)
+        .join(Asset, Asset.id == MaintenanceLog.asset_id)
+        .where(MaintenanceLog.cost > 0, *criteria)
+        .order_by(MaintenanceLog.asset_id, MaintenanceLog.service_date, MaintenanceLog.id)
+    )
+    tail = None
+    for part in _stream(stmt):
+        ids = np.fromiter((r[0] for r in part), dtype=np.int64, count=len(part))
+        assets = np.fromiter((r[1] for r in part), dtype=np.int64, count=len(part))
+        cats = [r[2] or "" for r in part]
+        costs = np.fromiter((float(r[3]) for r in part), dtype=float, count=len(part))
+
+        carried = 0
+        if tail is not None and tail[1][-1] == assets[0]:
+            carried = len(tail[0])
+            ids, assets = np.r_[tail[0], ids], np.r_[tail[1], assets]
+            cats, costs = tail[2] + cats, np.r_[tail[3], costs]
+        yield ids, assets, cats, costs, carried
+
+        last = np.flatnonzero(assets == assets[-1])[-window:]
+        tail = (ids[last], assets[last], [cats[i] for i in last], costs[last])
+
+
+def _flag(ids, assets, costs, cat_z, cat_median, asset_z, asset_mean, mask):
+    """Insert new CostAnomaly rows for masked logs over either threshold; returns count."""
+    cfg = current_app.config
+    t_mad = cfg.get("ANOMALY_MAD_THRESHOLD", 3.5)
+    t_z = cfg.get("ANOMALY_Z_THRESHOLD", 4.0)
+    by_cat = mask & (np.abs(cat_z) > t_mad)
+    by_asset = mask & (np.abs(asset_z) > t_z)
+    hits = np.flatnonzero(by_cat | by_asset)
+    if not len(hits):
+        return 0
+
+    hit_ids = ids[hits].tolist()
+    existing = set()
+    for i in range(0, len(hit_ids), IN_CHUNK):
+        existing.update(r[0] for r in db.session.query(CostAnomaly.log_id)
+                        .filter(CostAnomaly.log_id.in_(hit_ids[i:i + IN_CHUNK])))
+
+    rows = []
+    for h in hits:
+        if int(ids[h]) in existing:
+            continue
+        # report the test that exceeded its threshold by the larger margin
+        use_cat = by_cat[h] and (not by_asset[h] or abs(cat_z[h]) / t_mad >= abs(asset_z[h]) / t_z)
+        rows.append({
+            "log_id": int(ids[h]),
+            "asset_id": int(assets[h]),
+            "cost": round(float(costs[h]), 2),
+            "expected": round(float(cat_median[h] if use_cat else asset_mean[h]), 2),
+            "score": round(float(cat_z[h] if use_cat else asset_z[h]), 3),
+            "method": "category_mad" if use_cat else "asset_zscore",
+            "status": "open",
+        })
+    if rows:
+        db.session.execute(CostAnomaly.__table__.insert(), rows)
+    return len(rows)
+
+
+# ─── entry point ───────────────────────────────────────────────
+
+def scan(mode: str = "incremental") -> CostAnomalyRun:
+    """
+    Score logs and record a CostAnomalyRun; incremental falls back to full without a prior full scan.
+    Logs are scored partition by partition, so memory is bounded by ANOMALY_SCAN_CHUNK
+    (plus the largest category's costs during a full scan's stats pass).
+    """
+    cfg = current_app.config
+    window = cfg.get("ANOMALY_WINDOW", 10)
+    min_history = cfg.get("ANOMALY_MIN_HISTORY", 5)
+
+    last = CostAnomalyRun.query.order_by(CostAnomalyRun.id.desc()).first()
+    if mode != "full" and (last is None or last.category_stats is None):
+        mode = "full"
+    since = last.last_log_id if last else 0
+    # ids commit out of order: only advance to the commit-safe mark, so a log
+    # that commits late is still "new" for the next incremental run
+    upto = max(stable_upto(MaintenanceLog.id, MaintenanceLog.created_at), since)
+
+    if mode == "full":
+        stats = _category_stats()
+        batches = [()]
+        since = 0
+    else:
+        stats = last.category_stats
+        new_assets = [r[0] for r in db.session.query(MaintenanceLog.asset_id)
+                      .filter(MaintenanceLog.id > since, MaintenanceLog.id <= upto, MaintenanceLog.cost > 0)
+                      .distinct()]
+        batches = [(MaintenanceLog.asset_id.in_(new_assets[i:i + IN_CHUNK]),)
+                   for i in range(0, len(new_assets), IN_CHUNK)]
+
+    nan_pair = [np.nan, np.nan]
+    scored = flagged = 0
+    for criteria in batches:
+        for ids, assets, cats, costs, carried in _partitions(*criteria):
+            mask = (ids > since) & (ids <= upto) if mode != "full" else np.ones(len(ids), dtype=bool)
+            mask[:carried] = False
+            # category test against the (stored or fresh) stats; unseen categories score 0
+            cat_median = np.array([stats.get(c, nan_pair)[0] for c in cats], dtype=float)
+            cat_mad = np.array([stats.get(c, nan_pair)[1] for c in cats], dtype=float)
+            cat_z = robust_z(costs, cat_median, cat_mad)
+            asset_z, asset_mean = rolling_z(assets, costs, window, min_history)
+            flagged += _flag(ids, assets, costs, cat_z, cat_median, asset_z, asset_mean, mask)
+            scored += int(mask.sum())
+
+    run = CostAnomalyRun(mode=mode, last_log_id=upto, scored=scored,
+                         flagged=flagged, category_stats=stats)
+    db.session.add(run)
+    db.session.commit()
+    return run
@@ -0,0 +1,172 @@
+# app/utils/cost_forecast.py
+"""
+Forward maintenance budget per category / location.
+
+1. One columnar fetch of (asset_id, service_date, cost) for the trailing
+   history window, plus one of (id, category, location, frequency_days,
+   purchase_date) for all assets.
+2. Per asset, via np.bincount (no per-asset loop): mean cost per service and
+   a least-squares linear trend of cost over time (≥ 3 services); assets with
+   no history borrow their category's mean (then the fleet mean).
+3. Upcoming services come from calendar_projection (last service + k × frequency);
+   each is priced at the asset's trend value on its due date, then summed per
+   group and month.
+
+The nightly scheduler job (refresh_cached) stores the default horizon via
+export_cache.store_json, so GET /api/reports/cost-forecast is a file read.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func
+
+from app import db
+from app.models import Asset, MaintenanceLog
+from app.utils import calendar_projection, export_cache
+
+HISTORY_MONTHS = 24
+MIN_TREND_POINTS = 3
+DAYS_PER_YEAR = 365.25
+
+
+def _group_codes(values):
+    labels = sorted({v or "" for v in values})
+    lookup = {v: i for i, v in enumerate(labels)}
+    return labels, np.fromiter((lookup[v or ""] for v in values), dtype=np.int64, count=len(values))
+
+
+def _per_asset_models(pos, x, y, n_assets):
+    """mean x/y and OLS slope per asset from bincount sums."""
+    n = np.bincount(pos, minlength=n_assets).astype(float)
+    sx = np.bincount(pos, weights=x, minlength=n_assets)
+    sy = np.bincount(pos, weights=y, minlength=n_assets)
+    sxx = np.bincount(pos, weights=x * x, minlength=n_assets)
+    sxy = np.bincount(pos, weights=x * y, minlength=n_assets)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.where(n > 0, sx / n, 0.0)
+        mean_y = np.where(n > 0, sy / n, np.nan)
+        denom = n * sxx - sx * sx
+        slope = np.where((n >= MIN_TREND_POINTS) & (denom > 1e-9), (n * sxy - sx * sy) / denom, 0.0)
+    return n, mean_x, mean_y, slope
+
+
+def forecast(asset_ids, categories, locations, freqs, purchase,
+             log_asset_ids, log_dates, log_costs, start, end):
+    """Pure NumPy core; every argument is an array/list aligned per asset or per log."""
+    n_assets = len(asset_ids)
+    pos_of = {a: i for i, a in enumerate(asset_ids)}
+    pos = np.fromiter((pos_of[a] for a in log_asset_ids), dtype=np.int64, count=len(log_asset_ids))
+    dates = np.asarray(log_dates, dtype="datetime64[D]")
+    x = dates.astype(np.int64) / DAYS_PER_YEAR
+    y = np.asarray(log_costs, dtype=float)
+
+    n, mean_x, mean_y, slope = _per_asset_models(pos, x, y, n_assets)
+
+    # no history → category mean per service → fleet mean
+    cat_labels, cat = _group_codes(categories)
+    loc_labels, loc = _group_codes(locations)
+    cat_sum = np.bincount(cat[pos], weights=y, minlength=len(cat_labels))
+    cat_n = np.bincount(cat[pos], minlength=len(cat_labels))
+    fleet_mean = float(y.mean()) if len(y) else 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cat_mean = np.where(cat_n > 0, cat_sum / cat_n, fleet_mean)
+    mean_y = np.where(np.isnan(mean_y), cat_mean[cat], mean_y)
+
+    # anchor = last service, else purchase date, else today
+    last = np.full(n_assets, np.datetime64("NaT"), dtype="datetime64[D]")
+    if len(dates):
+        last_int = np.full(n_assets, np.iinfo(np.int64).min)
+        np.maximum.at(last_int, pos, dates.astype(np.int64))
+        has = last_int != np.iinfo(np.int64).min
+        last[has] = last_int[has].astype("datetime64[D]")
+    purchase = np.asarray(purchase, dtype="datetime64[D]")
+    anchors = np.where(np.isnat(last), purchase, last)
+    anchors = np.where(np.isnat(anchors), np.datetime64(start, "D"), anchors)
+
+    idx, due, _ = calendar_projection.project(anchors, freqs, start, end)
+    due_x = due.astype(np.int64) / DAYS_PER_YEAR
+    cost = np.maximum(0.0, mean_y[idx] + slope[idx] * (due_x - mean_x[idx]))
+
+    months = due.astype("datetime64[M]")
+    first_month = np.datetime64(start, "M")
+    month_no = (months - first_month).astype(np.int64)
+    n_months = int(month_no.max()) + 1 if len(month_no) else 0
+
+    def _grouped(codes, labels, key):
+        g = codes[idx]
+        totals = np.bincount(g, weights=cost, minlength=len(labels))
+        services = np.bincount(g, minlength=len(labels))
+        cells = np.bincount(g * max(n_months, 1) + month_no, weights=cost,
+                            minlength=len(labels) * max(n_months, 1)).reshape(len(labels), -1)
+        out = []
+        for i, label in enumerate(labels):
+            if not services[i]:
+                continue
+            out.append({
+                key: label or None,
+                "services": int(services[i]),
+                "forecast_cost": round(float(totals[i]), 2),
+                "monthly": [
+                    {"month": str(first_month + m), "cost": round(float(cells[i, m]), 2)}
+                    for m in range(n_months) if cells[i, m]
+                ],
+            })
+        return sorted(out, key=lambda r: -r["forecast_cost"])
+
+    return {
+        "services": int(len(due)),
+        "total": round(float(cost.sum()), 2),
+        "by_category": _grouped(cat, cat_labels, "category"),
+        "by_location": _grouped(loc, loc_labels, "location"),
+    }
+
+
+def build_forecast(months: int = 12) -> dict:
+    """Query + compute; used by the endpoint and the nightly scheduler job."""
+    today = date.today()
+    end = today + timedelta(days=int(months * 30.44))
+    history_from = today - timedelta(days=int(HISTORY_MONTHS * 30.44))
+
+    assets = db.session.query(
+        Asset.id, Asset.category, Asset.location, Asset.frequency_days, Asset.purchase_date
+    ).order_by(Asset.id).all()
+    logs = (
+        db.session.query(MaintenanceLog.asset_id, MaintenanceLog.service_date,
+                         func.coalesce(MaintenanceLog.cost, 0))
+        .filter(MaintenanceLog.service_date >= history_from)
+        .all()
+    )
+
+    result = forecast(
+        asset_ids=[a[0] for a in assets],
+        categories=[a[1] for a in assets],
+        locations=[a[2] for a in assets],
+        freqs=np.fromiter(((a[3] or calendar_projection.DEFAULT_FREQUENCY) for a in assets),
+                          dtype=np.int64, count=len(assets)),
+        purchase=[a[4] if a[4] else None for a in assets],
+        log_asset_ids=[r[0] for r in logs],
+        log_dates=[r[1] for r in logs],
+        log_costs=[float(r[2]) for r in logs],
+        start=today,
+        end=end,
+    )
+    result.update({
+        "months": months,
+        "from": today.strftime("%Y-%m-%d"),
+        "to": end.strftime("%Y-%m-%d"),
+        "history_from": history_from.strftime("%Y-%m-%d"),
+        "computed_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
+    return result
+
+
+def cache_name(months: int) -> str:
+    return f"cost-forecast-{months}m"
+
+
+def refresh_cached(months: int = 12) -> dict:
+    result = build_forecast(months)
+    export_cache.store_json(cache_name(months), result)
+    return result
@@ -0,0 +1,33 @@
+# app/utils/depreciation.py
+"""
+Vectorized book value / TCO over per-asset column arrays.
+
+All functions take NumPy arrays aligned per asset (cost, salvage, life in
+years, age in years) and return arrays — the whole fleet in one pass.
+"""
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+
+
+def age_years(purchase_dates, as_of):
+    """Fractional years from purchase to `as_of` (0 for missing / future dates)."""
+    purchase = np.asarray(purchase_dates, dtype="datetime64[D]")
+    days = (np.datetime64(as_of, "D") - purchase).astype(float)
+    days[np.isnat(purchase)] = 0.0
+    return np.maximum(days, 0.0) / DAYS_PER_YEAR
+
+
+def straight_line(cost, salvage, life, age):
+    """Book value: cost minus equal yearly charges, never below salvage."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yearly = np.where(life > 0, (cost - salvage) / life, 0.0)
+    return np.maximum(salvage, cost - yearly * np.minimum(age, life))
+
+
+def declining_balance(cost, salvage, life, age, factor=2.0):
+    """Book value: cost × (1 − factor/life)^age, never below salvage (factor 2 = double-declining)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(life > 0, np.minimum(factor / life, 1.0), 1.0)
+    return np.maximum(salvage, cost * np.power(1.0 - rate, age))
@@ -0,0 +1,156 @@
+# app/utils/derivatives.py
+"""
+Thumbnail / preview derivatives for uploaded images and PDFs.
+
+- Rendering runs in a small process pool (THUMBNAIL_WORKERS), scheduled right
+  after an upload is stored — never on the request path.
+- Output lives next to the original:  <original>.<variant>.webp plus .jpg,
+  or .png when the source has transparency (WebP keeps alpha too).
+  EXIF is dropped: images are re-encoded from pixels only, after applying
+  the EXIF orientation.
+- Each source renders at most once at a time per process (repeat requests
+  while it's queued are ignored), and a failed source isn't retried for
+  THUMBNAIL_RETRY_SECONDS.
+- PDFs get their first page rendered (needs `pypdfium2`); images need Pillow.
+  Missing libraries just mean no derivative — callers fall back to the original.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+
+try:
+    from PIL import Image, ImageOps
+except Exception:  # Pillow not installed → pipeline disabled
+    Image = ImageOps = None
+
+try:
+    import pypdfium2 as pdfium
+except Exception:  # PDF previews disabled
+    pdfium = None
+
+IMAGE_EXTS = {"png", "jpg", "jpeg"}
+FORMATS = (("webp", "WEBP"), ("jpg", "JPEG"))
+ALPHA_FORMATS = (("webp", "WEBP"), ("png", "PNG"))
+FALLBACK_FORMATS = ("jpg", "png")  # for clients without WebP: opaque, then transparent
+
+_lock = threading.Lock()
+_pool = None
+_inflight = set()  # src paths queued or rendering in this process
+_failed = {}       # src path → time.monotonic() when a retry is allowed
+
+
+def derivative_name(name: str, variant: str, fmt: str) -> str:
+    return f"{name}.{variant}.{fmt}"
+
+
+def can_render(name: str) -> bool:
+    ext = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    if ext in IMAGE_EXTS:
+        return Image is not None
+    if ext == "pdf":
+        return Image is not None and pdfium is not None
+    return False
+
+
+def _open_source(src_path: str):
+    if src_path.lower().endswith(".pdf"):
+        pdf = pdfium.PdfDocument(src_path)
+        try:
+            return pdf[0].render(scale=2).to_pil()
+        finally:
+            pdf.close()
+    img = Image.open(src_path)
+    return ImageOps.exif_transpose(img)
+
+
+def render_derivatives(src_path: str, sizes: dict, quality: int = 80) -> int:
+    """
+    Worker-side: write every (variant, format) for one source file.
+    Plain paths in, count out — nothing from Flask crosses the process boundary.
+    """
+    img = _open_source(src_path)
+    alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    if alpha:
+        img = img.convert("RGBA")
+    elif img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    written = 0
+    for variant, max_px in sizes.items():
+        copy = img.copy()
+        copy.thumbnail((max_px, max_px))
+        for fmt, pil_fmt in ALPHA_FORMATS if alpha else FORMATS:
+            out = f"{src_path}.{variant}.{fmt}"
+            tmp = out + ".tmp"
+            copy.save(tmp, pil_fmt, quality=quality)  # no exif= → metadata stripped
+            os.replace(tmp, out)
+            written += 1
+    return written
+
+
+def _executor(workers: int):
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def reset_pool():
+    """Forget the pool (e.g. in a forked child, where the parent's pool is unusable)."""
+    global _pool
+    with _lock:
+        _pool = None
+        _inflight.clear()
+
+
+def schedule(folder: str, name: str):
+    """
+    Queue derivative rendering for one stored file (fire-and-forget).
+    Returns None when there is nothing to do: not renderable, already queued,
+    or failed recently.
+    """
+    if not can_render(name):
+        return None
+    src_path = os.path.join(folder, name)
+    sizes = current_app.config.get("THUMBNAIL_SIZES", {"thumb": 320})
+    retry_after = current_app.config.get("THUMBNAIL_RETRY_SECONDS", 600)
+    logger = current_app.logger
+
+    with _lock:
+        if src_path in _inflight or _failed.get(src_path, 0) > time.monotonic():
+            return None
+        _failed.pop(src_path, None)
+        _inflight.add(src_path)
+
+    try:
+        future = _executor(current_app.config.get("THUMBNAIL_WORKERS", 2)).submit(
+            render_derivatives, src_path, sizes, current_app.config.get("THUMBNAIL_QUALITY", 80)
+        )
+    except Exception:
+        with _lock:
+            _inflight.discard(src_path)
+        raise
+
+    def _done(f):
+        error = f.exception()
+        with _lock:
+            _inflight.discard(src_path)
+            if error is not None:
+                now = time.monotonic()
+                if len(_failed) >= 1024:  # keep the negative cache bounded
+                    for path in [p for p, until in _failed.items() if until <= now]:
+                        del _failed[path]
+                    if len(_failed) >= 1024:
+                        _failed.clear()
+                _failed[src_path] = now + retry_after
+        if error is not None:
+            logger.warning(f"⚠️ Derivative rendering failed for {name}: {error}")
+
+    future.add_done_callback(_done)
+    return future
@@ -0,0 +1,171 @@
+# app/utils/export_cache.py
+"""
+Precompressed export artifacts.
+
+An export is identified by (name, fingerprint) where the fingerprint is a
+cheap aggregate of the source table (count / max(updated_at) / max(id)).
+The first request streams the rows straight into <EXPORT_CACHE_DIR>/<name>-<key>.<ext>.gz;
+later requests with the same data reuse that file — gzip clients get the
+bytes as-is (Content-Encoding: gzip), others get it inflated on the fly.
+Either way the CSV is never rebuilt or compressed twice.
+
+Superseded versions are not deleted the moment a new one is built: a
+concurrent request may have just been handed the older path. Serving a
+version touches its mtime, and a version is dropped only once it is not the
+newest and hasn't been served for EXPORT_CACHE_GRACE_SECONDS (on the next
+build of that export, and by purge_superseded() from the hourly export GC).
+
+store_json / load_json keep small precomputed report payloads (written by
+scheduler jobs) next to the artifacts, so the report endpoints can answer
+without recomputing.
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+import tempfile
+import time
+
+from flask import Response, current_app, request, send_file
+
+from app.middlewares.compression import negotiate
+from app.utils.conditional import make_etag
+
+CHUNK_SIZE = 64 * 1024
+IDLE_MAX = 7 * 24 * 3600  # even the newest version goes if nobody asked for it this long
+VERSION_RE = re.compile(r"^(?P<name>.+)-[0-9a-f]{16}(?P<suffix>\.[^-]+)$")
+
+
+def _cache_dir() -> str:
+    path = current_app.config.get("EXPORT_CACHE_DIR") or os.path.join(
+        current_app.config["UPLOAD_FOLDER"], ".exports"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _grace() -> int:
+    return current_app.config.get("EXPORT_CACHE_GRACE_SECONDS", 600)
+
+
+def _drop_stale(paths, keep: str, grace: float) -> int:
+    """Remove `paths` other than `keep` that nobody was handed in the last `grace` seconds."""
+    cutoff, removed = time.time() - grace, 0
+    for old in paths:
+        if old == keep:
+            continue
+        try:
+            if os.path.getmtime(old) < cutoff:
+                os.remove(old)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _materialize(name: str, fingerprint, suffix: str, write) -> str:
+    """<name>-<key><suffix>, built once via write(tmp_path); superseded versions expire after a grace period."""
+    cache_dir = _cache_dir()
+    key = make_etag(name, fingerprint)[:16]
+    path = os.path.join(cache_dir, f"{name}-{key}{suffix}")
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # "last handed out" — keeps it through the grace period
+            return path
+        except FileNotFoundError:
+            pass  # swept just now → rebuild
+
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    versions = glob.glob(os.path.join(cache_dir, f"{glob.escape(name)}-*{suffix}"))
+    mine = [v for v in versions if (m := VERSION_RE.match(os.path.basename(v))) and m["name"] == name]
+    _drop_stale(mine, path, _grace())
+    return path
+
+
+def purge_superseded() -> int:
+    """
+    GC for the cache dir: per (name, suffix) keep the newest version, drop the
+    others once idle for the grace period and the newest once idle for
+    IDLE_MAX (names nobody requests any more); also abandoned .part files
+    (a day old). Returns files removed.
+    """
+    cache_dir, grace = _cache_dir(), _grace()
+    groups = {}
+    for entry in os.scandir(cache_dir):
+        m = VERSION_RE.match(entry.name) if entry.is_file() else None
+        if m:
+            groups.setdefault((m["name"], m["suffix"]), []).append(entry.path)
+
+    removed = 0
+    for paths in groups.values():
+        newest = max(paths, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+        removed += _drop_stale(paths, newest, grace) + _drop_stale([newest], None, IDLE_MAX)
+    parts = glob.glob(os.path.join(cache_dir, "*.part"))
+    removed += _drop_stale(parts, None, 24 * 3600)
+    return removed
+
+
+def artifact(name: str, fingerprint, chunks, ext: str = "csv") -> str:
+    """Path of the gzip artifact for this data version; built once from `chunks()`."""
+    def write(tmp):
+        with open(tmp, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as gz:
+            for chunk in chunks():
+                gz.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+    return _materialize(name, fingerprint, f".{ext}.gz", write)
+
+
+def file_artifact(name: str, fingerprint, write, ext: str) -> str:
+    """Like artifact() for formats that compress themselves (Parquet): write(tmp_path) fills the file."""
+    return _materialize(name, fingerprint, f".{ext}", write)
+
+
+def store_json(name: str, payload) -> str:
+    """Atomically write a precomputed JSON payload as <name>.json."""
+    cache_dir = _cache_dir()
+    path = os.path.join(cache_dir, f"{name}.json")
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(payload, fh)
+    os.replace(tmp, path)
+    return path
+
+
+def load_json(name: str, max_age: float = None):
+    """Payload stored under `name`, or None if missing / older than `max_age` seconds."""
+    path = os.path.join(_cache_dir(), f"{name}.json")
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _inflate(path):
+    with gzip.open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            yield chunk
+
+
+def send_artifact(path: str, mimetype: str, download_name: str):
+    if negotiate(request.headers.get("Accept-Encoding"), offered=["gzip"]):
+        resp = send_file(path, mimetype=mimetype, as_attachment=True, download_name=download_name)
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(_inflate(path), mimetype=mimetype)
+        resp.headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+    resp.vary.add("Accept-Encoding")
+    return resp
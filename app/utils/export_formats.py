@@ -0,0 +1,212 @@
+# app/utils/export_formats.py
+"""
+Typed export formats next to CSV:
+
+- JSON Lines  one object per row, streamed line by line (numbers stay numbers,
+              dates are ISO strings, NULL is null)
+- Parquet     written in row groups from a chunked DB cursor with typed columns
+              (date32, decimal128, timestamp) — pyarrow is optional; without it
+              the route answers 501.
+
+Columns are declared once as (name, column, kind) so both formats (and the
+SQL select) stay in sync. kind: "int" | "str" | "bool" | "date" | "ts" | ("decimal", precision, scale).
+Used by the synchronous export routes and by background export jobs.
+
+Delta exports: since=<watermark> keeps only rows inserted/updated after that
+change_log sequence value (the same sequence /api/sync hands out). Every
+export reports a commit-safe high-water mark (app/utils/watermark.py) read
+*before* its rows: every change up to it is already committed, so feeding it
+back as the next `since` skips nothing as long as writes commit within
+CHANGE_FEED_LAG_SECONDS (a row may appear twice, never zero times).
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import db
+from app.models import Asset, MaintenanceLog, User, ChangeLog
+from app.utils.watermark import stable_upto
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = pq = None
+
+PARQUET_ROW_GROUP = 50000
+JSONL_BATCH = 1000
+
+
+ASSET_COLUMNS = [
+    ("id", Asset.id, "int"),
+    ("name", Asset.name, "str"),
+    ("category", Asset.category, "str"),
+    ("location", Asset.location, "str"),
+    ("purchase_date", Asset.purchase_date, "date"),
+    ("warranty_end", Asset.warranty_end, "date"),
+    ("frequency_days", Asset.frequency_days, "int"),
+    ("purchase_cost", Asset.purchase_cost, ("decimal", 12, 2)),
+    ("useful_life_years", Asset.useful_life_years, "int"),
+    ("assigned_user_id", Asset.assigned_user_id, "int"),
+    ("updated_at", Asset.updated_at, "ts"),
+]
+
+LOG_COLUMNS = [
+    ("id", MaintenanceLog.id, "int"),
+    ("asset_id", MaintenanceLog.asset_id, "int"),
+    ("service_date", MaintenanceLog.service_date, "date"),
+    ("description", MaintenanceLog.description, "str"),
+    ("parts_used", MaintenanceLog.parts_used, "str"),
+    ("cost", MaintenanceLog.cost, ("decimal", 10, 2)),
+    ("technician_id", MaintenanceLog.technician_id, "int"),
+    ("next_service_due", MaintenanceLog.next_service_due, "date"),
+    ("created_at", MaintenanceLog.created_at, "ts"),
+    ("updated_at", MaintenanceLog.updated_at, "ts"),
+]
+
+# never password_hash / last_temp_password
+USER_COLUMNS = [
+    ("id", User.id, "int"),
+    ("name", User.name, "str"),
+    ("username", User.username, "str"),
+    ("email", User.email, "str"),
+    ("role", User.role, "str"),
+    ("is_active", User.is_active, "bool"),
+    ("created_at", User.created_at, "ts"),
+]
+
+
+def build_filters(args, asset_col=None, date_col=None):
+    """
+    SQL criteria from from=YYYY-MM-DD / to=YYYY-MM-DD / asset_id=1,2,3 in `args`
+    (request.args or a stored dict). Returns (criteria, applied); raises ValueError.
+    """
+    criteria, applied = [], []
+    if date_col is not None:
+        for arg, op in (("from", date_col.__ge__), ("to", date_col.__le__)):
+            if value := args.get(arg):
+                try:
+                    criteria.append(op(datetime.strptime(value, "%Y-%m-%d").date()))
+                except ValueError:
+                    raise ValueError(f"'{arg}' must be YYYY-MM-DD")
+                applied.append((arg, value))
+    if asset_col is not None and (value := args.get("asset_id")):
+        try:
+            ids = sorted({int(v) for v in str(value).split(",") if v.strip()})
+        except ValueError:
+            raise ValueError("'asset_id' must be a comma-separated list of ids")
+        criteria.append(asset_col.in_(ids))
+        applied.append(("asset_id", tuple(ids)))
+    return criteria, applied
+
+
+DELTA_ENTITIES = {Asset: "asset", MaintenanceLog: "maintenance_log"}
+
+
+def delta_filter(args, model):
+    """
+    (criteria, watermark) for since=<change_log id> in `args`. watermark is the
+    commit-safe change_log high-water mark (None for models without a change feed).
+    The criterion is an IN over an (entity, id) range of change_log.
+    """
+    entity = DELTA_ENTITIES.get(model)
+    since = args.get("since")
+    if entity is None:
+        if since not in (None, ""):
+            raise ValueError("'since' is not supported for this export")
+        return [], None
+
+    upto = stable_upto(ChangeLog.id, ChangeLog.at)
+    if since in (None, ""):
+        return [], upto
+    try:
+        since = int(since)
+    except (TypeError, ValueError):
+        raise ValueError("'since' must be a watermark returned by a previous export")
+    upto = max(upto, since)  # never hand back an older mark than the client already has
+    changed = select(ChangeLog.entity_id).where(
+        ChangeLog.entity == entity, ChangeLog.id > since, ChangeLog.id <= upto
+    )
+    return [model.id.in_(changed)], upto
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def partitions(columns, criteria=(), order_by=None, batch=JSONL_BATCH):
+    """Row tuples from one server-side cursor, `batch` rows at a time."""
+    stmt = select(*[c for _, c, _ in columns]).where(*criteria)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return db.session.execute(stmt.execution_options(yield_per=batch)).partitions()
+
+
+def _json_value(value, kind):
+    if value is None:
+        return None
+    if kind == "date" or kind == "ts":
+        return value.isoformat()
+    if isinstance(kind, tuple):
+        return float(value)
+    return value
+
+
+def jsonl_chunks(columns, parts):
+    """Yield JSON Lines text, one chunk per partition."""
+    names = [n for n, _, _ in columns]
+    kinds = [k for _, _, k in columns]
+    for part in parts:
+        yield "".join(
+            json.dumps({n: _json_value(v, k) for n, v, k in zip(names, row, kinds)}) + "\n"
+            for row in part
+        )
+
+
+def csv_chunks(columns, parts):
+    """Header row + one CSV chunk per partition."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([n for n, _, _ in columns])
+    yield buf.getvalue()
+    for part in parts:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(part)
+        yield buf.getvalue()
+
+
+def _arrow_type(kind):
+    if isinstance(kind, tuple):
+        return pa.decimal128(kind[1], kind[2])
+    return {
+        "int": pa.int64(), "str": pa.string(), "bool": pa.bool_(),
+        "date": pa.date32(), "ts": pa.timestamp("s"),
+    }[kind]
+
+
+def arrow_schema(columns):
+    return pa.schema([(n, _arrow_type(k)) for n, _, k in columns])
+
+
+def arrow_table(schema, rows):
+    """Row tuples → typed pyarrow Table."""
+    arrays = [pa.array([r[i] for r in rows], type=schema.field(i).type) for i in range(len(schema))]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(path, columns, parts):
+    """One row group per partition (zstd); returns the row count."""
+    schema = arrow_schema(columns)
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for part in parts:
+            if not part:
+                continue
+            writer.write_table(arrow_table(schema, part))
+            rows += len(part)
+    return rows
@@ -0,0 +1,205 @@
+# app/utils/export_jobs.py
+"""
+Background exports: POST /api/exports queues an ExportJob, a small thread
+pool (EXPORT_JOB_WORKERS per process) writes the file in EXPORT_JOB_BATCH-row
+chunks from a server-side cursor, and each chunk bumps rows_written so
+GET /api/exports/<id> can report progress. Progress updates go through their
+own short transactions, never the cursor's connection.
+
+Finished files live in EXPORT_JOBS_DIR (under UPLOAD_FOLDER so the uploads
+delivery path — incl. X-Accel-Redirect — can serve them) until expires_at;
+purge_expired() (scheduler) deletes them and fails jobs that were cut off by
+a restart. A worker claims its job with a conditional queued → running
+UPDATE and bumps heartbeat_at with every chunk; only a running job whose
+heartbeat went quiet (EXPORT_JOB_HEARTBEAT_TIMEOUT_MINUTES), or a queued one
+nobody picked up within EXPORT_JOB_STALE_HOURS, is failed. Every timestamp
+comes from the DB clock, like created_at.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+
+from app import db
+from app.models import Asset, MaintenanceLog, User, ExportJob
+from app.utils import export_formats
+
+KINDS = {
+    # kind: (columns, model, asset filter column, date filter column)
+    "assets": (export_formats.ASSET_COLUMNS, Asset, Asset.id, Asset.purchase_date),
+    "logs": (export_formats.LOG_COLUMNS, MaintenanceLog, MaintenanceLog.asset_id, MaintenanceLog.service_date),
+    "users": (export_formats.USER_COLUMNS, User, None, None),
+}
+FORMATS = ("csv", "jsonl", "parquet")
+
+_lock = threading.Lock()
+_pool = None
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=current_app.config.get("EXPORT_JOB_WORKERS", 2),
+                    thread_name_prefix="export",
+                )
+    return _pool
+
+
+def reset_pool():
+    """Forget the pool (e.g. in a forked child, where the parent's threads don't exist)."""
+    global _pool
+    with _lock:
+        _pool = None
+
+
+def jobs_dir() -> str:
+    path = current_app.config.get("EXPORT_JOBS_DIR") or os.path.join(
+        current_app.config["UPLOAD_FOLDER"], ".exports", "jobs"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def validate(kind: str, fmt: str, filters: dict) -> None:
+    """Raise ValueError for anything the worker would choke on later."""
+    if kind not in KINDS:
+        raise ValueError("kind must be assets, logs or users")
+    if fmt not in FORMATS:
+        raise ValueError("format must be csv, jsonl or parquet")
+    if fmt == "parquet" and not export_formats.parquet_available():
+        raise ValueError("Parquet export requires pyarrow")
+    _, model, asset_col, date_col = KINDS[kind]
+    export_formats.build_filters(filters or {}, asset_col, date_col)
+    since = (filters or {}).get("since")
+    if since not in (None, ""):
+        if model not in export_formats.DELTA_ENTITIES:
+            raise ValueError("'since' is not supported for this export")
+        if not str(since).isdigit():
+            raise ValueError("'since' must be a watermark returned by a previous export")
+
+
+def submit(job: ExportJob):
+    """Queue a committed job on the pool."""
+    app = current_app._get_current_object()
+    return _executor().submit(_run, app, job.id)
+
+
+def _db_now():
+    return db.session.execute(select(func.current_timestamp())).scalar()
+
+
+def _set(job_id: int, status_was=None, **values) -> int:
+    """Update one job in its own transaction; with `status_was`, only from that status. Returns rowcount."""
+    stmt = update(ExportJob.__table__).where(ExportJob.id == job_id)
+    if status_was is not None:
+        stmt = stmt.where(ExportJob.status == status_was)
+    with db.engine.begin() as conn:
+        return conn.execute(stmt.values(**values)).rowcount
+
+
+def _counting(parts, job_id: int):
+    written = 0
+    for part in parts:
+        yield part
+        written += len(part)
+        if not _set(job_id, "running", rows_written=written, heartbeat_at=func.current_timestamp()):
+            raise RuntimeError("export job is no longer running")  # reaped as stale meanwhile
+
+
+def _write(job: ExportJob) -> str:
+    columns, model, asset_col, date_col = KINDS[job.kind]
+    criteria, _ = export_formats.build_filters(job.filters or {}, asset_col, date_col)
+    delta, watermark = export_formats.delta_filter(job.filters or {}, model)
+    criteria += delta
+    total = db.session.query(func.count(model.id)).filter(*criteria).scalar()
+    _set(job.id, "running", rows_total=total, watermark=watermark, heartbeat_at=func.current_timestamp())
+
+    batch = current_app.config.get("EXPORT_JOB_BATCH", 10000)
+    parts = _counting(export_formats.partitions(columns, criteria, model.id, batch=batch), job.id)
+
+    name = f"export-{job.id}.{job.format}"
+    path = os.path.join(jobs_dir(), name)
+    tmp = path + ".part"
+    try:
+        if job.format == "parquet":
+            export_formats.write_parquet(tmp, columns, parts)
+        else:
+            chunks = (export_formats.csv_chunks if job.format == "csv" else export_formats.jsonl_chunks)(columns, parts)
+            with open(tmp, "w", newline="", encoding="utf-8") as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return name
+
+
+def _run(app, job_id: int) -> None:
+    with app.app_context():
+        try:
+            now = func.current_timestamp()
+            # claim: exactly one worker moves it off "queued" (a reaped job stays failed)
+            if not _set(job_id, "queued", status="running", started_at=now, heartbeat_at=now):
+                return
+            job = db.session.get(ExportJob, job_id)
+            name = _write(job)
+            now = _db_now()
+            _set(
+                job_id, "running", status="done", file_name=name, finished_at=now,
+                size_bytes=os.path.getsize(os.path.join(jobs_dir(), name)),
+                expires_at=now + timedelta(hours=app.config.get("EXPORT_JOB_TTL_HOURS", 24)),
+            )
+        except Exception as e:
+            app.logger.exception(f"❌ Export job {job_id} failed")
+            _set(job_id, "running", status="failed", error=str(e)[:255], finished_at=func.current_timestamp())
+        finally:
+            db.session.remove()
+
+
+def purge_expired() -> int:
+    """
+    Delete files of expired jobs; fail running jobs whose heartbeat stopped
+    (worker gone) and queued jobs never picked up within EXPORT_JOB_STALE_HOURS.
+    """
+    cfg = current_app.config
+    now = _db_now()
+    folder = jobs_dir()
+
+    expired = ExportJob.query.filter(ExportJob.status == "done", ExportJob.expires_at < now).all()
+    for job in expired:
+        try:
+            os.remove(os.path.join(folder, job.file_name))
+        except OSError:
+            pass
+        job.status = "expired"
+
+    db.session.commit()
+
+    silent_since = now - timedelta(minutes=cfg.get("EXPORT_JOB_HEARTBEAT_TIMEOUT_MINUTES", 15))
+    queued_before = now - timedelta(hours=cfg.get("EXPORT_JOB_STALE_HOURS", 6))
+    stale = or_(
+        and_(ExportJob.status == "running",
+             func.coalesce(ExportJob.heartbeat_at, ExportJob.started_at) < silent_since),
+        and_(ExportJob.status == "queued", ExportJob.created_at < queued_before),
+    )
+    for job_id, fmt in ExportJob.query.with_entities(ExportJob.id, ExportJob.format).filter(stale).all():
+        # re-checked in the UPDATE: the worker may have claimed or beaten since the read
+        with db.engine.begin() as conn:
+            reaped = conn.execute(
+                update(ExportJob.__table__).where(ExportJob.id == job_id, stale)
+                .values(status="failed", error="interrupted", finished_at=now)
+            ).rowcount
+        if reaped:
+            try:
+                os.remove(os.path.join(folder, f"export-{job_id}.{fmt}.part"))
+            except OSError:
+                pass
+    return len(expired)
@@ -1,13 +1,84 @@
 import os
+import re
+import hashlib
+import tempfile
 from werkzeug.utils import secure_filename
 from flask import current_app
 from datetime import datetime
 
+CHUNK_SIZE = 64 * 1024
+
+# "<sha256>.<ext>" — name handed out by the content-addressed backend
+CAS_NAME_RE = re.compile(r"^([0-9a-f]{64})\.([a-z0-9]+)$")
+
 # ✅ Extension check
 def allowed_file(filename):
     allowed = current_app.config.get("ALLOWED_EXTENSIONS", set())
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed
 
+# ✅ Content-addressed layout helpers
+def cas_relpath(digest: str, ext: str) -> str:
+    """ab/cd/<digest>.<ext> — two shard levels keep every directory small."""
+    return os.path.join(digest[:2], digest[2:4], f"{digest}.{ext}")
+
+def resolve_upload(filename: str):
+    """
+    Map a stored filename (what lands in attachment_path) to (directory, name)
+    under UPLOAD_FOLDER. CAS names go to their shard; anything else is a
+    legacy flat upload.
+    """
+    upload_dir = current_app.config["UPLOAD_FOLDER"]
+    m = CAS_NAME_RE.match(filename or "")
+    if m:
+        rel = cas_relpath(m.group(1), m.group(2))
+        return os.path.join(upload_dir, os.path.dirname(rel)), os.path.basename(rel)
+    return upload_dir, filename
+
+def place_file(tmp_path: str, digest: str, ext: str, upload_dir: str):
+    """
+    Move an already-hashed temp file into its shard (same filesystem → atomic).
+    Identical content is kept once. Returns (name, created).
+    """
+    final_path = os.path.join(upload_dir, cas_relpath(digest, ext))
+    if os.path.exists(final_path):
+        os.remove(tmp_path)  # dedupe: same bytes already stored
+        return f"{digest}.{ext}", False
+
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+    return f"{digest}.{ext}", True
+
+def file_sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def store_stream(stream, ext: str, upload_dir: str):
+    """
+    Stream to a temp file in UPLOAD_FOLDER/.tmp while hashing, then rename
+    into the shard. Returns (name, created).
+    """
+    tmp_dir = os.path.join(upload_dir, ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    sha = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                sha.update(chunk)
+                out.write(chunk)
+        return place_file(tmp_path, sha.hexdigest(), ext, upload_dir)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 # ✅ File save logic
 def save_file(file_obj, prefix="file"):
     if not file_obj or not allowed_file(file_obj.filename):
@@ -20,7 +91,15 @@ def save_file(file_obj, prefix="file"):
     upload_dir = current_app.config["UPLOAD_FOLDER"]
     os.makedirs(upload_dir, exist_ok=True)
 
-    # Add timestamp for uniqueness
+    if current_app.config.get("UPLOAD_STORAGE", "cas") == "cas":
+        ext = filename.rsplit('.', 1)[1].lower()
+        try:
+            name, _created = store_stream(file_obj.stream, ext, upload_dir)
+            return name, None
+        except Exception as e:
+            return None, str(e)
+
+    # legacy flat layout: timestamp for uniqueness
     timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     filename = f"{prefix}_{timestamp}_{filename}"
 
@@ -29,4 +108,4 @@ def save_file(file_obj, prefix="file"):
         file_obj.save(file_path)
         return filename, None
     except Exception as e:
-        return None, str(e)
\ No newline at end of file
+        return None, str(e)
@@ -0,0 +1,23 @@
+# app/utils/keyset.py
+"""
+Opaque cursors for (date, id) keyset pages: "YYYY-MM-DD|id", base64url
+without padding. decode() raises ValueError("Invalid cursor") on anything
+it didn't produce.
+"""
+
+import base64
+from datetime import datetime
+
+
+def encode(day, row_id) -> str:
+    raw = f"{day.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, row_id = raw.split("|", 1)
+        return datetime.strptime(day, "%Y-%m-%d").date(), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,165 @@
+# app/utils/leader.py
+"""
+Leader lease for the scheduler, so every job runs once per cluster however
+many gunicorn workers / hosts start a BackgroundScheduler.
+
+- heartbeat() (every SCHEDULER_HEARTBEAT_SECONDS in every process) takes or
+  renews the `scheduler_leases` row with one conditional UPDATE: it succeeds
+  if we already hold the lease or it has expired. Times come from the DB
+  clock, so hosts don't need to agree on theirs. A dead leader is replaced
+  within SCHEDULER_LEASE_TTL_SECONDS; release() at shutdown hands over at once.
+- is_leader() is a local check: the lease counts as ours until one heartbeat
+  before the DB expiry, so a stalled process stops running jobs before anyone
+  else can take over.
+- run_job() records each execution in `job_runs`; the (job, slot) unique key
+  stops the same firing from running twice across a handover. Interval jobs
+  use wall-clock slots (current_slot(tz, every)), so every process agrees. A run cut off
+  by a crash stays "running" and is not retried.
+
+The lease is an ordinary row (works on MySQL, Postgres and SQLite) rather
+than MySQL GET_LOCK, which would pin a pooled connection per process.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import JobRun, SchedulerLease
+
+LEASE = "scheduler"
+
+_lock = threading.Lock()
+_holder = {}       # pid → holder id (a forked child must not reuse its parent's)
+_until = {}        # holder id → time.monotonic() deadline
+
+
+def holder() -> str:
+    pid = os.getpid()
+    if pid not in _holder:
+        _holder[pid] = f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}"
+    return _holder[pid]
+
+
+def is_leader() -> bool:
+    return time.monotonic() < _until.get(holder(), 0)
+
+
+def _db_now(conn):
+    return conn.execute(select(func.current_timestamp())).scalar()
+
+
+def heartbeat() -> bool:
+    """Take or renew the lease; True while this process leads."""
+    ttl = current_app.config.get("SCHEDULER_LEASE_TTL_SECONDS", 60)
+    beat = current_app.config.get("SCHEDULER_HEARTBEAT_SECONDS", 15)
+    me, started = holder(), time.monotonic()
+    table = SchedulerLease.__table__
+
+    with _lock:
+        was_leader = is_leader()
+        try:
+            with db.engine.begin() as conn:
+                now = _db_now(conn)
+                values = dict(holder=me, heartbeat_at=now, expires_at=now + timedelta(seconds=ttl))
+                taken = conn.execute(
+                    update(table)
+                    .where(table.c.name == LEASE,
+                           or_(table.c.holder == me, table.c.holder.is_(None), table.c.expires_at < now))
+                    .values(acquired_at=case((table.c.holder == me, table.c.acquired_at), else_=now), **values)
+                ).rowcount
+            if not taken:
+                try:
+                    with db.engine.begin() as conn:
+                        conn.execute(insert(table).values(name=LEASE, acquired_at=now, **values))
+                    taken = 1
+                except IntegrityError:
+                    taken = 0  # somebody else's row, still valid
+        except Exception as e:
+            current_app.logger.warning(f"⚠️ Scheduler lease heartbeat failed: {e}")
+            taken = 0
+
+        if taken:
+            _until[me] = started + max(ttl - beat, 1)
+            if not was_leader:
+                current_app.logger.info(f"👑 Scheduler leader: {me}")
+        else:
+            _until.pop(me, None)
+            if was_leader:
+                current_app.logger.warning(f"⚠️ Scheduler lease lost by {me}")
+    return bool(taken)
+
+
+def release() -> None:
+    """Give the lease up (shutdown) so another process takes over on its next heartbeat."""
+    me = holder()
+    if _until.pop(me, None) is None:
+        return
+    table = SchedulerLease.__table__
+    with db.engine.begin() as conn:
+        conn.execute(update(table).where(table.c.name == LEASE, table.c.holder == me)
+                     .values(holder=None, expires_at=None))
+
+
+def current_slot(tz, every: timedelta = None) -> datetime:
+    """
+    The firing this run belongs to, in the scheduler's timezone: the current
+    minute for cron jobs; for interval jobs (`every`) the wall clock floored
+    to the interval, since their firings are offset from each process's start.
+    """
+    now = datetime.now(tz).replace(tzinfo=None)
+    if every is None:
+        return now.replace(second=0, microsecond=0)
+    epoch = datetime(1970, 1, 1)
+    return epoch + (now - epoch) // every * every
+
+
+def run_job(name: str, slot: datetime, fn, *args):
+    """
+    Run fn(*args) as `name` for `slot` and record it in job_runs.
+    Returns "not-leader", "duplicate", "ok" or "failed".
+    fn may return the number of rows it processed.
+    """
+    if not is_leader():
+        return "not-leader"
+
+    table = JobRun.__table__
+    try:
+        with db.engine.begin() as conn:
+            run_id = conn.execute(insert(table).values(
+                job=name, slot=slot, holder=holder(), status="running", started_at=datetime.utcnow()
+            )).inserted_primary_key[0]
+    except IntegrityError:
+        current_app.logger.info(f"⏭️ {name} @ {slot:%Y-%m-%d %H:%M} already ran, skipping.")
+        return "duplicate"
+
+    t0 = time.perf_counter()
+    status, rows, error = "ok", None, None
+    try:
+        result = fn(*args)
+        rows = int(result) if isinstance(result, (int, float)) else None
+    except Exception as e:
+        db.session.rollback()
+        status, error = "failed", str(e)[:255]
+        current_app.logger.exception(f"❌ Scheduled job {name} failed")
+    finally:
+        with db.engine.begin() as conn:
+            conn.execute(update(table).where(table.c.id == run_id).values(
+                status=status, rows=rows, error=error, finished_at=datetime.utcnow(),
+                duration_ms=int((time.perf_counter() - t0) * 1000),
+            ))
+    return status
+
+
+def prune_runs(days: int) -> int:
+    """Delete job_runs older than `days`; returns rows removed."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    with db.engine.begin() as conn:
+        return conn.execute(delete(JobRun.__table__).where(JobRun.started_at < cutoff)).rowcount
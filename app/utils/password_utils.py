@@ -0,0 +1,124 @@
+# app/utils/password_utils.py
+"""
+Password hashing helpers shared by User.set_password / User.check_password.
+
+- KDF work (scrypt / pbkdf2) runs on a small bounded thread pool, so a login
+  storm can only occupy PASSWORD_HASH_WORKERS cores; hashlib releases the GIL
+  while hashing, so the other request threads keep serving.
+- At most PASSWORD_HASH_QUEUE calls may wait for a worker; beyond that the
+  caller gets PasswordHashBusy (login answers 503 + Retry-After). A call that
+  times out keeps its slot until its KDF finishes (or is cancelled unstarted),
+  so abandoned work can't pile up behind the limit.
+- needs_rehash() compares the stored hash parameters with PASSWORD_HASH_METHOD,
+  so the cost can be tuned per deployment and old hashes upgrade on login.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = "scrypt"
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE = 32
+DEFAULT_TIMEOUT = 10.0
+
+
+class PasswordHashBusy(Exception):
+    """Raised when the hashing pool is saturated (caller should retry later)."""
+
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+_canonical = {}
+
+
+def _cfg(key, default):
+    if has_app_context():
+        value = current_app.config.get(key)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _pool():
+    """Lazily build the executor + admission semaphore (one per process)."""
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = int(_cfg("PASSWORD_HASH_WORKERS", DEFAULT_WORKERS))
+                queue = int(_cfg("PASSWORD_HASH_QUEUE", DEFAULT_QUEUE))
+                _slots = threading.BoundedSemaphore(workers + queue)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+    return _executor, _slots
+
+
+def reset_pool():
+    """Drop the executor (used after fork and by the benchmark between settings)."""
+    global _executor, _slots
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _slots = None
+
+
+def _run(fn, *args):
+    executor, slots = _pool()
+    timeout = float(_cfg("PASSWORD_HASH_TIMEOUT", DEFAULT_TIMEOUT))
+    if not slots.acquire(timeout=timeout):
+        raise PasswordHashBusy("password hashing pool is saturated")
+    try:
+        fut = executor.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # the slot is held until the KDF has really finished (or was dropped
+    # unstarted), not just until this caller stops waiting for it
+    fut.add_done_callback(lambda _: slots.release())
+    try:
+        return fut.result(timeout=timeout)
+    except FutureTimeout:
+        fut.cancel()
+        raise PasswordHashBusy("password hashing timed out")
+
+
+def target_method(method=None) -> str:
+    return method or _cfg("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+
+def _canonical_params(method: str) -> str:
+    """
+    'scrypt' → 'scrypt:32768:8:1', 'pbkdf2' → 'pbkdf2:sha256:<iters>' —
+    whatever werkzeug actually writes in front of the first '$'. Worked out
+    once per method, on the pool like any other hash.
+    """
+    if method not in _canonical:
+        _canonical[method] = _run(generate_password_hash, "x", method).split("$", 1)[0]
+    return _canonical[method]
+
+
+def hash_password(raw_password: str, method=None) -> str:
+    return _run(generate_password_hash, raw_password, target_method(method))
+
+
+def needs_rehash(stored_hash: str, method=None) -> bool:
+    if not stored_hash or "$" not in stored_hash:
+        return True
+    return stored_hash.split("$", 1)[0] != _canonical_params(target_method(method))
+
+
+def verify_password(stored_hash: str, raw_password: str, method=None):
+    """
+    Returns (ok, new_hash). new_hash is set only when the password matched and
+    the stored parameters differ from the configured target.
+    """
+    if not stored_hash:
+        return False, None
+    ok = _run(check_password_hash, stored_hash, raw_password)
+    if ok and needs_rehash(stored_hash, method):
+        return True, hash_password(raw_password, method)
+    return ok, None
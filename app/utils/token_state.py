@@ -0,0 +1,90 @@
+# app/utils/token_state.py
+"""
+JWT freshness / revocation without a DB hit per request.
+
+Every access token carries the user's `token_version` ("tv" claim). The
+version is bumped whenever role, active status or password changes, so any
+older token stops matching. Current (version, is_active) per user is kept in
+a tiny in-process cache with a short TTL:
+
+- hit  → O(1) dict lookup, no SQL
+- miss → one indexed PK lookup, then cached for TOKEN_STATE_TTL seconds
+- the process that bumps a version updates its own cache immediately;
+  other workers pick the change up within the TTL.
+"""
+
+import threading
+import time
+
+from flask import current_app
+
+from app import db
+
+DEFAULT_TTL = 30  # seconds
+
+_lock = threading.Lock()
+_cache = {}  # user_id -> (token_version, is_active, expires_at)
+
+
+def _ttl() -> float:
+    return float(current_app.config.get("TOKEN_STATE_TTL", DEFAULT_TTL))
+
+
+def _load(user_id: int):
+    from app.models import User
+
+    row = (
+        db.session.query(User.token_version, User.is_active)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None, False
+    version, active = row
+    return int(version or 0), active is not False
+
+
+def user_state(user_id: int):
+    """(token_version, is_active) for a user, served from cache when fresh."""
+    now = time.monotonic()
+    entry = _cache.get(user_id)
+    if entry and entry[2] > now:
+        return entry[0], entry[1]
+
+    version, active = _load(user_id)
+    with _lock:
+        _cache[user_id] = (version, active, now + _ttl())
+    return version, active
+
+
+def remember(user) -> None:
+    """Seed/refresh the cache with a user's current state (after a bump/commit)."""
+    with _lock:
+        _cache[user.id] = (
+            int(user.token_version or 0),
+            user.is_active is not False,
+            time.monotonic() + _ttl(),
+        )
+
+
+def forget(user_id: int) -> None:
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def is_token_revoked(jwt_header, jwt_payload) -> bool:
+    """flask_jwt_extended token_in_blocklist_loader callback."""
+    try:
+        user_id = int(jwt_payload.get("sub"))
+    except (TypeError, ValueError):
+        return True
+
+    version, active = user_state(user_id)
+    if version is None or not active:
+        return True
+    return int(jwt_payload.get("tv", 0)) != version
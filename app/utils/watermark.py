@@ -0,0 +1,35 @@
+# app/utils/watermark.py
+"""
+Commit-safe high-water marks for AUTO_INCREMENT sequences (change_log.id,
+maintenance_logs.id).
+
+Ids are handed out at INSERT but become visible at COMMIT, so MAX(id) can
+run ahead of a lower id whose transaction is still open; a reader that
+advances to MAX(id) would skip that row for good. stable_upto() only goes
+as far as the newest row stamped more than CHANGE_FEED_LAG_SECONDS ago (DB
+clock). Any lower id was inserted even earlier, so it is visible unless its
+transaction has been open longer than the lag — keep writes to these tables
+in short transactions.
+
+The lookup walks the PK backwards from the top and stops at the first old
+enough row, i.e. it reads only the last few seconds' worth of rows.
+"""
+
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app import db
+
+
+def stable_upto(id_col, ts_col, lag_seconds=None) -> int:
+    """Highest id whose `ts_col` is older than the lag; 0 if there is none."""
+    if lag_seconds is None:
+        lag_seconds = current_app.config.get("CHANGE_FEED_LAG_SECONDS", 10)
+    now = db.session.execute(select(func.current_timestamp())).scalar()
+    cutoff = now - timedelta(seconds=lag_seconds)
+    upto = db.session.execute(
+        select(id_col).where(ts_col < cutoff).order_by(id_col.desc()).limit(1)
+    ).scalar()
+    return upto or 0
@@ -0,0 +1,57 @@
+# bench_password_hash.py
+"""
+Login throughput per password-hash cost setting.
+
+For every method in METHODS it hashes one password, then fires N concurrent
+verify_password() calls (the same path /api/auth/login uses) through the
+bounded hash pool and prints logins/sec. No DB needed.
+
+Run:  python bench_password_hash.py [concurrency] [logins_per_setting]
+      PASSWORD_HASH_WORKERS=4 python bench_password_hash.py 32 200
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+
+from app.utils import password_utils
+
+METHODS = [
+    "pbkdf2:sha256:100000",
+    "pbkdf2:sha256:600000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+    "scrypt:65536:8:1",
+]
+
+
+def bench(method: str, concurrency: int, total: int) -> float:
+    stored = password_utils.hash_password("Bench@123", method=method)
+
+    def one(_):
+        ok, _new = password_utils.verify_password(stored, "Bench@123", method=method)
+        assert ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        list(clients.map(one, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+    app = Flask(__name__)
+    app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS") or 2)
+    app.config["PASSWORD_HASH_QUEUE"] = concurrency
+    app.config["PASSWORD_HASH_TIMEOUT"] = 300
+
+    with app.app_context():
+        print(f"workers={app.config['PASSWORD_HASH_WORKERS']} clients={concurrency} logins={total}")
+        for m in METHODS:
+            password_utils.reset_pool()
+            print(f"{m:<24} {bench(m, concurrency, total):8.1f} logins/sec")
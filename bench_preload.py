@@ -0,0 +1,77 @@
+# bench_preload.py
+"""
+Worker spawn time and memory, with and without preloading (Linux).
+
+Forks N children the way gunicorn does and has each one answer GET / :
+- cold:    each child imports the app and runs create_app() itself
+- preload: the parent runs create_app() + prefork.warm() once; children
+           only run prefork.after_fork()
+Each mode runs in a fresh interpreter. Memory is sampled while all children
+are alive, so pages shared with the parent show up as rss − private.
+No DB connection is needed.
+
+Run:  python bench_preload.py [workers]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def child(preloaded_app, report_fd, go_fd):
+    started = time.monotonic()
+    if preloaded_app is None:
+        from app import create_app
+        app = create_app()
+    else:
+        from app.prefork import after_fork
+        app = preloaded_app
+        after_fork(app)
+    assert app.test_client().get("/").status_code == 200
+    spawn_ms = (time.monotonic() - started) * 1000
+
+    from app.prefork import memory_usage
+    os.read(go_fd, 1)  # sample once every sibling is up
+    os.write(report_fd, (json.dumps({"spawn_ms": spawn_ms, **memory_usage()}) + "\n").encode())
+    os._exit(0)
+
+
+def run(mode: str, workers: int):
+    os.environ["APP_PRELOAD"] = "1" if mode == "preload" else "0"
+    app = None
+    if mode == "preload":
+        from wsgi import app  # create_app() + warm()
+
+    report_r, report_w = os.pipe()
+    go_r, go_w = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            child(app, report_w, go_r)
+        pids.append(pid)
+    time.sleep(3)  # let every child finish starting
+    os.write(go_w, b"x" * workers)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    os.close(report_w)
+    with os.fdopen(report_r) as fh:
+        print(fh.read(), end="")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        run(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"workers={workers}")
+    for mode in ("cold", "preload"):
+        out = subprocess.run([sys.executable, __file__, "--mode", mode, str(workers)],
+                             capture_output=True, text=True, check=True).stdout
+        rows = [json.loads(line) for line in out.splitlines() if line.startswith("{")]
+        avg = {k: sum(r[k] for r in rows) / len(rows) for k in rows[0]}
+        print(f"{mode:<8} spawn {avg['spawn_ms']:7.1f} ms   rss {avg['rss_kb'] / 1024:6.1f} MB"
+              f"   pss {avg['pss_kb'] / 1024:6.1f} MB   private {avg['private_kb'] / 1024:6.1f} MB  (per worker)")
@@ -0,0 +1,45 @@
+# gunicorn.conf.py
+"""
+gunicorn -c gunicorn.conf.py wsgi:app
+
+Preload mode is on by default (GUNICORN_PRELOAD=0 to turn it off): the master
+imports wsgi.py once — app built and warmed by app/prefork.warm() — and the
+workers are forked from it. post_fork() makes the inherited state safe
+(engine pools, thread pools) and starts the scheduler in one worker.
+Every worker logs how long it took from fork to ready and its memory
+(rss / pss / private kB).
+"""
+
+import multiprocessing
+import os
+import time
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS") or multiprocessing.cpu_count() * 2 + 1)
+threads = int(os.getenv("GUNICORN_THREADS") or 1)
+timeout = int(os.getenv("GUNICORN_TIMEOUT") or 60)
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+# read by app.config.Config when wsgi.py is imported (in the master when preloading)
+os.environ["APP_PRELOAD"] = "1" if preload_app else "0"
+
+
+def when_ready(server):
+    from app.prefork import memory_usage
+    server.log.info(f"Master ready (preload={preload_app}): {memory_usage()}")
+
+
+def pre_fork(server, worker):
+    worker.spawn_started = time.monotonic()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from app.prefork import after_fork
+        after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    from app.prefork import memory_usage
+    spawn_ms = (time.monotonic() - worker.spawn_started) * 1000
+    worker.log.info(f"Worker {worker.pid} ready in {spawn_ms:.0f} ms: {memory_usage()}")
@@ -0,0 +1,62 @@
+# migrate_uploads.py
+"""
+Move legacy flat uploads (uploads/file_<ts>_<name>) into the content-addressed
+layout (uploads/ab/cd/<sha256>.<ext>) and repoint maintenance_logs.attachment_path.
+
+- Files are hashed in chunks; duplicates collapse into one stored copy.
+- Safe to re-run: CAS-named files and sub-directories are skipped.
+- --dry-run prints the plan without touching disk or DB.
+
+Run:  python migrate_uploads.py [--dry-run]
+"""
+
+import os
+import sys
+
+from app import create_app, db
+from app.models.maintenance_log import MaintenanceLog
+from app.models.change_log import record_changes
+from app.utils.file_utils import CAS_NAME_RE, store_stream
+
+app = create_app()
+
+
+def migrate(dry_run: bool = False):
+    upload_dir = app.config["UPLOAD_FOLDER"]
+    moved = deduped = relinked = 0
+    mapping = {}
+
+    for name in sorted(os.listdir(upload_dir)):
+        path = os.path.join(upload_dir, name)
+        if not os.path.isfile(path) or CAS_NAME_RE.match(name) or "." not in name:
+            continue
+        ext = name.rsplit(".", 1)[1].lower()
+
+        if dry_run:
+            print(f"would move {name}")
+            continue
+
+        with open(path, "rb") as fh:
+            new_name, created = store_stream(fh, ext, upload_dir)
+        mapping[name] = new_name
+        moved += 1
+        deduped += 0 if created else 1
+
+    if mapping:
+        for old, new in mapping.items():
+            q = MaintenanceLog.query.filter(MaintenanceLog.attachment_path == old)
+            ids = [log.id for log in q.with_entities(MaintenanceLog.id)]
+            record_changes(db.session.connection(), "maintenance_log", ids, "upsert")  # bulk update skips ORM events
+            relinked += q.update({MaintenanceLog.attachment_path: new}, synchronize_session=False)
+        db.session.commit()
+
+        # originals go only once the rows point at the stored copies (a crash
+        # before this leaves duplicates on disk, never dangling rows; re-run cleans up)
+        for old in mapping:
+            os.remove(os.path.join(upload_dir, old))
+
+    print(f"✅ moved={moved} deduped={deduped} logs_relinked={relinked}")
+
+
+with app.app_context():
+    migrate(dry_run="--dry-run" in sys.argv)
@@ -0,0 +1,35 @@
+"""cover the work-queue ETag: assets index gains updated_at
+
+Revision ID: b8e2c4f6a0d3
+Revises: a3d9e5c7b1f4
+Create Date: 2025-10-15 10:12:47.204318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2c4f6a0d3'
+down_revision = 'a3d9e5c7b1f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # new index first: on MySQL the assigned_user_id foreign key needs one left in place
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('idx_assets_work_queue',
+                              ['assigned_user_id', 'next_service_due', 'id', 'last_service_date', 'name', 'updated_at'],
+                              unique=False)
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.drop_index('idx_assets_user_next_due')
+
+
+def downgrade():
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('idx_assets_user_next_due',
+                              ['assigned_user_id', 'next_service_due', 'id', 'last_service_date', 'name'],
+                              unique=False)
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.drop_index('idx_assets_work_queue')
@@ -0,0 +1,46 @@
+"""add change_log feed and maintenance_logs.updated_at
+
+Revision ID: c2d8a6e4f913
+Revises: b7e3f1c0a2d4
+Create Date: 2025-09-08 10:42:17.301552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d8a6e4f913'
+down_revision = 'b7e3f1c0a2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_log',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('entity', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.create_index('idx_change_log_entity', ['entity', 'entity_id'], unique=False)
+
+    with op.batch_alter_table('maintenance_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True))
+
+    # seed the feed with every existing row so `since=0` is a full sync
+    op.execute("INSERT INTO change_log (entity, entity_id, op) SELECT 'asset', id, 'upsert' FROM assets ORDER BY id")
+    op.execute("INSERT INTO change_log (entity, entity_id, op) SELECT 'maintenance_log', id, 'upsert' FROM maintenance_logs ORDER BY id")
+
+
+def downgrade():
+    with op.batch_alter_table('maintenance_logs', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index('idx_change_log_entity')
+
+    op.drop_table('change_log')
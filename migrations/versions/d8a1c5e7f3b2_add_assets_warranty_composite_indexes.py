@@ -0,0 +1,33 @@
+"""replace category / location indexes on assets with (…, warranty_end, id) composites
+
+Revision ID: d8a1c5e7f3b2
+Revises: c6f0a2d8e4b9
+Create Date: 2025-10-02 10:41:17.203954
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a1c5e7f3b2'
+down_revision = 'c6f0a2d8e4b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the composites serve plain category / location lookups too (leftmost prefix)
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('idx_assets_category_warranty', ['category', 'warranty_end', 'id'], unique=False)
+        batch_op.create_index('idx_assets_location_warranty', ['location', 'warranty_end', 'id'], unique=False)
+        batch_op.drop_index('idx_assets_category')
+        batch_op.drop_index('idx_assets_location')
+
+
+def downgrade():
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('idx_assets_location', ['location'], unique=False)
+        batch_op.create_index('idx_assets_category', ['category'], unique=False)
+        batch_op.drop_index('idx_assets_location_warranty')
+        batch_op.drop_index('idx_assets_category_warranty')
@@ -0,0 +1,66 @@
+"""add assets.last_service_date / next_service_due + (assigned_user_id, next_service_due) covering index
+
+Revision ID: e2f6b9d4a8c1
+Revises: d8a1c5e7f3b2
+Create Date: 2025-10-06 16:22:48.915330
+
+"""
+from datetime import date, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f6b9d4a8c1'
+down_revision = 'd8a1c5e7f3b2'
+branch_labels = None
+depends_on = None
+
+DEFAULT_FREQUENCY = 180
+
+
+def _backfill():
+    """Same rule as app/models/service_dates.compute, one pass over the logs."""
+    bind = op.get_bind()
+    assets = sa.table('assets', sa.column('id'), sa.column('purchase_date'), sa.column('created_at'),
+                      sa.column('frequency_days'), sa.column('last_service_date'), sa.column('next_service_due'))
+    logs = sa.table('maintenance_logs', sa.column('id'), sa.column('asset_id'),
+                    sa.column('service_date'), sa.column('next_service_due'))
+
+    latest = {}
+    for asset_id, service_date, next_due in bind.execute(
+        sa.select(logs.c.asset_id, logs.c.service_date, logs.c.next_service_due)
+        .order_by(logs.c.asset_id, logs.c.service_date, logs.c.id)
+    ):
+        latest[asset_id] = (service_date, next_due)
+
+    for asset_id, purchase_date, created_at, freq in bind.execute(
+        sa.select(assets.c.id, assets.c.purchase_date, assets.c.created_at, assets.c.frequency_days)
+    ).all():
+        last, due = latest.get(asset_id, (None, None))
+        if not due:
+            anchor = last or purchase_date or (created_at.date() if created_at else date.today())
+            due = anchor + timedelta(days=freq or DEFAULT_FREQUENCY)
+        bind.execute(assets.update().where(assets.c.id == asset_id)
+                     .values(last_service_date=last, next_service_due=due))
+
+
+def upgrade():
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_service_date', sa.Date(), nullable=True))
+        batch_op.add_column(sa.Column('next_service_due', sa.Date(), nullable=True))
+
+    _backfill()
+
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('idx_assets_user_next_due',
+                              ['assigned_user_id', 'next_service_due', 'id', 'last_service_date', 'name'],
+                              unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.drop_index('idx_assets_user_next_due')
+        batch_op.drop_column('next_service_due')
+        batch_op.drop_column('last_service_date')
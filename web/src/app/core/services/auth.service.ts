@@ -35,9 +35,9 @@ export class AuthService {
   }
 
   /** ↪️ Change password (first login flow) */
-  changePassword(new_password: string): Observable<{ message: string }> {
+  changePassword(new_password: string): Observable<{ message: string; access_token?: string }> {
     const headers = new HttpHeaders({ 'Content-Type': 'application/json' });
-    return this.http.post<{ message: string }>(
+    return this.http.post<{ message: string; access_token?: string }>(
       `${this.apiUrl}/change-password`,
       { new_password },
       { headers }
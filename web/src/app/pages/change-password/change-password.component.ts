@@ -56,10 +56,14 @@ export class ChangePasswordComponent {
     this.saving = true; this.error = null;
 
     this.auth.changePassword(this.form.value.new_password!).subscribe({
-      next: () => {
-        // update local storage flag
+      next: (res) => {
+        // update local storage flag (+ fresh token: old one is revoked on password change)
         const me = this.auth.load();
-        if (me) { me.must_change_password = false; localStorage.setItem('smartasset_auth', JSON.stringify(me)); }
+        if (me) {
+          me.must_change_password = false;
+          if (res?.access_token) me.access_token = res.access_token;
+          localStorage.setItem('smartasset_auth', JSON.stringify(me));
+        }
         this.router.navigateByUrl('/dashboard');
       },
       error: (err) => {
@@ -1,6 +1,10 @@
 from app import create_app
 app = create_app()
 
+# gunicorn --preload (APP_PRELOAD=1): build the shared state once, before the workers fork
+if app.config.get("APP_PRELOAD"):
+    from app.prefork import warm
+    warm(app)
+
 if __name__ == '__main__':
     app.run()
-